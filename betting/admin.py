@@ -1,10 +1,28 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin import AdminSite
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group, User
-from django.utils import timezone
-
-from .models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult, UserProfile
+from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+from .jobs import enqueue, unclaimed_jobs
+from .models import (
+    Bet,
+    BetType,
+    Competition,
+    CompetitionStanding,
+    Driver,
+    Job,
+    League,
+    LeagueMembership,
+    Race,
+    RaceResult,
+    UserProfile,
+)
+from .stats import estimated_count, get_statistics
 
 
 class F1BettingAdminSite(AdminSite):
@@ -17,87 +35,49 @@ class F1BettingAdminSite(AdminSite):
         Override the index view to add baseline statistics
         """
         extra_context = extra_context or {}
+        extra_context["statistics"] = get_statistics()
+        return super().index(request, extra_context)
 
-        # User statistics
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-        superusers = User.objects.filter(is_superuser=True).count()
-        total_groups = Group.objects.count()
-
-        # Competition statistics
-        total_competitions = Competition.objects.count()
-        active_competitions = Competition.objects.filter(status="active").count()
-
-        # Race statistics
-        total_races = Race.objects.count()
-        completed_races = Race.objects.filter(status="completed").count()
-        upcoming_races = Race.objects.filter(status="scheduled", race_datetime__gte=timezone.now()).count()
-
-        # Driver statistics
-        total_drivers = Driver.objects.count()
-        active_drivers = Driver.objects.filter(is_active=True).count()
-
-        # Betting statistics
-        total_bets = Bet.objects.count()
-        scored_bets = Bet.objects.filter(is_scored=True).count()
-        unscored_bets = total_bets - scored_bets
-        users_with_bets = Bet.objects.values("user").distinct().count()
-
-        # Race results statistics
-        total_results = RaceResult.objects.count()
-        verified_results = RaceResult.objects.filter(verified=True).count()
-
-        # Bet types statistics
-        total_bet_types = BetType.objects.count()
-        active_bet_types = BetType.objects.filter(is_active=True).count()
-
-        # Competition standings
-        total_standings = CompetitionStanding.objects.count()
-
-        # Build statistics context
-        extra_context["statistics"] = {
-            "users": {
-                "total": total_users,
-                "active": active_users,
-                "superusers": superusers,
-                "groups": total_groups,
-                "with_bets": users_with_bets,
-            },
-            "competitions": {
-                "total": total_competitions,
-                "active": active_competitions,
-            },
-            "races": {
-                "total": total_races,
-                "completed": completed_races,
-                "upcoming": upcoming_races,
-                "pending": total_races - completed_races,
-            },
-            "drivers": {
-                "total": total_drivers,
-                "active": active_drivers,
-                "inactive": total_drivers - active_drivers,
-            },
-            "bets": {
-                "total": total_bets,
-                "scored": scored_bets,
-                "unscored": unscored_bets,
-            },
-            "results": {
-                "total": total_results,
-                "verified": verified_results,
-                "unverified": total_results - verified_results,
-            },
-            "bet_types": {
-                "total": total_bet_types,
-                "active": active_bet_types,
-            },
-            "standings": {
-                "total": total_standings,
-            },
-        }
 
-        return super().index(request, extra_context)
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses the table's estimated row count when the changelist is unfiltered"""
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            return estimated_count(self.object_list.model)
+        return super().count
+
+
+def queue_scoring(modeladmin, request, races, rescore=False):
+    """
+    Queue one score_race job per race that has verified results
+    Scoring runs in `run_worker`, so selecting many races cannot hit the request timeout. Warns
+    when jobs are going unclaimed, i.e. no worker is running.
+    """
+    verified = RaceResult.objects.filter(race=OuterRef("pk"), verified=True)
+    ready = list(races.filter(Exists(verified)).values_list("id", flat=True))
+    skipped = races.count() - len(ready)
+
+    jobs = [enqueue("score_race", race_id=race_id, rescore=rescore) for race_id in ready]
+    if jobs:
+        url = reverse("admin:betting_job_changelist") + f"?kind__exact=score_race&id__gte={jobs[0].id}"
+        modeladmin.message_user(
+            request,
+            format_html('Queued {} scoring job(s). <a href="{}">Follow their progress</a>.', len(jobs), url),
+            messages.SUCCESS,
+        )
+    if skipped:
+        modeladmin.message_user(request, f"Skipped {skipped} race(s) without verified results.", messages.WARNING)
+
+    unclaimed = unclaimed_jobs()
+    if unclaimed:
+        modeladmin.message_user(
+            request,
+            f"{unclaimed} job(s) have been waiting over a minute without a worker claiming them. "
+            "Queued scoring will not run until `python manage.py run_worker` is started.",
+            messages.ERROR,
+        )
 
 
 class UserProfileInline(admin.StackedInline):
@@ -124,7 +104,8 @@ class CompetitionAdmin(admin.ModelAdmin):
     list_display = ("name", "year", "status", "start_date", "end_date", "created_by")
     list_filter = ("status", "year")
     search_fields = ("name", "description")
-    filter_horizontal = ("participants",)
+    list_select_related = ("created_by",)
+    autocomplete_fields = ("created_by", "participants")
     fieldsets = (
         ("Basic Information", {"fields": ("name", "description", "year", "status")}),
         ("Dates", {"fields": ("start_date", "end_date")}),
@@ -156,6 +137,8 @@ class RaceAdmin(admin.ModelAdmin):
     list_filter = ("status", "competition", "country")
     search_fields = ("name", "location", "country")
     ordering = ("competition", "round_number")
+    autocomplete_fields = ("competition",)
+    actions = ("verify_results", "score_races", "rescore_races")
     fieldsets = (
         ("Race Information", {"fields": ("competition", "name", "location", "country", "round_number")}),
         ("Schedule", {"fields": ("race_datetime", "betting_deadline")}),
@@ -165,9 +148,6 @@ class RaceAdmin(admin.ModelAdmin):
 
     def admin_actions(self, obj):
         """Display edit and delete action icons"""
-        from django.urls import reverse
-        from django.utils.html import format_html
-
         edit_url = reverse("admin:betting_race_change", args=[obj.pk])
         delete_url = reverse("admin:betting_race_delete", args=[obj.pk])
 
@@ -179,6 +159,23 @@ class RaceAdmin(admin.ModelAdmin):
 
     admin_actions.short_description = "Actions"
 
+    def get_queryset(self, request):
+        # str(race) includes the competition year, also in autocomplete results
+        return super().get_queryset(request).select_related("competition")
+
+    @admin.action(description="Verify all results of selected races")
+    def verify_results(self, request, queryset):
+        updated = RaceResult.objects.filter(race__in=queryset, verified=False).update(verified=True)
+        self.message_user(request, f"Verified {updated} result(s).", messages.SUCCESS)
+
+    @admin.action(description="Score selected races")
+    def score_races(self, request, queryset):
+        queue_scoring(self, request, queryset)
+
+    @admin.action(description="Re-score selected races")
+    def rescore_races(self, request, queryset):
+        queue_scoring(self, request, queryset, rescore=True)
+
 
 @admin.register(BetType, site=admin_site)
 class BetTypeAdmin(admin.ModelAdmin):
@@ -194,6 +191,11 @@ class BetAdmin(admin.ModelAdmin):
     search_fields = ("user__email", "driver__last_name", "race__name")
     ordering = ("race", "user", "predicted_position")
     readonly_fields = ("points_earned", "is_scored", "created_at")
+    list_select_related = ("user", "race", "race__competition", "bet_type", "driver")
+    autocomplete_fields = ("user", "race", "driver")
+    # The bets table is the largest one: estimate the unfiltered total and skip the second COUNT(*)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(RaceResult, site=admin_site)
@@ -202,6 +204,9 @@ class RaceResultAdmin(admin.ModelAdmin):
     list_filter = ("race__competition", "race", "verified", "fastest_lap", "did_not_finish")
     search_fields = ("driver__last_name", "race__name")
     ordering = ("race", "position")
+    list_select_related = ("race", "race__competition", "driver")
+    autocomplete_fields = ("race", "driver")
+    actions = ("verify_selected", "score_races", "rescore_races")
     fieldsets = (
         ("Result Information", {"fields": ("race", "driver", "position")}),
         ("Additional Data", {"fields": ("grid_position", "fastest_lap", "did_not_finish", "dnf_reason")}),
@@ -209,6 +214,19 @@ class RaceResultAdmin(admin.ModelAdmin):
         ("API Integration", {"fields": ("api_result_id",), "classes": ("collapse",)}),
     )
 
+    @admin.action(description="Verify selected results")
+    def verify_selected(self, request, queryset):
+        updated = queryset.filter(verified=False).update(verified=True)
+        self.message_user(request, f"Verified {updated} result(s).", messages.SUCCESS)
+
+    @admin.action(description="Score races of selected results")
+    def score_races(self, request, queryset):
+        queue_scoring(self, request, Race.objects.filter(results__in=queryset).distinct())
+
+    @admin.action(description="Re-score races of selected results")
+    def rescore_races(self, request, queryset):
+        queue_scoring(self, request, Race.objects.filter(results__in=queryset).distinct(), rescore=True)
+
 
 @admin.register(CompetitionStanding, site=admin_site)
 class CompetitionStandingAdmin(admin.ModelAdmin):
@@ -216,4 +234,37 @@ class CompetitionStandingAdmin(admin.ModelAdmin):
     list_filter = ("competition",)
     search_fields = ("user__email", "competition__name")
     ordering = ("competition", "-total_points")
+    list_select_related = ("user", "competition")
+    autocomplete_fields = ("user", "competition")
     readonly_fields = ("updated_at",)
+
+
+class LeagueMembershipInline(admin.TabularInline):
+    model = LeagueMembership
+    extra = 0
+    autocomplete_fields = ("user",)
+    readonly_fields = ("joined_at",)
+
+
+@admin.register(League, site=admin_site)
+class LeagueAdmin(admin.ModelAdmin):
+    list_display = ("name", "competition", "invite_code", "start_round", "created_by", "created_at")
+    list_filter = ("competition",)
+    search_fields = ("name", "invite_code", "created_by__email")
+    list_select_related = ("competition", "created_by")
+    autocomplete_fields = ("competition", "created_by")
+    readonly_fields = ("created_at",)
+    inlines = [LeagueMembershipInline]
+
+
+@admin.register(Job, site=admin_site)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "run_after", "locked_by", "updated_at")
+    list_filter = ("status", "kind")
+    ordering = ("-created_at",)
+    readonly_fields = ("attempts", "locked_by", "locked_at", "result", "last_error", "created_at", "updated_at")
+    fieldsets = (
+        ("Job", {"fields": ("kind", "payload", "status", "run_after", "max_attempts")}),
+        ("Progress", {"fields": ("attempts", "locked_by", "locked_at", "result", "last_error")}),
+        ("Timestamps", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
+    )
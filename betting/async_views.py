@@ -0,0 +1,60 @@
+"""
+Async read endpoints for the hottest API routes
+Native async views over the async ORM, so an ASGI worker can hold hundreds of slow clients
+open at once instead of one per sync worker. Responses match the DRF endpoints' serializers.
+"""
+
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from .models import Competition, CompetitionStanding, Driver, Race, RaceResult
+from .serializers import CompetitionStandingValuesSerializer, DriverSerializer, RaceResultSerializer, RaceValuesSerializer
+
+
+async def serialize(request, queryset, serializer_class):
+    """Fetch a queryset with the async ORM and serialize it without touching the database again"""
+    objects = [obj async for obj in queryset]
+    return serializer_class(objects, many=True, context={"request": request}).data
+
+
+@require_GET
+async def drivers(request):
+    """Active drivers"""
+    data = await serialize(request, Driver.objects.filter(is_active=True), DriverSerializer)
+    return JsonResponse(data, safe=False)
+
+
+@require_GET
+async def upcoming_races(request):
+    """Races that have not started yet, optionally for one competition"""
+    races = Race.objects.filter(race_datetime__gte=timezone.now())
+
+    competition_id = request.GET.get("competition")
+    if competition_id:
+        races = races.filter(competition_id=competition_id)
+
+    data = await RaceValuesSerializer(races, request).adata()
+    return JsonResponse(data, safe=False)
+
+
+@require_GET
+async def race_results(request, race_id):
+    """Verified results for a race"""
+    if not await Race.objects.filter(id=race_id).aexists():
+        raise Http404("Race not found")
+
+    results = RaceResult.objects.select_related("race", "driver").filter(race_id=race_id, verified=True).order_by("position")
+    data = await serialize(request, results, RaceResultSerializer)
+    return JsonResponse(data, safe=False)
+
+
+@require_GET
+async def standings(request, competition_id):
+    """Leaderboard for a competition"""
+    if not await Competition.objects.filter(id=competition_id).aexists():
+        raise Http404("Competition not found")
+
+    rows = CompetitionStanding.objects.filter(competition_id=competition_id).order_by("rank")
+    data = await CompetitionStandingValuesSerializer(rows, request).adata()
+    return JsonResponse(data, safe=False)
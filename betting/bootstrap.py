@@ -0,0 +1,63 @@
+"""
+Everything the SPA needs for first paint, in one response
+Competitions, upcoming races, drivers and bet types are the same for every visitor, so they are
+assembled in four queries and cached for BOOTSTRAP_CACHE_TTL seconds. The per-user part is the
+profile and the user's bets on upcoming races: two more queries.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Bet, BetType, Competition, Driver, Race, UserProfile
+from .serializers import (
+    BetTypeSerializer,
+    BetValuesSerializer,
+    CompetitionSerializer,
+    DriverSerializer,
+    RaceValuesSerializer,
+    UserProfileSerializer,
+)
+
+CACHE_KEY = "betting:bootstrap"
+
+
+def upcoming_races():
+    return Race.objects.filter(race_datetime__gte=timezone.now())
+
+
+def collect_shared():
+    competitions = (
+        Competition.objects.filter(status__in=["published", "active", "completed"])
+        .select_related("created_by", "created_by__profile")
+        .annotate(participant_total=Count("participants", distinct=True), race_total=Count("races", distinct=True))
+    )
+    return {
+        "competitions": CompetitionSerializer(competitions, many=True).data,
+        "upcoming_races": RaceValuesSerializer(upcoming_races()).data,
+        "drivers": DriverSerializer(Driver.objects.filter(is_active=True), many=True).data,
+        "bet_types": BetTypeSerializer(BetType.objects.filter(is_active=True), many=True).data,
+    }
+
+
+def get_shared():
+    """Cached user-independent bootstrap data"""
+    return cache.get_or_set(CACHE_KEY, collect_shared, settings.BOOTSTRAP_CACHE_TTL)
+
+
+def collect_for_user(user):
+    """The signed-in user's profile and bets on upcoming races; empty for anonymous visitors"""
+    if not user.is_authenticated:
+        return {"profile": None, "bets": []}
+
+    profile, created = UserProfile.objects.select_related("user").get_or_create(user=user)
+    bets = Bet.objects.filter(user=user, race__race_datetime__gte=timezone.now())
+    return {
+        "profile": UserProfileSerializer(profile).data,
+        "bets": BetValuesSerializer(bets).data,
+    }
+
+
+def bootstrap(user):
+    return {**get_shared(), **collect_for_user(user)}
@@ -0,0 +1,128 @@
+"""
+Crowd picks
+When betting on a race closes, its bets are tallied once into CrowdPick rows: how many users
+picked each driver for each position, and the race is marked as tallied. The race's crowd statistics (pick distribution per position,
+consensus order, most contrarian picks) are then built from those few hundred rows instead of a
+GROUP BY over every bet on each page view. Picks are only shown after the deadline, so nobody can
+copy the crowd.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from .models import Bet, CrowdPick, Race
+
+CONTRARIAN_PICKS = 10
+
+
+def tally_races(race_ids):
+    """Count the bets on these races into CrowdPick rows, replacing earlier tallies; returns the rows written"""
+    race_ids = list(race_ids)
+    if not race_ids:
+        return 0
+    counts = (
+        Bet.objects.filter(race_id__in=race_ids)
+        .values("race_id", "bet_type_id", "predicted_position", "driver_id")
+        .annotate(picks=Count("id"))
+        .order_by()
+    )
+    rows = [CrowdPick(**row) for row in counts]
+    with transaction.atomic():
+        CrowdPick.objects.filter(race_id__in=race_ids).delete()
+        # Two first views of a race can tally it at once; the later one overwrites the earlier's
+        # rows instead of failing on the unique constraint
+        CrowdPick.objects.bulk_create(
+            rows,
+            batch_size=5000,
+            update_conflicts=True,
+            unique_fields=["race", "bet_type", "predicted_position", "driver"],
+            update_fields=["picks"],
+        )
+        Race.objects.filter(id__in=race_ids).update(crowd_tallied_at=timezone.now())
+    return len(rows)
+
+
+def crowd(race, bet_type):
+    """
+    Pick statistics for a race whose betting has closed
+    Races closed while the scheduler was not running are tallied on first view; a tallied race
+    with no picks of this bet type gets empty statistics. The consensus order ranks drivers by
+    Borda count (the top position scores most); a pick is contrarian by how far it sits from the
+    driver's consensus place.
+    """
+    if race.crowd_tallied_at is None:
+        tally_races([race.id])
+    picks = CrowdPick.objects.filter(race=race, bet_type=bet_type).order_by()
+
+    rows = list(
+        picks.values("predicted_position", "driver_id", "picks", "driver__driver_number").annotate(
+            driver_name=Concat(F("driver__first_name"), Value(" "), F("driver__last_name"), output_field=CharField())
+        )
+    )
+    drivers = {
+        row["driver_id"]: {"driver_name": row["driver_name"], "driver_number": row["driver__driver_number"]} for row in rows
+    }
+
+    by_position = defaultdict(list)
+    for row in rows:
+        by_position[row["predicted_position"]].append(row)
+    last = max(by_position, default=0)
+
+    positions = []
+    for position in sorted(by_position):
+        position_rows = sorted(by_position[position], key=lambda row: (-row["picks"], row["driver_name"]))
+        total = sum(row["picks"] for row in position_rows)
+        positions.append(
+            {
+                "position": position,
+                "picks": total,
+                "drivers": [
+                    {
+                        "driver": row["driver_id"],
+                        **drivers[row["driver_id"]],
+                        "picks": row["picks"],
+                        "share": round(row["picks"] / total, 4),
+                    }
+                    for row in position_rows
+                ],
+            }
+        )
+
+    scores = defaultdict(int)
+    for row in rows:
+        scores[row["driver_id"]] += row["picks"] * (last + 1 - row["predicted_position"])
+    ranking = sorted(scores, key=lambda driver_id: (-scores[driver_id], drivers[driver_id]["driver_name"]))
+    places = {driver_id: place for place, driver_id in enumerate(ranking, start=1)}
+    consensus = [
+        {"position": place, "driver": driver_id, **drivers[driver_id], "score": scores[driver_id]}
+        for place, driver_id in enumerate(ranking[:last], start=1)
+    ]
+
+    contrarian = sorted(
+        rows,
+        key=lambda row: (-abs(row["predicted_position"] - places[row["driver_id"]]), -row["picks"], row["predicted_position"]),
+    )
+    contrarian = [
+        {
+            "position": row["predicted_position"],
+            "driver": row["driver_id"],
+            **drivers[row["driver_id"]],
+            "picks": row["picks"],
+            "consensus_position": places[row["driver_id"]],
+        }
+        for row in contrarian[:CONTRARIAN_PICKS]
+        if row["predicted_position"] != places[row["driver_id"]]
+    ]
+
+    return {
+        "race": race.id,
+        "bet_type": bet_type.code,
+        "bettors": max((position["picks"] for position in positions), default=0),
+        "positions": positions,
+        "consensus": consensus,
+        "contrarian": contrarian,
+    }
@@ -0,0 +1,179 @@
+"""
+Streaming CSV and NDJSON exports of bets, race results and standings
+Rows are read with values_list() over a server-side cursor (.iterator(chunk_size=EXPORT_CHUNK_SIZE))
+and encoded one chunk at a time, optionally gzipped on the fly, so memory stays flat however many
+rows there are. Used by /api/export/<kind>/ and `manage.py export_data`.
+"""
+
+import csv
+import io
+import zlib
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Bet, CompetitionStanding, RaceResult
+from .renderers import FastJSONRenderer
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# Output column -> ORM lookup (or expression), per export
+EXPORTS = {
+    "bets": {
+        "model": Bet,
+        "columns": {
+            "id": "id",
+            "competition_id": "race__competition_id",
+            "race_id": "race_id",
+            "round_number": "race__round_number",
+            "race": "race__name",
+            "user_id": "user_id",
+            "username": "user__username",
+            "bet_type": "bet_type__code",
+            "driver_number": "driver__driver_number",
+            "predicted_position": "predicted_position",
+            "points_earned": "points_earned",
+            "is_scored": "is_scored",
+            "created_at": "created_at",
+        },
+        "datetimes": ["created_at"],
+        "order_by": ["id"],
+    },
+    "results": {
+        "model": RaceResult,
+        "columns": {
+            "id": "id",
+            "competition_id": "race__competition_id",
+            "race_id": "race_id",
+            "round_number": "race__round_number",
+            "race": "race__name",
+            "driver_number": "driver__driver_number",
+            "driver": Concat(F("driver__first_name"), Value(" "), F("driver__last_name")),
+            "position": "position",
+            "grid_position": "grid_position",
+            "fastest_lap": "fastest_lap",
+            "did_not_finish": "did_not_finish",
+            "dnf_reason": "dnf_reason",
+            "verified": "verified",
+        },
+        "order_by": ["race__round_number", "race_id", "position"],
+    },
+    "standings": {
+        "model": CompetitionStanding,
+        "columns": {
+            "competition_id": "competition_id",
+            "rank": "rank",
+            "user_id": "user_id",
+            "username": "user__username",
+            "total_points": "total_points",
+            "races_predicted": "races_predicted",
+            "exact_predictions": "exact_predictions",
+            "partial_predictions": "partial_predictions",
+            "updated_at": "updated_at",
+        },
+        "datetimes": ["updated_at"],
+        "order_by": ["competition_id", "rank", "user_id"],
+    },
+}
+
+encoder = JSONEncoder()
+
+
+class Export:
+    """
+    One export, iterated with chunks() (sync) or achunks() (async) to get encoded blocks of bytes
+    Raises ValueError for an unknown kind or format, or a filter the export does not support.
+    """
+
+    def __init__(self, kind, fmt="csv", competition=None, race=None, compress=False, chunk_size=None):
+        if kind not in EXPORTS:
+            raise ValueError(f"Unknown export '{kind}', expected one of: {', '.join(EXPORTS)}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', expected one of: {', '.join(FORMATS)}")
+        if kind == "standings" and race is not None:
+            raise ValueError("Standings are per competition, not per race")
+
+        self.kind, self.format, self.compress = kind, fmt, compress
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self.columns = list(EXPORTS[kind]["columns"])
+        self.datetimes = [self.columns.index(column) for column in EXPORTS[kind].get("datetimes", [])]
+        self.rows = 0
+
+        queryset = EXPORTS[kind]["model"].objects.all()
+        if competition is not None:
+            field = "competition_id" if kind == "standings" else "race__competition_id"
+            queryset = queryset.filter(**{field: competition})
+        if race is not None:
+            queryset = queryset.filter(race_id=race)
+        self.queryset = queryset.order_by(*EXPORTS[kind]["order_by"]).values_list(*EXPORTS[kind]["columns"].values())
+
+        scope = f"-competition-{competition}" if competition is not None else ""
+        scope += f"-race-{race}" if race is not None else ""
+        self.filename = f"{kind}{scope}.{fmt}"
+
+    def encode(self, rows):
+        if self.format == "ndjson":
+            render = FastJSONRenderer().render
+            return b"".join(render(dict(zip(self.columns, row))) + b"\n" for row in rows)
+
+        if self.datetimes:
+            rows = [self.format_datetimes(row) for row in rows]
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def format_datetimes(self, row):
+        # Same format as the JSON API (and the NDJSON export)
+        row = list(row)
+        for index in self.datetimes:
+            row[index] = encoder.default(row[index])
+        return row
+
+    def header(self):
+        if self.format == "ndjson":
+            return b""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(self.columns)
+        return buffer.getvalue().encode()
+
+    def start(self):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None
+        self.rows = 0
+        return self.output(self.header())
+
+    def output(self, data, final=False):
+        if self.compressor is None:
+            return data
+        data = self.compressor.compress(data)
+        return data + self.compressor.flush() if final else data
+
+    def read(self, rows):
+        """Encode the next chunk of rows from a queryset iterator; returns (bytes, whether it was the last)"""
+        chunk = list(islice(rows, self.chunk_size))
+        self.rows += len(chunk)
+        final = len(chunk) < self.chunk_size
+        return self.output(self.encode(chunk), final), final
+
+    def chunks(self):
+        yield self.start()
+        rows = self.queryset.iterator(chunk_size=self.chunk_size)
+        final = False
+        while not final:
+            data, final = self.read(rows)
+            yield data
+
+    async def achunks(self):
+        # values_list() querysets run their query in aiterator()'s calling thread, so drive the
+        # (lazy) sync iterator from one worker thread instead, encoding there too
+        yield self.start()
+        rows = self.queryset.iterator(chunk_size=self.chunk_size)
+        final = False
+        while not final:
+            data, final = await sync_to_async(self.read)(rows)
+            yield data
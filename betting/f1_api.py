@@ -4,70 +4,160 @@ Uses OpenF1 API for race data and driver information
 Fallback to manual entry if API is unavailable
 """
 
+import time
 from datetime import datetime, timedelta
 
 import requests
 from django.conf import settings
 from django.utils import timezone
 
+from .f1_cache import F1ResponseCache
+from .f1_stream import iter_json_array, reduce_fastest_lap, reduce_final_positions
+
+# Bytes read per chunk when streaming large feeds
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Upper bound on how long to wait before retrying a rate-limited request
+MAX_RETRY_DELAY = 30
+
 
 class F1API:
     """Wrapper for F1 API integration"""
 
-    def __init__(self):
+    def __init__(self, use_cache=True):
         self.base_url = settings.F1_API_BASE_URL
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "F1BettingPool/1.0"})
+        self.cache = F1ResponseCache.from_settings() if use_cache else None
+        self.max_retries = getattr(settings, "F1_API_MAX_RETRIES", 3)
 
-    def get_drivers(self, year=2024):
+    def _get(self, endpoint, params, label, final=False, reducer=None):
         """
-        Get list of drivers for a specific year
-        Note: OpenF1 API structure may vary - this is a template
+        GET an endpoint through the response cache
+        final=True marks the data as immutable (completed season/session), so it is cached forever;
+        otherwise it is cached for the live TTL and revalidated with ETag/Last-Modified when stale.
+        With a reducer, the response is streamed record by record into reducer() and only
+        its (small) result is returned and cached.
         """
+        cache_endpoint = endpoint if reducer is None else f"{endpoint}#{reducer.__name__}"
+        entry = self.cache.get(cache_endpoint, params) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry["payload"]
+
+        ttl = None if final else (self.cache.live_ttl if self.cache else None)
+
+        try:
+            response = self._send(
+                f"{self.base_url}/{endpoint}",
+                params=params,
+                headers=self._validator_headers(entry),
+                timeout=10,
+                stream=reducer is not None,
+            )
+            try:
+                if response.status_code == 304 and entry is not None:
+                    self.cache.refresh(entry, ttl=ttl)
+                    return entry["payload"]
+
+                if response.status_code == 200:
+                    payload = self._read_payload(response, reducer)
+                    if self.cache:
+                        self.cache.set(
+                            cache_endpoint,
+                            params,
+                            payload,
+                            ttl=ttl,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"),
+                        )
+                    return payload
+                else:
+                    print(f"Failed to fetch {label}: {response.status_code}")
+                    return None
+            finally:
+                if reducer is not None:
+                    response.close()
+
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching {label}: {e}")
+            # Serve stale data rather than nothing when the API is unreachable
+            return entry["payload"] if entry is not None else None
+
+    def _send(self, url, **kwargs):
+        """GET a URL, backing off and retrying while the API answers 429 Too Many Requests"""
+        for attempt in range(self.max_retries + 1):
+            response = self.session.get(url, **kwargs)
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+            response.close()
+            time.sleep(self._retry_delay(response, attempt))
+        return response
+
+    @staticmethod
+    def _retry_delay(response, attempt):
+        """Seconds to wait before retrying: Retry-After when given, else exponential backoff"""
         try:
-            # OpenF1 example endpoint
-            response = self.session.get(f"{self.base_url}/drivers", params={"session_key": f"{year}_latest"}, timeout=10)
+            delay = float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            delay = 0.5 * 2**attempt
+        return min(max(delay, 0), MAX_RETRY_DELAY)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to fetch drivers: {response.status_code}")
-                return None
+    @staticmethod
+    def _validator_headers(entry):
+        """Conditional request headers for revalidating a stale cache entry"""
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
 
-        except requests.RequestException as e:
-            print(f"Error fetching drivers: {e}")
-            return None
+    @staticmethod
+    def _read_payload(response, reducer=None):
+        """Decode a response body, streaming it through reducer when one is given"""
+        if reducer is None:
+            return response.json()
+        return reducer(iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)))
+
+    def get_drivers(self, year=2024):
+        """
+        Get list of drivers for a specific year
+        Note: OpenF1 API structure may vary - this is a template
+        """
+        # OpenF1 example endpoint
+        return self._get("drivers", {"session_key": f"{year}_latest"}, "drivers", final=year < timezone.now().year)
 
     def get_race_schedule(self, year=2024):
         """Get race schedule for a specific year"""
-        try:
-            # This is a template - adjust based on actual API structure
-            response = self.session.get(f"{self.base_url}/sessions", params={"year": year, "session_type": "Race"}, timeout=10)
+        # This is a template - adjust based on actual API structure
+        return self._get("sessions", {"year": year, "session_type": "Race"}, "schedule", final=year < timezone.now().year)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to fetch schedule: {response.status_code}")
-                return None
+    def get_race_results(self, session_key, completed=False):
+        """
+        Get race results for a specific session
+        Pass completed=True once the session is over so the results are cached permanently
+        """
+        return self._get("position", {"session_key": session_key}, "results", final=completed)
 
-        except requests.RequestException as e:
-            print(f"Error fetching schedule: {e}")
-            return None
+    def get_final_positions(self, session_key, completed=False):
+        """
+        Get the final classification for a session, one row per driver ordered by position
+        The position feed is streamed and reduced on the fly instead of being loaded whole.
+        """
+        return self._get("position", {"session_key": session_key}, "results", final=completed, reducer=reduce_final_positions)
 
-    def get_race_results(self, session_key):
-        """Get race results for a specific session"""
-        try:
-            response = self.session.get(f"{self.base_url}/position", params={"session_key": session_key}, timeout=10)
+    def get_session_result(self, session_key, completed=False):
+        """Get the official classification (position, DNF/DNS/DSQ flags) for a session"""
+        return self._get("session_result", {"session_key": session_key}, "session result", final=completed)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to fetch results: {response.status_code}")
-                return None
+    def get_starting_grid(self, session_key, completed=False):
+        """Get the starting grid for a race session"""
+        return self._get("starting_grid", {"session_key": session_key}, "starting grid", final=completed)
 
-        except requests.RequestException as e:
-            print(f"Error fetching results: {e}")
-            return None
+    def get_fastest_lap(self, session_key, completed=False):
+        """Get the fastest lap of a session, streamed and reduced from the /laps feed"""
+        return self._get("laps", {"session_key": session_key}, "laps", final=completed, reducer=reduce_fastest_lap)
 
 
 def get_sample_f1_drivers():
@@ -0,0 +1,104 @@
+"""
+On-disk response cache for the OpenF1 API
+Payloads are stored gzip-compressed and keyed by endpoint and query params
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+class F1ResponseCache:
+    """
+    Gzip-compressed JSON file cache for F1 API responses
+
+    Entries written with ttl=None never expire (completed sessions).
+    Entries with a ttl go stale after that many seconds, but keep their
+    ETag/Last-Modified validators so they can be revalidated upstream.
+    """
+
+    def __init__(self, directory, live_ttl=60):
+        self.directory = Path(directory)
+        self.live_ttl = live_ttl
+
+    @classmethod
+    def from_settings(cls):
+        """Build the cache from settings, or return None when caching is disabled"""
+        directory = getattr(settings, "F1_API_CACHE_DIR", "")
+        if not directory:
+            return None
+        return cls(directory, live_ttl=getattr(settings, "F1_API_CACHE_LIVE_TTL", 60))
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """Stable cache key for an endpoint and its query params"""
+        canonical = json.dumps({"endpoint": endpoint, "params": params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def get(self, endpoint, params=None):
+        """Return the cached entry (fresh or stale), or None on a miss"""
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, EOFError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        """Check whether an entry can be served without contacting the API"""
+        expires_at = entry.get("expires_at")
+        return expires_at is None or time.time() < expires_at
+
+    def set(self, endpoint, params, payload, ttl=None, etag=None, last_modified=None):
+        """Store a payload; ttl=None marks it immutable"""
+        now = time.time()
+        entry = {
+            "endpoint": endpoint,
+            "params": params or {},
+            "payload": payload,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "expires_at": None if ttl is None else now + ttl,
+        }
+        self._write(self.make_key(endpoint, params), entry)
+        return entry
+
+    def refresh(self, entry, ttl=None):
+        """Extend an entry after the API confirmed it is unchanged (304)"""
+        return self.set(
+            entry["endpoint"],
+            entry["params"],
+            entry["payload"],
+            ttl=ttl,
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+        )
+
+    def clear(self):
+        """Remove every cached response"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, key, entry):
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+                fh.write(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
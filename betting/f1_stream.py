@@ -0,0 +1,99 @@
+"""
+Incremental parsing of OpenF1 JSON responses
+Feeds are decoded record by record, so memory stays bounded regardless of feed size
+"""
+
+import codecs
+import json
+
+# Guard against a malformed feed buffering forever while waiting for a record to close
+MAX_RECORD_SIZE = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(chunks):  # noqa: C901
+    """
+    Yield the elements of a top-level JSON array from an iterable of bytes/str chunks
+    Only the current chunk and the record being decoded are held in memory.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = finished = False
+
+    for chunk in chunks:
+        buffer += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+            elif finished:
+                raise ValueError("Unexpected data after JSON array")
+            elif char == "]":
+                finished = True
+                pos += 1
+            elif char == ",":
+                pos += 1
+            else:
+                try:
+                    item, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # record continues in the next chunk
+                if end == len(buffer) and not isinstance(item, (dict, list, str)):
+                    break  # a bare number/literal may be cut off mid-token
+                pos = end
+                yield item
+
+        buffer = buffer[pos:]
+        if len(buffer) > MAX_RECORD_SIZE:
+            raise ValueError("JSON record exceeds maximum size")
+
+    buffer += utf8.decode(b"", final=True)
+    if not finished or buffer.strip():
+        raise ValueError("Truncated JSON array")
+
+
+def reduce_final_positions(samples):
+    """
+    Reduce a stream of OpenF1 position samples to the final classification
+    Returns one {"driver_number", "position", "date"} row per driver, ordered by position.
+    """
+    latest = {}
+    for sample in samples:
+        driver_number = sample.get("driver_number")
+        position = sample.get("position")
+        if driver_number is None or position is None:
+            continue
+
+        date = sample.get("date") or ""
+        current = latest.get(driver_number)
+        if current is None or date >= current["date"]:
+            latest[driver_number] = {"driver_number": driver_number, "position": position, "date": date}
+
+    return sorted(latest.values(), key=lambda row: row["position"])
+
+
+def reduce_fastest_lap(laps):
+    """
+    Reduce a stream of OpenF1 lap records to the session's fastest lap
+    Returns {"driver_number", "lap_number", "lap_duration"}, or None when no timed laps exist.
+    """
+    fastest = None
+    for lap in laps:
+        duration = lap.get("lap_duration")
+        if duration is None or lap.get("driver_number") is None:
+            continue
+        if fastest is None or duration < fastest["lap_duration"]:
+            fastest = {"driver_number": lap["driver_number"], "lap_number": lap.get("lap_number"), "lap_duration": duration}
+    return fastest
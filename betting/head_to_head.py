@@ -0,0 +1,84 @@
+"""
+Head-to-head comparison
+Two users' seasons in a competition side by side, race by race, read from the per-race RaceScore
+rows written when each race is scored (indexed by competition and user) rather than from their
+bets. Every per-user value is a [first user, second user] pair.
+"""
+
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Concat
+
+from .models import Bet, CompetitionStanding, RaceScore
+
+
+def head_to_head(competition, user_ids, picks=True):
+    """
+    Compare two users over a competition's scored races, in three queries (two without picks)
+    A user who did not bet on a race has null points there. Picks are only included for scored
+    races, so nobody sees a rival's bets before the deadline. Returns None unless both users have
+    a place in the standings.
+    """
+    standings = {
+        user_id: {"user": user_id, "user_display_name": display_name or "", "rank": rank, "total_points": total_points}
+        for user_id, display_name, rank, total_points in CompetitionStanding.objects.filter(
+            competition=competition, user_id__in=user_ids
+        ).values_list("user_id", "user__profile__display_name", "rank", "total_points")
+    }
+    if len(standings) < 2:
+        return None
+    index = {user_id: position for position, user_id in enumerate(user_ids)}
+
+    races = {}
+    scores = RaceScore.objects.filter(competition=competition, user_id__in=user_ids).order_by()
+    for race_id, name, round_number, user_id, points, exact, partial in scores.values_list(
+        "race_id", "race__name", "race__round_number", "user_id", "points", "exact_predictions", "partial_predictions"
+    ):
+        race = races.setdefault(
+            race_id,
+            {
+                "race": race_id,
+                "race_name": name,
+                "round_number": round_number,
+                "points": [None, None],
+                "exact": [None, None],
+                "partial": [None, None],
+            },
+        )
+        race["points"][index[user_id]] = points
+        race["exact"][index[user_id]] = exact
+        race["partial"][index[user_id]] = partial
+
+    if picks:
+        positions = {race_id: {} for race_id in races}
+        bets = Bet.objects.filter(user_id__in=user_ids, race_id__in=races).order_by()
+        for race_id, user_id, position, driver_id, driver_name in bets.values_list(
+            "race_id",
+            "user_id",
+            "predicted_position",
+            "driver_id",
+            Concat(F("driver__first_name"), Value(" "), F("driver__last_name"), output_field=CharField()),
+        ):
+            pick = positions[race_id].setdefault(
+                position, {"position": position, "drivers": [None, None], "driver_names": [None, None]}
+            )
+            pick["drivers"][index[user_id]] = driver_id
+            pick["driver_names"][index[user_id]] = driver_name
+        for race_id, race in races.items():
+            race["picks"] = [positions[race_id][position] for position in sorted(positions[race_id])]
+
+    totals = {"points": [0, 0], "exact": [0, 0], "partial": [0, 0], "races_won": [0, 0], "races_tied": 0}
+    for race in races.values():
+        for field in ("points", "exact", "partial"):
+            for side in (0, 1):
+                totals[field][side] += race[field][side] or 0
+        first, second = (points or 0 for points in race["points"])
+        if first == second:
+            totals["races_tied"] += 1
+        else:
+            totals["races_won"][0 if first > second else 1] += 1
+
+    return {
+        "users": [standings[user_id] for user_id in user_ids],
+        "totals": totals,
+        "races": sorted(races.values(), key=lambda race: race["round_number"]),
+    }
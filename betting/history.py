@@ -0,0 +1,93 @@
+"""
+Standings history
+After each race is scored, the competition's standings as of that round are stored as compact
+(user, rank, points) StandingSnapshot rows, so season-long rank-progression charts are one indexed
+read instead of a replay of every race's bets.
+"""
+
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.db.models import Max, Sum
+
+from .models import Bet, CompetitionStanding, Race, StandingSnapshot
+
+
+def snapshot_standings(competition, from_round=1):
+    """
+    Record the standings after each scored round from from_round on; returns the rows written
+    Totals carry on from the latest snapshot before from_round, plus one grouped query for the
+    points scored since, so scoring the next race only reads that race's bets. Rounds are ranked
+    the way update_standings ranks the live table. Rescoring a round rewrites its snapshot and
+    every later one; rounds never snapshotted (scored before this existed) are filled in.
+    """
+    snapshots = StandingSnapshot.objects.filter(competition=competition).order_by()
+    previous = snapshots.filter(round_number__lt=from_round).aggregate(round=Max("round_number"))["round"] or 0
+    totals = dict(snapshots.filter(round_number=previous).values_list("user_id", "total_points"))
+
+    points = defaultdict(dict)
+    scored = (
+        Bet.objects.filter(race__competition=competition, race__round_number__gt=previous, is_scored=True)
+        .values("user_id", "race__round_number")
+        .annotate(points=Sum("points_earned"))
+    )
+    for row in scored:
+        points[row["race__round_number"]][row["user_id"]] = row["points"]
+    completed = Race.objects.filter(competition=competition, status="completed", round_number__gt=previous)
+    rounds = sorted(set(points) | set(completed.values_list("round_number", flat=True)))
+
+    # Everyone in the live table has a rank, with or without scored bets
+    for user_id in CompetitionStanding.objects.filter(competition=competition).values_list("user_id", flat=True):
+        totals.setdefault(user_id, 0)
+    for round_points in points.values():
+        for user_id in round_points:
+            totals.setdefault(user_id, 0)
+    emails = dict(User.objects.filter(id__in=totals.keys()).values_list("id", "email"))
+
+    rows = []
+    for round_number in rounds:
+        for user_id, round_points in points[round_number].items():
+            totals[user_id] += round_points
+        ordered = sorted(totals, key=lambda user_id: (-totals[user_id], emails.get(user_id, "")))
+        rows.extend(
+            StandingSnapshot(
+                competition=competition, user_id=user_id, round_number=round_number, rank=rank, total_points=totals[user_id]
+            )
+            for rank, user_id in enumerate(ordered, start=1)
+        )
+
+    snapshots.filter(round_number__gt=previous).delete()
+    StandingSnapshot.objects.bulk_create(rows, batch_size=5000)
+    return len(rows)
+
+
+def progression(competition, user_ids=None, top=10):
+    """
+    Rank and points after every snapshotted round, as columnar arrays for charts
+    For the given users, or the current top `top` of the standings. Rounds a user has no
+    snapshot for are null.
+    """
+    standings = CompetitionStanding.objects.filter(competition=competition).order_by("rank")
+    standings = standings.filter(user_id__in=user_ids) if user_ids is not None else standings[:top]
+    users = list(standings.values_list("user_id", "user__profile__display_name"))
+
+    history = defaultdict(dict)
+    rows = StandingSnapshot.objects.filter(
+        competition=competition, user_id__in=[user_id for user_id, name in users]
+    ).order_by()
+    for user_id, round_number, rank, total_points in rows.values_list("user_id", "round_number", "rank", "total_points"):
+        history[user_id][round_number] = (rank, total_points)
+
+    rounds = sorted({round_number for by_round in history.values() for round_number in by_round})
+    series = []
+    for user_id, display_name in users:
+        by_round = history[user_id]
+        series.append(
+            {
+                "user": user_id,
+                "user_display_name": display_name or "",
+                "rank": [by_round[round_number][0] if round_number in by_round else None for round_number in rounds],
+                "points": [by_round[round_number][1] if round_number in by_round else None for round_number in rounds],
+            }
+        )
+    return {"rounds": rounds, "users": series}
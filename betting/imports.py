@@ -0,0 +1,324 @@
+"""
+Bulk import of historical bets and race results from CSV or NDJSON files (optionally gzipped)
+Files are read a chunk at a time. Races, drivers and bet types are resolved through in-memory maps
+loaded once, and users through a map filled with one query per chunk for the usernames it has not
+seen yet. Unique constraints are checked against the file and the database with one query per
+chunk, and each chunk's valid rows are inserted with bulk_create in its own transaction. Rows that
+fail are written, with the reason, to a rejects file in the input's format, ready to be fixed and
+imported again. Column names match what `export_data` writes.
+"""
+
+import csv
+import gzip
+import json
+import time
+from abc import ABC, abstractmethod
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .crowd import tally_races
+from .history import snapshot_standings
+from .models import Bet, BetType, Competition, Driver, Race, RaceResult
+from .scoring import record_race_scores, update_standings
+
+TRUE = {"1", "true", "t", "yes", "y"}
+FALSE = {"0", "false", "f", "no", "n", ""}
+
+
+class RejectedRow(Exception):
+    pass
+
+
+def file_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise ValueError(f"Cannot tell the format of {path}: expected .csv, .ndjson or .jsonl (optionally .gz)")
+
+
+def open_file(path, mode="r"):
+    opener = gzip.open if path.endswith(".gz") else open
+    return opener(path, mode + "t", encoding="utf-8", newline="")
+
+
+def read_rows(file, fmt):
+    """CSV rows as dicts; NDJSON as raw lines, decoded per row so one bad line is only one rejection"""
+    if fmt == "csv":
+        return csv.DictReader(file)
+    return (line for line in file if line.strip())
+
+
+def integer(row, field, minimum=None, maximum=None, required=True):
+    value = row.get(field)
+    if value in (None, ""):
+        if required:
+            raise RejectedRow(f"{field} is required")
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise RejectedRow(f"{field} must be a whole number, got {value!r}")
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise RejectedRow(f"{field} must be between {minimum} and {maximum}, got {value}")
+    return value
+
+
+def boolean(row, field):
+    value = row.get(field)
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    if str(value).strip().lower() in TRUE:
+        return True
+    if str(value).strip().lower() in FALSE:
+        return False
+    raise RejectedRow(f"{field} must be true or false, got {value!r}")
+
+
+class Importer(ABC):
+    """
+    Turns rows into model instances and inserts them a chunk at a time
+    Subclasses set `model`, `unique_fields` (a unique constraint checked before inserting) and
+    implement build(row).
+    """
+
+    model = None
+    unique_fields = ()
+
+    def __init__(self, competition=None):
+        # With a competition, races are matched by round number within it rather than by race_id
+        self.competition = competition
+        races = list(Race.objects.values_list("id", "competition_id", "round_number"))
+        self.race_ids = {race_id: competition_id for race_id, competition_id, round_number in races}
+        self.race_rounds = {(competition_id, round_number): race_id for race_id, competition_id, round_number in races}
+        self.drivers = dict(Driver.objects.values_list("driver_number", "id"))
+        self.competitions = set()
+
+    def race(self, row):
+        if self.competition is None and row.get("race_id") not in (None, ""):
+            race_id = integer(row, "race_id")
+            if race_id not in self.race_ids:
+                raise RejectedRow(f"Unknown race_id {race_id}")
+        else:
+            competition = self.competition or integer(row, "competition_id")
+            key = (competition, integer(row, "round_number"))
+            if key not in self.race_rounds:
+                raise RejectedRow(f"No round {key[1]} in competition {key[0]}")
+            race_id = self.race_rounds[key]
+        self.competitions.add(self.race_ids[race_id])
+        return race_id
+
+    def driver(self, row):
+        number = integer(row, "driver_number")
+        if number not in self.drivers:
+            raise RejectedRow(f"Unknown driver_number {number}")
+        return self.drivers[number]
+
+    def prepare(self, rows):
+        """Load whatever the chunk needs that is not in memory yet"""
+
+    @abstractmethod
+    def build(self, row):
+        """A model instance for a decoded row; raises RejectedRow if the row cannot be imported"""
+
+    def finish(self):
+        """Refresh whatever is derived from the imported rows, once the whole file is in"""
+
+    def key(self, obj):
+        return tuple(getattr(obj, self.model._meta.get_field(field).attname) for field in self.unique_fields)
+
+    def existing(self, keys):
+        """Those of the keys already in the database, in one query"""
+        lookups = {f"{field}__in": {key[index] for key in keys} for index, field in enumerate(self.unique_fields)}
+        return set(self.model.objects.filter(**lookups).values_list(*self.unique_fields)) & keys
+
+    def decode(self, item):
+        if not isinstance(item, str):
+            return item
+        try:
+            row = json.loads(item)
+        except ValueError as exc:
+            raise RejectedRow(f"Invalid JSON: {exc}")
+        if not isinstance(row, dict):
+            raise RejectedRow("Expected a JSON object")
+        return row
+
+    def import_chunk(self, items):
+        """Insert a chunk's valid rows in one transaction; returns (rows inserted, [(item, reason), ...])"""
+        rejects, decoded = [], []
+        for item in items:
+            try:
+                decoded.append((item, self.decode(item)))
+            except RejectedRow as exc:
+                rejects.append((item, str(exc)))
+        self.prepare([row for item, row in decoded])
+
+        built = {}
+        for item, row in decoded:
+            try:
+                obj = self.build(row)
+            except RejectedRow as exc:
+                rejects.append((item, str(exc)))
+                continue
+            key = self.key(obj)
+            if key in built:
+                rejects.append((item, "Duplicate of an earlier row in the file"))
+            else:
+                built[key] = (item, obj)
+
+        # Rows from earlier chunks are already committed, so this catches repeats across the whole file
+        for key in self.existing(set(built)) if built else ():
+            rejects.append((built.pop(key)[0], "Already exists"))
+
+        with transaction.atomic():
+            self.model.objects.bulk_create([obj for item, obj in built.values()])
+        return len(built), rejects
+
+
+class BetImporter(Importer):
+    """Bets, matched to users by username and to bet types by code (top10 if the column is absent)"""
+
+    model = Bet
+    unique_fields = ("user", "race", "bet_type", "predicted_position")
+
+    def __init__(self, competition=None):
+        super().__init__(competition)
+        self.bet_types = dict(BetType.objects.values_list("code", "id"))
+        self.users = {}
+        self.races = set()
+
+    def prepare(self, rows):
+        usernames = {row.get("username") for row in rows} - self.users.keys() - {None, ""}
+        if usernames:
+            found = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+            # Remember misses too, so unknown users are looked up only once
+            self.users.update({username: found.get(username) for username in usernames})
+
+    def build(self, row):
+        user_id = self.users.get(row.get("username"))
+        if user_id is None:
+            raise RejectedRow(f"Unknown username {row.get('username')!r}" if row.get("username") else "username is required")
+        code = row.get("bet_type") or "top10"
+        if code not in self.bet_types:
+            raise RejectedRow(f"Unknown bet_type {code!r}")
+
+        race_id = self.race(row)
+        self.races.add(race_id)
+        return Bet(
+            user_id=user_id,
+            race_id=race_id,
+            bet_type_id=self.bet_types[code],
+            driver_id=self.driver(row),
+            predicted_position=integer(row, "predicted_position", 1, 20),
+            points_earned=integer(row, "points_earned", required=False) or 0,
+            is_scored=boolean(row, "is_scored"),
+        )
+
+    def finish(self):
+        # Races still open are tallied when betting closes
+        tally_races(Race.objects.filter(id__in=self.races, betting_deadline__lte=timezone.now()).values_list("id", flat=True))
+
+
+class ResultImporter(Importer):
+    """Race results"""
+
+    model = RaceResult
+    unique_fields = ("race", "driver")
+
+    def build(self, row):
+        return RaceResult(
+            race_id=self.race(row),
+            driver_id=self.driver(row),
+            position=integer(row, "position", 1, 22),
+            grid_position=integer(row, "grid_position", required=False),
+            fastest_lap=boolean(row, "fastest_lap"),
+            did_not_finish=boolean(row, "did_not_finish"),
+            dnf_reason=row.get("dnf_reason") or "",
+            verified=boolean(row, "verified"),
+        )
+
+
+class Rejects:
+    """Rejected rows with their reason, written in the input's format once the first one arrives"""
+
+    def __init__(self, path, fmt):
+        self.path, self.format = path, fmt
+        self.file = self.writer = None
+        self.count = 0
+
+    def write(self, item, reason):
+        if self.file is None:
+            self.file = open_file(self.path, "w")
+        self.count += 1
+        if self.format == "ndjson":
+            try:
+                row = {**json.loads(item), "error": reason}
+            except (ValueError, TypeError):
+                row = {"line": item.rstrip("\n"), "error": reason}
+            self.file.write(json.dumps(row) + "\n")
+            return
+
+        if self.writer is None:
+            fieldnames = [name for name in item if name is not None and name != "error"] + ["error"]
+            self.writer = csv.DictWriter(self.file, fieldnames, extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow({**item, "error": reason})
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def rejects_path(path):
+    """bets.csv.gz -> bets.rejected.csv.gz"""
+    suffix = ".gz" if path.endswith(".gz") else ""
+    stem = path[: len(path) - len(suffix)]
+    stem, dot, extension = stem.rpartition(".")
+    return f"{stem}.rejected.{extension}{suffix}"
+
+
+def import_file(importer, path, chunk_size=5000, rejected=None, progress=None):
+    """
+    Import a file with an Importer, a chunk at a time
+    Returns a summary: rows read, imported and rejected, seconds taken and the rejects file (or None).
+    `progress` is called with the running summary after every chunk.
+    """
+    fmt = file_format(path)
+    rejects = Rejects(rejected or rejects_path(path), fmt)
+    summary = {"read": 0, "imported": 0, "rejected": 0, "seconds": 0.0, "rejects": None}
+    started = time.monotonic()
+
+    try:
+        with open_file(path) as file:
+            rows = read_rows(file, fmt)
+            while chunk := list(islice(rows, chunk_size)):
+                imported, rows_rejected = importer.import_chunk(chunk)
+                for item, reason in rows_rejected:
+                    rejects.write(item, reason)
+                summary["read"] += len(chunk)
+                summary["imported"] += imported
+                summary["rejected"] += len(rows_rejected)
+                summary["seconds"] = time.monotonic() - started
+                if progress:
+                    progress(summary)
+    finally:
+        rejects.close()
+
+    summary["seconds"] = time.monotonic() - started
+    summary["rejects"] = rejects.path if rejects.count else None
+    if summary["imported"]:
+        importer.finish()
+    return summary
+
+
+def rebuild_standings(competition_ids):
+    """Rebuild per-race scores, standings and their round-by-round history after importing historical bets"""
+    for competition in Competition.objects.filter(id__in=competition_ids):
+        with transaction.atomic():
+            record_race_scores(competition)
+            update_standings(competition)
+            snapshot_standings(competition)
@@ -0,0 +1,291 @@
+"""
+OpenF1 ingestion
+Fetches sessions, drivers and race classifications concurrently and writes them with bulk upserts
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .f1_api import F1API
+from .models import Driver, Race, RaceResult
+from .scoring import score_race
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+# Results older than this are treated as final and cached permanently
+RESULTS_FINAL_AFTER = timedelta(days=1)
+
+
+def session_is_finished(session, now=None):
+    """Check whether an OpenF1 session has ended"""
+    date_end = parse_datetime(session.get("date_end") or "")
+    return date_end is not None and date_end < (now or timezone.now())
+
+
+def merge_classification(session_result=None, positions=None, grid=None, fastest_lap=None):
+    """
+    Combine OpenF1 classification sources into RaceResult-shaped rows
+    The official session result is preferred; streamed final positions are the fallback.
+    Each row has driver_number, position, grid_position, fastest_lap, did_not_finish and dnf_reason.
+    """
+    rows = []
+    if session_result:
+        classified = [r for r in session_result if r.get("driver_number") is not None]
+        # Unclassified drivers (no position) go to the back in feed order
+        classified.sort(key=lambda r: (r.get("position") is None, r.get("position") or 0))
+        for index, result in enumerate(classified, start=1):
+            reason = "DSQ" if result.get("dsq") else "DNS" if result.get("dns") else "DNF" if result.get("dnf") else ""
+            rows.append(
+                {
+                    "driver_number": result["driver_number"],
+                    "position": result.get("position") or index,
+                    "did_not_finish": bool(reason),
+                    "dnf_reason": reason,
+                }
+            )
+    else:
+        for row in positions or []:
+            rows.append(
+                {"driver_number": row["driver_number"], "position": row["position"], "did_not_finish": False, "dnf_reason": ""}
+            )
+
+    grid_positions = {g["driver_number"]: g.get("position") for g in grid or [] if g.get("driver_number") is not None}
+    fastest_driver = fastest_lap["driver_number"] if fastest_lap else None
+    for row in rows:
+        row["grid_position"] = grid_positions.get(row["driver_number"])
+        row["fastest_lap"] = row["driver_number"] == fastest_driver
+    return rows
+
+
+class APIPool:
+    """
+    Runs F1API calls from asyncio on a bounded thread pool
+
+    At most max_in_flight requests run at once. Each worker thread gets its own
+    F1API (and requests session); responses still go through the response cache.
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, api_factory=F1API):
+        self.api_factory = api_factory
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="f1-ingest")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown(wait=True)
+
+    def _call(self, method, args, kwargs):
+        if not hasattr(self.local, "api"):
+            self.local.api = self.api_factory()
+        return getattr(self.local.api, method)(*args, **kwargs)
+
+    def fetch(self, method, *args, **kwargs):
+        """Schedule an F1API method call and return an awaitable for its result"""
+        return asyncio.get_running_loop().run_in_executor(self.executor, self._call, method, args, kwargs)
+
+    async def classification(self, session_key, completed=False):
+        """Fetch and merge the full classification for one race session"""
+        session_result, grid, fastest_lap = await asyncio.gather(
+            self.fetch("get_session_result", session_key, completed=completed),
+            self.fetch("get_starting_grid", session_key, completed=completed),
+            self.fetch("get_fastest_lap", session_key, completed=completed),
+        )
+        positions = None
+        if not session_result:
+            positions = await self.fetch("get_final_positions", session_key, completed=completed)
+        return merge_classification(session_result, positions, grid, fastest_lap)
+
+
+async def fetch_season(year, max_in_flight=DEFAULT_MAX_IN_FLIGHT, include_results=True, api_factory=F1API):
+    """Fetch schedule, drivers and every session's classification for a season concurrently"""
+    with APIPool(max_in_flight, api_factory) as pool:
+        sessions, drivers = await asyncio.gather(pool.fetch("get_race_schedule", year), pool.fetch("get_drivers", year))
+        sessions = sorted(sessions or [], key=lambda s: s.get("date_start") or "")
+
+        now = timezone.now()
+        results = await asyncio.gather(
+            *(
+                pool.classification(session["session_key"], completed=session_is_finished(session, now))
+                for session in (sessions if include_results else [])
+            )
+        )
+
+    return {
+        "sessions": sessions,
+        "drivers": drivers or [],
+        "results": {session["session_key"]: rows for session, rows in zip(sessions, results)},
+    }
+
+
+async def fetch_classifications(session_keys, max_in_flight=DEFAULT_MAX_IN_FLIGHT, api_factory=F1API):
+    """
+    Fetch classifications for {session_key: completed} concurrently
+    Returns {session_key: classification rows}.
+    """
+    with APIPool(max_in_flight, api_factory) as pool:
+        results = await asyncio.gather(
+            *(pool.classification(session_key, completed=completed) for session_key, completed in session_keys.items())
+        )
+    return dict(zip(session_keys, results))
+
+
+def upsert_drivers(drivers):
+    """Insert or update drivers from an OpenF1 /drivers payload, keyed by driver_number"""
+    by_number = {}
+    for row in drivers:
+        if row.get("driver_number") is not None:
+            by_number[row["driver_number"]] = row
+
+    objs = [
+        Driver(
+            driver_number=number,
+            first_name=row.get("first_name") or "",
+            last_name=row.get("last_name") or "",
+            team=row.get("team_name") or "",
+            nationality=row.get("country_code") or "",
+            photo=row.get("headshot_url") or None,
+            api_driver_id=str(number),
+        )
+        for number, row in by_number.items()
+    ]
+    return Driver.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=["driver_number"],
+        update_fields=["first_name", "last_name", "team", "photo", "api_driver_id", "updated_at"],
+    )
+
+
+def upsert_races(competition, sessions, now=None):
+    """
+    Insert or update a competition's races from OpenF1 race sessions, keyed by round number
+    Existing races keep their lifecycle status, except that one whose session has finished since
+    is moved on to completed; a re-import never moves a race back or un-cancels it.
+    """
+    now = now or timezone.now()
+    objs = []
+    for round_number, session in enumerate(sessions, start=1):
+        race_datetime = parse_datetime(session["date_start"])
+        objs.append(
+            Race(
+                competition=competition,
+                round_number=round_number,
+                name=f"{session.get('country_name', '')} Grand Prix".strip(),
+                location=session.get("circuit_short_name") or session.get("location") or "",
+                country=session.get("country_name") or "",
+                race_datetime=race_datetime,
+                betting_deadline=race_datetime - timedelta(hours=2),
+                status="completed" if session_is_finished(session, now) else "scheduled",
+                api_race_id=str(session["session_key"]),
+            )
+        )
+    races = Race.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=["competition", "round_number"],
+        update_fields=["name", "location", "country", "race_datetime", "betting_deadline", "api_race_id", "updated_at"],
+    )
+    Race.objects.filter(
+        competition=competition, round_number__in=[race.round_number for race in objs if race.status == "completed"]
+    ).exclude(status__in=["completed", "cancelled"]).update(status="completed", updated_at=now)
+    return races
+
+
+def driver_lookup():
+    """Map OpenF1 driver numbers to Driver ids, preferring api_driver_id over driver_number"""
+    lookup = {}
+    rows = list(Driver.objects.values_list("id", "driver_number", "api_driver_id"))
+    for driver_id, driver_number, _ in rows:
+        lookup[str(driver_number)] = driver_id
+    for driver_id, _, api_driver_id in rows:
+        if api_driver_id:
+            lookup[api_driver_id] = driver_id
+    return lookup
+
+
+def upsert_results(classifications, verify=False):
+    """
+    Insert or update the full classification for each race from {race_id: classification rows}
+    Drivers are resolved through one lookup query, results are written with one bulk upsert,
+    and results for drivers missing from a new classification are removed.
+    """
+    drivers = driver_lookup()
+
+    objs = []
+    for race_id, classification in classifications.items():
+        for row in classification:
+            driver_id = drivers.get(str(row["driver_number"]))
+            if driver_id is None:
+                continue
+            objs.append(
+                RaceResult(
+                    race_id=race_id,
+                    driver_id=driver_id,
+                    position=row["position"],
+                    grid_position=row.get("grid_position"),
+                    fastest_lap=row.get("fastest_lap", False),
+                    did_not_finish=row.get("did_not_finish", False),
+                    dnf_reason=row.get("dnf_reason", ""),
+                    api_result_id=f"{race_id}:{row['driver_number']}",
+                    verified=verify,
+                )
+            )
+
+    stale = Q()
+    for race_id in {obj.race_id for obj in objs}:
+        stale |= Q(race_id=race_id) & ~Q(driver_id__in=[obj.driver_id for obj in objs if obj.race_id == race_id])
+    if stale:
+        RaceResult.objects.filter(stale).delete()
+
+    update_fields = ["position", "grid_position", "fastest_lap", "did_not_finish", "dnf_reason", "api_result_id", "updated_at"]
+    if verify:
+        update_fields.append("verified")
+    return RaceResult.objects.bulk_create(
+        objs, update_conflicts=True, unique_fields=["race", "driver"], update_fields=update_fields
+    )
+
+
+def import_season(competition, year, max_in_flight=DEFAULT_MAX_IN_FLIGHT, include_results=True):
+    """Fetch a full season concurrently and write it in one transaction"""
+    season = asyncio.run(fetch_season(year, max_in_flight=max_in_flight, include_results=include_results))
+
+    with transaction.atomic():
+        drivers = upsert_drivers(season["drivers"])
+        races = upsert_races(competition, season["sessions"])
+        race_ids = dict(Race.objects.filter(competition=competition).values_list("api_race_id", "id"))
+        results = upsert_results({race_ids[str(key)]: rows for key, rows in season["results"].items() if str(key) in race_ids})
+
+    return {"drivers": len(drivers), "races": len(races), "results": len(results)}
+
+
+def ingest_results(races, verify=False, score=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, api_factory=F1API):
+    """
+    Fetch and store the classification of each race (matched on Race.api_race_id)
+    With score=True the results are verified and every race is (re-)scored straight away.
+    Returns counts of races ingested, results written and races scored.
+    """
+    races = [race for race in races if race.api_race_id]
+    final_before = timezone.now() - RESULTS_FINAL_AFTER
+    session_keys = {race.api_race_id: race.status == "completed" or race.race_datetime < final_before for race in races}
+    classifications = asyncio.run(fetch_classifications(session_keys, max_in_flight=max_in_flight, api_factory=api_factory))
+
+    ingested = [race for race in races if classifications.get(race.api_race_id)]
+    with transaction.atomic():
+        results = upsert_results({race.id: classifications[race.api_race_id] for race in ingested}, verify=verify or score)
+
+    scored = 0
+    if score:
+        for race in ingested:
+            score_race(race, rescore=True)
+            scored += 1
+
+    return {"races": len(ingested), "results": len(results), "scored": scored}
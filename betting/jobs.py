@@ -0,0 +1,117 @@
+"""
+Database-backed job queue
+Jobs live in the Job table. Workers claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED where the
+database supports it (PostgreSQL), or with a conditional UPDATE per job elsewhere (SQLite), so any
+number of `run_worker` processes can share one queue without running a job twice.
+"""
+
+import traceback
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .ingestion import ingest_results
+from .models import Competition, Job, Race
+from .projection import update_projection
+from .scoring import score_race, update_standings
+
+# Seconds before the first retry; doubles with every attempt
+RETRY_BACKOFF = 30
+
+# A job still running after this long is assumed to belong to a dead worker
+STALE_AFTER = timedelta(minutes=30)
+
+# A due job still queued after this long means no worker is claiming jobs
+UNCLAIMED_AFTER = timedelta(minutes=1)
+
+
+def run_score_race(race_id, rescore=False):
+    race = Race.objects.select_related("competition").get(id=race_id)
+    return score_race(race, rescore=rescore)
+
+
+def run_update_standings(competition_id):
+    with transaction.atomic():
+        return {"standings": update_standings(Competition.objects.get(id=competition_id))}
+
+
+def run_ingest_results(race_ids, verify=False, score=False):
+    races = list(Race.objects.select_related("competition").filter(id__in=race_ids))
+    return ingest_results(races, verify=verify, score=score)
+
+
+HANDLERS = {
+    "score_race": run_score_race,
+    "update_standings": run_update_standings,
+    "ingest_results": run_ingest_results,
+    "update_projection": update_projection,
+}
+
+
+def enqueue(kind, delay=None, max_attempts=3, **payload):
+    """Queue a job; the payload is passed to its handler as keyword arguments"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    run_after = timezone.now() + (delay or timedelta())
+    return Job.objects.create(kind=kind, payload=payload, max_attempts=max_attempts, run_after=run_after)
+
+
+def unclaimed_jobs(now=None):
+    """Number of queued jobs that have been due for longer than UNCLAIMED_AFTER"""
+    now = now or timezone.now()
+    return Job.objects.filter(status="queued", run_after__lte=now - UNCLAIMED_AFTER).count()
+
+
+def claim_jobs(worker_id, limit=1, now=None):
+    """Atomically mark up to `limit` due jobs as running for this worker and return them"""
+    now = now or timezone.now()
+    due = Job.objects.filter(status="queued", run_after__lte=now).order_by("run_after", "id")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(status="running", locked_by=worker_id, locked_at=now, updated_at=now)
+    else:
+        # No row locks: claim candidates one by one, losing any race to another worker
+        ids = []
+        for job_id in due.values_list("id", flat=True)[: limit * 2]:
+            claimed = Job.objects.filter(id=job_id, status="queued").update(
+                status="running", locked_by=worker_id, locked_at=now, updated_at=now
+            )
+            if claimed:
+                ids.append(job_id)
+            if len(ids) == limit:
+                break
+
+    return list(Job.objects.filter(id__in=ids).order_by("run_after", "id"))
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome; failures are retried with exponential backoff"""
+    job.attempts += 1
+    try:
+        job.result = HANDLERS[job.kind](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_BACKOFF * 2 ** (job.attempts - 1))
+        else:
+            job.status = "failed"
+    else:
+        job.status = "succeeded"
+        job.last_error = ""
+
+    job.locked_by = ""
+    job.locked_at = None
+    job.save(update_fields=["attempts", "result", "last_error", "status", "run_after", "locked_by", "locked_at", "updated_at"])
+    return job
+
+
+def requeue_stale(now=None):
+    """Put jobs abandoned by a dead worker back on the queue; returns how many"""
+    now = now or timezone.now()
+    return Job.objects.filter(status="running", locked_at__lt=now - STALE_AFTER).update(
+        status="queued", locked_by="", locked_at=None, updated_at=now
+    )
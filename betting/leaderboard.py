@@ -0,0 +1,65 @@
+"""
+Leaderboard slices
+The top N, the window of ranks around a user and a user's percentile, each answered from the
+(competition, rank) index with a bounded range scan, so the cost does not grow with the number of
+participants. Participants who joined since standings were last updated have rank 0 and are left
+out until the next update. standings_version is the change marker that live streams, projections
+and cached statistics compare to tell whether standings moved.
+"""
+
+from django.db.models import Count, Max
+
+from .models import CompetitionStanding
+
+
+def ranked(competition_id):
+    return CompetitionStanding.objects.filter(competition_id=competition_id, rank__gt=0)
+
+
+def user_rank(competition_id, user_id):
+    """A user's rank in a competition, or None if they have none yet"""
+    return ranked(competition_id).filter(user_id=user_id).order_by().values_list("rank", flat=True).first()
+
+
+def top(competition_id, n):
+    """Standings rows ranked 1 to n"""
+    return ranked(competition_id).filter(rank__lte=n).order_by("rank")
+
+
+def around(competition_id, rank, k):
+    """Standings rows within k places of rank"""
+    # One lower bound only: given rank > 0 as well, SQLite may range-scan from rank 1
+    return CompetitionStanding.objects.filter(
+        competition_id=competition_id, rank__gte=max(rank - k, 1), rank__lte=rank + k
+    ).order_by("rank")
+
+
+def percentile(competition_id, rank):
+    """Where a rank sits in the competition: its ranked total, the top-X% it is in and the percentage of users behind it"""
+    total = ranked(competition_id).order_by("-rank").values_list("rank", flat=True).first() or 0
+    return {
+        "rank": rank,
+        "total": total,
+        "top_percent": round(100 * rank / total, 2) if total else None,
+        "percentile": round(100 * (total - rank) / total, 2) if total else None,
+    }
+
+
+def standings_rows(competition_id=None):
+    standings = CompetitionStanding.objects.all()
+    return standings if competition_id is None else standings.filter(competition_id=competition_id)
+
+
+def version_token(marker):
+    updated = marker["updated"].timestamp() if marker["updated"] else 0
+    return f"{marker['rows']}-{updated}"
+
+
+def standings_version(competition_id=None):
+    """Change marker for a competition's standings, or all standings: row count and latest update, as a string"""
+    return version_token(standings_rows(competition_id).aggregate(rows=Count("id"), updated=Max("updated_at")))
+
+
+async def astandings_version(competition_id=None):
+    """Async standings_version"""
+    return version_token(await standings_rows(competition_id).aaggregate(rows=Count("id"), updated=Max("updated_at")))
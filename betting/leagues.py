@@ -0,0 +1,84 @@
+"""
+Private leagues
+A league is a pool of users within one competition, joined with an invite code. Bets are scored
+once per race for the whole competition; a league's standings just sum its members' RaceScore rows,
+so thousands of small leagues on one season add no scoring work.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils.crypto import get_random_string
+
+from .models import CompetitionStanding, League, LeagueMembership, RaceScore
+
+# No 0/O or 1/I, so codes read out loud or copied by hand still work
+INVITE_CODE_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+INVITE_CODE_LENGTH = 8
+
+
+def new_invite_code():
+    while True:
+        code = get_random_string(INVITE_CODE_LENGTH, INVITE_CODE_CHARS)
+        if not League.objects.filter(invite_code=code).exists():
+            return code
+
+
+def join_league(league, user):
+    """Add a user to a league, and to its competition if they are not in it yet; returns True if newly joined"""
+    with transaction.atomic():
+        membership, created = LeagueMembership.objects.get_or_create(league=league, user=user)
+        if created:
+            league.competition.participants.add(user)
+            CompetitionStanding.objects.get_or_create(competition=league.competition, user=user)
+    return created
+
+
+def create_league(competition, user, name, start_round=1):
+    """Create a league with a fresh invite code, its creator as the first member"""
+    with transaction.atomic():
+        league = League.objects.create(
+            competition=competition, name=name, start_round=start_round, created_by=user, invite_code=new_invite_code()
+        )
+        join_league(league, user)
+    return league
+
+
+def league_standings(league):
+    """
+    A league's members ranked on their points from start_round on, in two queries
+    Ties are broken by email, like the competition standings.
+    """
+    members = list(
+        LeagueMembership.objects.filter(league=league)
+        .order_by()
+        .values_list("user_id", "user__profile__display_name", "user__email")
+    )
+
+    scores = RaceScore.objects.filter(
+        competition_id=league.competition_id, user_id__in=LeagueMembership.objects.filter(league=league).values("user_id")
+    )
+    if league.start_round > 1:
+        scores = scores.filter(race__round_number__gte=league.start_round)
+    totals = {
+        row["user_id"]: row
+        for row in scores.values("user_id")
+        .annotate(
+            total_points=Sum("points"),
+            races_predicted=Count("id"),
+            exact_predictions=Sum("exact_predictions"),
+            partial_predictions=Sum("partial_predictions"),
+        )
+        .order_by()
+    }
+
+    empty = {"total_points": 0, "races_predicted": 0, "exact_predictions": 0, "partial_predictions": 0}
+    members.sort(key=lambda member: (-totals.get(member[0], empty)["total_points"], member[2]))
+    return [
+        {
+            "rank": rank,
+            "user": user_id,
+            "user_display_name": display_name or "",
+            **{field: totals.get(user_id, empty)[field] for field in empty},
+        }
+        for rank, (user_id, display_name, email) in enumerate(members, start=1)
+    ]
@@ -0,0 +1,112 @@
+"""
+Race lifecycle
+Moves races through scheduled -> betting_open -> betting_closed -> in_progress -> completed
+as their deadlines pass. Every query filters on (status, betting_deadline) or (status, race_datetime),
+which are indexed, so a tick costs a handful of index lookups however many races there are.
+Races whose betting closes have their bets tallied for the crowd statistics.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .crowd import tally_races
+from .ingestion import ingest_results
+from .models import Race
+
+OPEN_STATUSES = ["scheduled", "betting_open"]
+
+
+def betting_window():
+    """How long before the deadline a scheduled race opens for betting"""
+    return timedelta(days=settings.BETTING_WINDOW_DAYS)
+
+
+def results_after():
+    """How long after the start a race is expected to have results"""
+    return timedelta(minutes=settings.RACE_RESULTS_AFTER_MINUTES)
+
+
+def advance_races(now=None):
+    """
+    Apply every time-based status transition that is due, one UPDATE per transition
+    Transitions run in lifecycle order, so a race that missed several deadlines catches up in one call.
+    Returns {new status: races moved}.
+    """
+    now = now or timezone.now()
+    races = Race.objects.all()
+    moved = {
+        "betting_open": races.filter(
+            status="scheduled", betting_deadline__gt=now, betting_deadline__lte=now + betting_window()
+        ).update(status="betting_open", updated_at=now)
+    }
+
+    closing = list(races.filter(status__in=OPEN_STATUSES, betting_deadline__lte=now).values_list("id", flat=True))
+    moved["betting_closed"] = races.filter(id__in=closing).update(status="betting_closed", updated_at=now) if closing else 0
+    tally_races(closing)
+
+    moved["in_progress"] = races.filter(status="betting_closed", race_datetime__lte=now).update(
+        status="in_progress", updated_at=now
+    )
+    return moved
+
+
+def finished_races(now=None):
+    """Races in progress long enough to have results, that can be ingested from OpenF1"""
+    now = now or timezone.now()
+    return list(
+        Race.objects.select_related("competition")
+        .filter(status="in_progress", race_datetime__lte=now - results_after(), api_race_id__isnull=False)
+        .exclude(api_race_id="")
+        .order_by("race_datetime")
+    )
+
+
+def next_due(now=None):
+    """When the next transition falls due, or None if nothing is scheduled"""
+    now = now or timezone.now()
+    candidates = [
+        # scheduled -> betting_open
+        Race.objects.filter(status="scheduled", betting_deadline__gt=now + betting_window())
+        .order_by("betting_deadline")
+        .values_list("betting_deadline", flat=True)
+        .first(),
+        # scheduled / betting_open -> betting_closed
+        Race.objects.filter(status__in=OPEN_STATUSES, betting_deadline__gt=now)
+        .order_by("betting_deadline")
+        .values_list("betting_deadline", flat=True)
+        .first(),
+        # betting_closed -> in_progress
+        Race.objects.filter(status="betting_closed", race_datetime__gt=now)
+        .order_by("race_datetime")
+        .values_list("race_datetime", flat=True)
+        .first(),
+        # in_progress -> results due
+        Race.objects.filter(status="in_progress", race_datetime__gt=now - results_after())
+        .order_by("race_datetime")
+        .values_list("race_datetime", flat=True)
+        .first(),
+    ]
+    opens, closes, starts, finishes = candidates
+    due = [
+        opens - betting_window() if opens else None,
+        closes,
+        starts,
+        finishes + results_after() if finishes else None,
+    ]
+    due = [moment for moment in due if moment is not None]
+    return min(due) if due else None
+
+
+def complete_races(races, score=True):
+    """
+    Ingest results for finished races and, with score=True, verify and score them
+    Scoring marks a race completed. Returns the IDs of the races that had results.
+    """
+    if not races:
+        return set()
+    ingested = ingest_results(races, score=score)
+    if not ingested["races"]:
+        return set()
+    return set(Race.objects.filter(id__in=[race.id for race in races], results__isnull=False).values_list("id", flat=True))
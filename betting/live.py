@@ -0,0 +1,203 @@
+"""
+Live leaderboard streaming
+Every subscriber to a competition shares one StandingsBroadcaster per event loop, which reads the
+standings once per change and fans the diff out to all connected clients as Server-Sent Events.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+from .leaderboard import astandings_version
+from .models import CompetitionStanding
+
+logger = logging.getLogger(__name__)
+
+STANDING_FIELDS = (
+    "user_id",
+    "user__email",
+    "user__profile__display_name",
+    "total_points",
+    "rank",
+    "races_predicted",
+    "exact_predictions",
+    "partial_predictions",
+)
+
+# Bounded per-client buffer; a client that falls this far behind is resynced with a snapshot
+SUBSCRIBER_QUEUE_SIZE = 32
+
+_registry_lock = threading.Lock()
+_broadcasters = {}  # {(event loop, competition_id): StandingsBroadcaster}
+
+
+def standing_row(values):
+    """Shape a standings values() row like CompetitionStandingSerializer does"""
+    return {
+        "user": values["user_id"],
+        "user_email": values["user__email"],
+        "user_display_name": values["user__profile__display_name"],
+        "total_points": values["total_points"],
+        "rank": values["rank"],
+        "races_predicted": values["races_predicted"],
+        "exact_predictions": values["exact_predictions"],
+        "partial_predictions": values["partial_predictions"],
+    }
+
+
+def diff_standings(previous, current):
+    """
+    Rows that changed between two {user_id: row} snapshots
+    Returns {"changed": [rows], "removed": [user ids]}, or None when nothing changed.
+    """
+    changed = [row for user_id, row in current.items() if previous.get(user_id) != row]
+    removed = [user_id for user_id in previous if user_id not in current]
+    if not changed and not removed:
+        return None
+    return {"changed": sorted(changed, key=lambda row: row["rank"]), "removed": removed}
+
+
+def format_event(event, data):
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def load_standings(competition_id):
+    """Current standings keyed by user ID"""
+    queryset = CompetitionStanding.objects.filter(competition_id=competition_id).order_by("rank").values(*STANDING_FIELDS)
+    return {values["user_id"]: standing_row(values) async for values in queryset}
+
+
+class StandingsBroadcaster:
+    """
+    Shared fan-out of one competition's standings
+    Polls the cheap change marker every `interval` seconds (or straight away when
+    notify_standings_changed wakes it), reloads the standings only when it moves,
+    and pushes the diff to every subscriber queue.
+    """
+
+    def __init__(self, competition_id, interval=None):
+        self.competition_id = competition_id
+        self.interval = interval if interval is not None else settings.LEADERBOARD_STREAM_INTERVAL
+        self.subscribers = set()
+        self.snapshot = None
+        self.version = None
+        self.ready = asyncio.Event()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.reads = 0
+
+    @classmethod
+    def for_competition(cls, competition_id):
+        """The broadcaster for a competition on the running event loop, created on first use"""
+        key = (asyncio.get_running_loop(), competition_id)
+        with _registry_lock:
+            broadcaster = _broadcasters.get(key)
+            if broadcaster is None:
+                broadcaster = _broadcasters[key] = cls(competition_id)
+        return broadcaster
+
+    async def subscribe(self):
+        """Register a subscriber; returns (queue, current snapshot rows)"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.ready.clear()
+            self.task = asyncio.create_task(self.run())
+        await self.ready.wait()
+        return queue, self.rows()
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            self.stop()
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self.snapshot = self.version = None
+        with _registry_lock:
+            for key, broadcaster in list(_broadcasters.items()):
+                if broadcaster is self:
+                    del _broadcasters[key]
+
+    def rows(self):
+        return sorted((self.snapshot or {}).values(), key=lambda row: row["rank"])
+
+    def notify(self):
+        """Wake the poller straight away; call from the broadcaster's own event loop"""
+        self.wakeup.set()
+
+    async def run(self):
+        while self.subscribers:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving the last snapshot; the next tick retries
+                logger.exception("Failed to refresh standings for competition %s", self.competition_id)
+            self.ready.set()
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh(self):
+        version = await astandings_version(self.competition_id)
+        if version == self.version:
+            return
+
+        current = await load_standings(self.competition_id)
+        self.reads += 1
+        previous, self.snapshot, self.version = self.snapshot, current, version
+        if previous is None:
+            return
+
+        diff = diff_standings(previous, current)
+        if diff is not None:
+            self.publish("diff", diff)
+
+    def publish(self, event, data):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and send the whole table instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", self.rows()))
+
+
+def notify_standings_changed(competition_id):
+    """Wake every broadcaster for a competition in this process, e.g. after scoring commits"""
+    with _registry_lock:
+        targets = [(loop, b) for (loop, cid), b in _broadcasters.items() if cid == competition_id]
+    for loop, broadcaster in targets:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(broadcaster.notify)
+
+
+async def stream_standings(competition_id, keepalive=None):
+    """
+    Async generator of SSE messages for one client
+    Starts with a full snapshot, then yields diffs as the shared broadcaster publishes them.
+    """
+    keepalive = keepalive if keepalive is not None else settings.LEADERBOARD_STREAM_KEEPALIVE
+    broadcaster = StandingsBroadcaster.for_competition(competition_id)
+    queue, rows = await broadcaster.subscribe()
+    try:
+        yield f"retry: {settings.LEADERBOARD_STREAM_RETRY_MS}\n"
+        yield format_event("snapshot", rows)
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event, data)
+    finally:
+        broadcaster.unsubscribe(queue)
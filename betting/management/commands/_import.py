@@ -0,0 +1,57 @@
+"""
+Shared base for the import_bets and import_results commands
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from betting.imports import import_file, rebuild_standings
+from betting.models import Competition
+
+
+class ImportCommand(BaseCommand):
+    """Shared options and reporting for import_bets and import_results"""
+
+    importer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV, NDJSON or JSON Lines file, optionally gzipped (.csv.gz, ...)")
+        parser.add_argument(
+            "--competition", type=int, help="Match races by round_number in this competition instead of by race_id"
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per transaction (default: 5000)")
+        parser.add_argument(
+            "--rejects", help="Where to write rejected rows (default: <name>.rejected.<ext> next to the input)"
+        )
+        parser.add_argument(
+            "--update-standings", action="store_true", help="Rebuild standings of the competitions imported into"
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if options["competition"] and not Competition.objects.filter(id=options["competition"]).exists():
+            raise CommandError(f"Competition with ID {options['competition']} not found")
+
+        importer = self.importer_class(competition=options["competition"])
+        try:
+            summary = import_file(
+                importer, options["path"], options["chunk_size"], options["rejects"], progress=self.report_progress
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+
+        rate = summary["read"] / summary["seconds"] * 60 if summary["seconds"] else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {summary['imported']} of {summary['read']} rows in {summary['seconds']:.1f}s ({rate:,.0f} rows/min)"
+            )
+        )
+        if summary["rejects"]:
+            self.stdout.write(self.style.WARNING(f"Rejected {summary['rejected']} rows, written to {summary['rejects']}"))
+
+        if options["update_standings"] and summary["imported"]:
+            rebuild_standings(importer.competitions)
+            self.stdout.write(self.style.SUCCESS(f"Updated standings for {len(importer.competitions)} competition(s)"))
+
+    def report_progress(self, summary):
+        if self.verbosity >= 2:
+            self.stdout.write(f"  {summary['read']} rows read, {summary['imported']} imported, {summary['rejected']} rejected")
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from betting.exports import EXPORTS, FORMATS, Export
+
+
+class Command(BaseCommand):
+    help = "Stream bets, race results or standings to a CSV or NDJSON file (gzipped if it ends in .gz)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(EXPORTS), help="What to export")
+        parser.add_argument("--competition", type=int, help="Only this competition")
+        parser.add_argument("--race", type=int, help="Only this race (bets and results)")
+        parser.add_argument("--format", choices=FORMATS, default="csv", dest="fmt", help="Output format (default: csv)")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+        parser.add_argument("--chunk-size", type=int, help="Rows per database fetch (default: EXPORT_CHUNK_SIZE)")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        try:
+            export = Export(
+                options["kind"],
+                options["fmt"],
+                competition=options["competition"],
+                race=options["race"],
+                compress=bool(output and output.endswith(".gz")),
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        started = time.monotonic()
+        if output:
+            with open(output, "wb") as file:
+                for chunk in export.chunks():
+                    file.write(chunk)
+        else:
+            for chunk in export.chunks():
+                self.stdout.write(chunk.decode(), ending="")
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported {export.rows} {export.kind} rows to {output or 'stdout'} in {elapsed:.1f}s")
+        )
@@ -0,0 +1,10 @@
+from betting.imports import BetImporter
+from betting.management.commands._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = (
+        "Bulk import bets from CSV/NDJSON. Columns: username, race_id (or competition_id and round_number), "
+        "driver_number, predicted_position, and optionally bet_type, points_earned, is_scored"
+    )
+    importer_class = BetImporter
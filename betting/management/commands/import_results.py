@@ -0,0 +1,10 @@
+from betting.imports import ResultImporter
+from betting.management.commands._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = (
+        "Bulk import race results from CSV/NDJSON. Columns: race_id (or competition_id and round_number), "
+        "driver_number, position, and optionally grid_position, fastest_lap, did_not_finish, dnf_reason, verified"
+    )
+    importer_class = ResultImporter
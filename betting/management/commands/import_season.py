@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from betting.ingestion import DEFAULT_MAX_IN_FLIGHT, import_season
+from betting.models import Competition
+
+
+class Command(BaseCommand):
+    help = "Import a full season (races, drivers and results) from the OpenF1 API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("year", type=int, help="Season year to import")
+        parser.add_argument("--competition", type=int, required=True, help="ID of the competition to attach races to")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_MAX_IN_FLIGHT,
+            help=f"Maximum number of API requests in flight (default: {DEFAULT_MAX_IN_FLIGHT})",
+        )
+        parser.add_argument("--skip-results", action="store_true", help="Only import races and drivers")
+
+    def handle(self, *args, **options):
+        try:
+            competition = Competition.objects.get(id=options["competition"])
+        except Competition.DoesNotExist:
+            self.stdout.write(self.style.ERROR(f"Competition with ID {options['competition']} not found"))
+            return
+
+        self.stdout.write(f"Importing {options['year']} season into {competition.name}...")
+        started = time.monotonic()
+
+        counts = import_season(
+            competition,
+            options["year"],
+            max_in_flight=max(1, options["concurrency"]),
+            include_results=not options["skip_results"],
+        )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts['races']} races, {counts['drivers']} drivers and "
+                f"{counts['results']} results in {elapsed:.1f}s"
+            )
+        )
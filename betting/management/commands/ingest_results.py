@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from betting.ingestion import DEFAULT_MAX_IN_FLIGHT, ingest_results
+from betting.models import Race
+
+
+class Command(BaseCommand):
+    help = "Fetch race classifications from the OpenF1 API and store them as race results"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "race_ids",
+            nargs="*",
+            type=int,
+            help="IDs of races to ingest (default: finished races that are not completed yet)",
+        )
+        parser.add_argument("--competition", type=int, help="Only ingest races from this competition")
+        parser.add_argument("--verify", action="store_true", help="Mark ingested results as verified")
+        parser.add_argument("--score", action="store_true", help="Verify results and score the races straight away")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_MAX_IN_FLIGHT,
+            help=f"Maximum number of API requests in flight (default: {DEFAULT_MAX_IN_FLIGHT})",
+        )
+
+    def handle(self, *args, **options):
+        races = Race.objects.select_related("competition").filter(api_race_id__isnull=False).exclude(api_race_id="")
+
+        if options["race_ids"]:
+            races = races.filter(id__in=options["race_ids"])
+        else:
+            races = races.filter(race_datetime__lt=timezone.now()).exclude(status__in=["completed", "cancelled"])
+
+        if options["competition"]:
+            races = races.filter(competition_id=options["competition"])
+
+        races = list(races)
+        if not races:
+            self.stdout.write(self.style.WARNING("No races with an API race ID to ingest"))
+            return
+
+        self.stdout.write(f"Ingesting results for {len(races)} race(s)...")
+        started = time.monotonic()
+
+        summary = ingest_results(
+            races,
+            verify=options["verify"],
+            score=options["score"],
+            max_in_flight=max(1, options["concurrency"]),
+        )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {summary['results']} results for {summary['races']} race(s) in {elapsed:.1f}s")
+        )
+        if options["score"]:
+            self.stdout.write(self.style.SUCCESS(f"Scored {summary['scored']} race(s)"))
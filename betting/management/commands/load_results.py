@@ -47,6 +47,9 @@ class Command(BaseCommand):
 
         self.stdout.write(f"\nLoading results for {len(races)} race(s)...\n")
 
+        # Resolve drivers from one lookup table instead of a query per position
+        drivers_by_number = {driver.driver_number: driver for driver in Driver.objects.all()}
+
         # Sample realistic results based on 2024 form
         sample_results = [
             # Bahrain GP - Verstappen dominance
@@ -105,13 +108,15 @@ class Command(BaseCommand):
                 result_data = [(d.last_name, d.driver_number) for d in random_drivers]
 
             # Create results
+            results = []
             for position, (last_name, driver_number) in enumerate(result_data, 1):
-                try:
-                    driver = Driver.objects.get(driver_number=driver_number)
-                    RaceResult.objects.create(race=race, driver=driver, position=position, verified=True)
-                    self.stdout.write(f"  P{position}: {driver.first_name} {driver.last_name} ({driver.team})")
-                except Driver.DoesNotExist:
+                driver = drivers_by_number.get(driver_number)
+                if driver is None:
                     self.stdout.write(self.style.WARNING(f"  Driver #{driver_number} not found, skipping"))
+                    continue
+                results.append(RaceResult(race=race, driver=driver, position=position, verified=True))
+                self.stdout.write(f"  P{position}: {driver.first_name} {driver.last_name} ({driver.team})")
+            RaceResult.objects.bulk_create(results)
 
             # Update race status
             race.status = "completed"
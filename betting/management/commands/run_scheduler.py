@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from betting.jobs import enqueue
+from betting.lifecycle import advance_races, complete_races, finished_races, next_due
+
+
+class Command(BaseCommand):
+    help = "Move races through their lifecycle as deadlines pass, then ingest and score finished races"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60.0,
+            help="Longest time to sleep between passes, in seconds (default: 60)",
+        )
+        parser.add_argument("--no-score", action="store_true", help="Ingest results without verifying and scoring them")
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue result ingestion as a background job for run_worker instead of running it here",
+        )
+
+    def handle(self, *args, **options):
+        self.retry_at = {}
+        self.score = not options["no_score"]
+        self.enqueue = options["enqueue"]
+
+        self.stdout.write("Race scheduler started")
+        try:
+            while True:
+                wake_at = self.tick()
+                if options["once"]:
+                    return
+
+                close_old_connections()
+                delay = options["max_sleep"]
+                if wake_at is not None:
+                    delay = min(delay, max(0.0, (wake_at - timezone.now()).total_seconds()))
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            self.stdout.write("Race scheduler stopped")
+
+    def tick(self):
+        """Run one pass; returns when the next pass is due"""
+        now = timezone.now()
+        try:
+            moved = advance_races(now)
+            for status, count in moved.items():
+                if count:
+                    self.stdout.write(f"{count} race(s) now {status.replace('_', ' ')}")
+
+            races = [race for race in finished_races(now) if self.retry_at.get(race.id, now) <= now]
+            if races:
+                self.complete(races, now)
+        except Exception as e:
+            # Keep the scheduler alive; the next pass retries
+            self.stdout.write(self.style.ERROR(f"Scheduler pass failed: {e}"))
+            return now + timedelta(seconds=30)
+
+        due = [moment for moment in [next_due(now), *self.retry_at.values()] if moment is not None]
+        return min(due) if due else None
+
+    def complete(self, races, now):
+        """Fetch results for finished races, inline or through the job queue"""
+        retry = now + timedelta(minutes=settings.RACE_RESULTS_RETRY_MINUTES)
+
+        if self.enqueue:
+            # The job scores races that have results; the rest are still in progress at the next retry
+            job = enqueue("ingest_results", race_ids=[race.id for race in races], score=self.score)
+            self.stdout.write(f"Queued {job} for {len(races)} race(s)")
+            self.retry_at.update({race.id: retry for race in races})
+            return
+
+        completed = complete_races(races, score=self.score)
+        for race in races:
+            if race.id not in completed:
+                self.stdout.write(self.style.WARNING(f"No results yet for {race.name}, retrying at {retry:%H:%M}"))
+            elif self.score:
+                self.stdout.write(self.style.SUCCESS(f"Stored and scored results for {race.name}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Stored provisional results for {race.name}"))
+            # Scored races are completed and drop out; the rest are fetched again later
+            if race.id in completed and self.score:
+                self.retry_at.pop(race.id, None)
+            else:
+                self.retry_at[race.id] = retry
@@ -0,0 +1,73 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from betting.jobs import claim_jobs, requeue_stale, run_job
+
+
+def run_in_thread(job):
+    """Run a job on a pool thread, releasing that thread's database connection afterwards"""
+    try:
+        return run_job(job)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (scoring, standings rebuilds, result ingestion)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Jobs to run at the same time (default: 2)")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait before checking an empty queue again (default: 2)",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f"Requeued {requeued} stale job(s)"))
+
+        self.stdout.write(f"Worker {worker_id} started with concurrency {concurrency}")
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job") as pool:
+            try:
+                while True:
+                    for job in claim_jobs(worker_id, limit=concurrency - len(running)):
+                        self.stdout.write(f"Running {job}")
+                        running.add(pool.submit(run_in_thread, job))
+
+                    if not running:
+                        if options["burst"]:
+                            break
+                        close_old_connections()
+                        time.sleep(options["poll_interval"])
+                        continue
+
+                    done, running = wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.report(future.result())
+            except KeyboardInterrupt:
+                self.stdout.write("Finishing running jobs...")
+                for future in running:
+                    self.report(future.result())
+
+        self.stdout.write("Worker stopped")
+
+    def report(self, job):
+        if job.status == "succeeded":
+            self.stdout.write(self.style.SUCCESS(f"Finished {job}: {job.result}"))
+        elif job.status == "queued":
+            self.stdout.write(self.style.WARNING(f"{job} failed, retrying after {job.run_after:%H:%M:%S}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"{job} failed after {job.attempts} attempt(s)"))
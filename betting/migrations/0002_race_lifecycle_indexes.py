@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['status', 'betting_deadline'], name='race_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='race',
+            index=models.Index(fields=['status', 'race_datetime'], name='race_status_datetime_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0003_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(condition=models.Q(('is_scored', False)), fields=['race'], name='bet_unscored_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0004_bet_unscored_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round_number', models.PositiveSmallIntegerField()),
+                ('rank', models.PositiveIntegerField()),
+                ('total_points', models.IntegerField()),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='betting.competition')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standing_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['competition', 'round_number', 'rank'],
+                'indexes': [models.Index(fields=['competition', 'round_number', 'rank'], name='snapshot_round_rank_idx')],
+                'unique_together': {('competition', 'user', 'round_number')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0005_standing_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrowdPick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('predicted_position', models.IntegerField()),
+                ('picks', models.PositiveIntegerField()),
+                ('bet_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crowd_picks', to='betting.bettype')),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crowd_picks', to='betting.driver')),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crowd_picks', to='betting.race')),
+            ],
+            options={
+                'ordering': ['race', 'bet_type', 'predicted_position', '-picks'],
+                'unique_together': {('race', 'bet_type', 'predicted_position', 'driver')},
+            },
+        ),
+    ]
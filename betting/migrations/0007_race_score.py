@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+
+def backfill_race_scores(apps, schema_editor):
+    """Per-user scores for races scored before this table existed"""
+    Bet = apps.get_model('betting', 'Bet')
+    RaceScore = apps.get_model('betting', 'RaceScore')
+    rows = (
+        Bet.objects.filter(is_scored=True)
+        .values('race_id', 'user_id', competition_id=F('race__competition_id'))
+        .annotate(
+            points=Sum('points_earned'),
+            exact_predictions=Count('id', filter=Q(points_earned=F('race__competition__points_for_exact_position'))),
+            partial_predictions=Count('id', filter=Q(points_earned=F('race__competition__points_for_correct_driver'))),
+        )
+        .order_by()
+    )
+    RaceScore.objects.bulk_create((RaceScore(**row) for row in rows.iterator()), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0006_crowd_pick'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaceScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('exact_predictions', models.PositiveSmallIntegerField(default=0)),
+                ('partial_predictions', models.PositiveSmallIntegerField(default=0)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='race_scores', to='betting.competition')),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='betting.race')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='race_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['race', '-points'],
+                'indexes': [models.Index(fields=['competition', 'user'], name='racescore_competition_user_idx')],
+                'unique_together': {('race', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_race_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:36
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0007_race_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('invite_code', models.CharField(max_length=12, unique=True)),
+                ('start_round', models.PositiveSmallIntegerField(default=1, help_text='First round counted in the league standings', validators=[django.core.validators.MinValueValidator(1)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leagues', to='betting.competition')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='created_leagues', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['competition', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeagueMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='betting.league')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='league_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['league', 'joined_at'],
+                'unique_together': {('league', 'user')},
+            },
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='members',
+            field=models.ManyToManyField(related_name='leagues', through='betting.LeagueMembership', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0008_league'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='competitionstanding',
+            index=models.Index(fields=['competition', 'rank'], name='standing_competition_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0009_standing_rank_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='race',
+            name='crowd_tallied_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('betting', '0010_race_crowd_tallied_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('score_race', 'Score Race'), ('update_standings', 'Update Standings'), ('ingest_results', 'Ingest Results'), ('update_projection', 'Update Projection')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='CompetitionProjection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('standings_version', models.CharField(help_text='Version of the standings it was simulated from', max_length=64)),
+                ('data', models.JSONField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('competition', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='projection', to='betting.competition')),
+            ],
+        ),
+    ]
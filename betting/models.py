@@ -14,9 +14,48 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields whose changes save_changes() writes back
+    TRACKED_FIELDS = ("display_name", "avatar", "total_points")
+
     def __str__(self):
         return f"{self.user.email} - {self.total_points} points"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        profile = super().from_db(db, field_names, values)
+        profile._saved_values = profile._tracked_values()
+        return profile
+
+    def save(self, *args, update_fields=None, **kwargs):
+        super().save(*args, update_fields=update_fields, **kwargs)
+        values = self._tracked_values()
+        if update_fields is not None:
+            values = {**getattr(self, "_saved_values", {}), **{k: v for k, v in values.items() if k in update_fields}}
+        self._saved_values = values
+
+    def _tracked_values(self):
+        # Read __dict__ directly so deferred fields are skipped instead of loaded
+        values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+        if "avatar" in values:
+            values["avatar"] = getattr(values["avatar"], "name", values["avatar"]) or ""
+        return values
+
+    def changed_fields(self):
+        """Tracked fields assigned a different value since the profile was loaded or saved"""
+        saved = getattr(self, "_saved_values", {})
+        return [name for name, value in self._tracked_values().items() if name not in saved or saved[name] != value]
+
+    def save_changes(self):
+        """Save the changed tracked fields, if any; returns whether a write happened"""
+        if self._state.adding:
+            self.save()
+            return True
+        changed = self.changed_fields()
+        if not changed:
+            return False
+        self.save(update_fields=[*changed, "updated_at"])
+        return True
+
     class Meta:
         ordering = ["-total_points"]
 
@@ -104,6 +143,9 @@ class Race(models.Model):
     # API integration fields
     api_race_id = models.CharField(max_length=50, blank=True, null=True)
 
+    # When the race's bets were last tallied into CrowdPick rows
+    crowd_tallied_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -117,6 +159,11 @@ class Race(models.Model):
     class Meta:
         ordering = ["competition", "round_number"]
         unique_together = ["competition", "round_number"]
+        indexes = [
+            # "Next due" lookups for the race lifecycle scheduler
+            models.Index(fields=["status", "betting_deadline"], name="race_status_deadline_idx"),
+            models.Index(fields=["status", "race_datetime"], name="race_status_datetime_idx"),
+        ]
 
 
 class BetType(models.Model):
@@ -172,6 +219,10 @@ class Bet(models.Model):
     class Meta:
         ordering = ["race", "user", "predicted_position"]
         unique_together = ["user", "race", "bet_type", "predicted_position"]
+        indexes = [
+            # Unscored bets are a small, shrinking slice of the table
+            models.Index(fields=["race"], condition=models.Q(is_scored=False), name="bet_unscored_idx"),
+        ]
 
 
 class RaceResult(models.Model):
@@ -224,3 +275,155 @@ class CompetitionStanding(models.Model):
     class Meta:
         ordering = ["competition", "-total_points", "user"]
         unique_together = ["competition", "user"]
+        indexes = [
+            # Top-N and rank-window lookups on large leaderboards
+            models.Index(fields=["competition", "rank"], name="standing_competition_rank_idx"),
+        ]
+
+
+class StandingSnapshot(models.Model):
+    """A user's rank and points in a competition after one round, for rank-progression charts"""
+
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="snapshots")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="standing_snapshots")
+    round_number = models.PositiveSmallIntegerField()
+    rank = models.PositiveIntegerField()
+    total_points = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.competition.name} R{self.round_number} - #{self.rank} {self.user.email} ({self.total_points} pts)"
+
+    class Meta:
+        ordering = ["competition", "round_number", "rank"]
+        # Also the index for one user's (or a few users') progression through a season
+        unique_together = ["competition", "user", "round_number"]
+        indexes = [models.Index(fields=["competition", "round_number", "rank"], name="snapshot_round_rank_idx")]
+
+
+class RaceScore(models.Model):
+    """A user's points and correct picks in one scored race, written when the race is scored"""
+
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="race_scores")
+    race = models.ForeignKey(Race, on_delete=models.CASCADE, related_name="scores")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="race_scores")
+    points = models.IntegerField(default=0)
+    exact_predictions = models.PositiveSmallIntegerField(default=0)
+    partial_predictions = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.race.name} - {self.user.email} ({self.points} pts)"
+
+    class Meta:
+        ordering = ["race", "-points"]
+        unique_together = ["race", "user"]
+        # A user's (or a group of users') season, race by race
+        indexes = [models.Index(fields=["competition", "user"], name="racescore_competition_user_idx")]
+
+
+class League(models.Model):
+    """Private pool within a competition, joined with an invite code and ranked on the shared race scores"""
+
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="leagues")
+    name = models.CharField(max_length=100)
+    invite_code = models.CharField(max_length=12, unique=True)
+    start_round = models.PositiveSmallIntegerField(
+        default=1, validators=[MinValueValidator(1)], help_text="First round counted in the league standings"
+    )
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="created_leagues")
+    members = models.ManyToManyField(User, through="LeagueMembership", related_name="leagues")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.competition.name} - {self.name}"
+
+    class Meta:
+        ordering = ["competition", "name"]
+
+
+class LeagueMembership(models.Model):
+    """A user's membership of a league"""
+
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="memberships")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="league_memberships")
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.league.name} - {self.user.email}"
+
+    class Meta:
+        ordering = ["league", "joined_at"]
+        unique_together = ["league", "user"]
+
+
+class CrowdPick(models.Model):
+    """How many users picked a driver for a position in a race, tallied when betting closes"""
+
+    race = models.ForeignKey(Race, on_delete=models.CASCADE, related_name="crowd_picks")
+    bet_type = models.ForeignKey(BetType, on_delete=models.CASCADE, related_name="crowd_picks")
+    predicted_position = models.IntegerField()
+    driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name="crowd_picks")
+    picks = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.race.name} - P{self.predicted_position}: {self.driver} ({self.picks})"
+
+    class Meta:
+        ordering = ["race", "bet_type", "predicted_position", "-picks"]
+        unique_together = ["race", "bet_type", "predicted_position", "driver"]
+
+
+class CompetitionProjection(models.Model):
+    """A competition's latest championship projection, simulated by the job worker after scoring"""
+
+    competition = models.OneToOneField(Competition, on_delete=models.CASCADE, related_name="projection")
+    standings_version = models.CharField(max_length=64, help_text="Version of the standings it was simulated from")
+    data = models.JSONField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.competition.name} projection ({self.computed_at:%Y-%m-%d %H:%M})"
+
+
+class Job(models.Model):
+    """Background job, claimed and run by `manage.py run_worker`"""
+
+    KIND_CHOICES = [
+        ("score_race", "Score Race"),
+        ("update_standings", "Update Standings"),
+        ("ingest_results", "Ingest Results"),
+        ("update_projection", "Update Projection"),
+    ]
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time")
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Claim query: oldest due queued jobs first
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
@@ -0,0 +1,185 @@
+"""
+Monte Carlo championship projection
+Each participant's points in a remaining race are drawn from their own per-race scores so far
+in the competition (from scored bets), or from everyone's if they have none yet. The remaining
+races are simulated PROJECTION_SIMULATIONS times on top of the current standings, giving each
+user's chance of winning and of finishing in the top three. With NumPy the draws are made for a
+batch of simulations and every user at once; without it a pure-Python loop makes the same
+estimates, much more slowly. Projections are simulated by the job worker once scoring commits and
+stored with the standings version they were simulated from; requests only read the stored one.
+"""
+
+import random
+
+from django.conf import settings
+from django.db.models import Sum
+
+from .leaderboard import standings_version
+from .models import Bet, Competition, CompetitionProjection, CompetitionStanding, Job, Race
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Draws held in memory at once (simulations x users) by the NumPy engine; batches this size keep
+# the int32 arrays cache-sized and run faster than fewer, larger ones
+BATCH_ELEMENTS = 250_000
+
+PODIUM = 3
+
+# Longest history a 16-bit draw can reach every entry of
+SHORT_HISTORY = 1 << 16
+
+
+def simulate(current, histories, remaining, simulations, seed=None):
+    """
+    Simulate the rest of a season
+    `current` holds the users' points in standings order, `histories` each one's per-race
+    scores to draw from (non-empty; users may share one list) and `remaining` the number of
+    races left. Ties go to the user ranked higher now. Returns per-user (wins, podiums, mean
+    final points) lists.
+    """
+    if np is None:
+        return simulate_python(current, histories, remaining, simulations, seed)
+
+    rng = np.random.default_rng(seed)
+    users = len(current)
+
+    # All histories end to end, each distinct list once, and where each user's starts
+    segments, scores = {}, []
+    for history in histories:
+        if id(history) not in segments:
+            segments[id(history)] = len(scores)
+            scores.extend(history)
+    scores = np.array(scores, dtype=np.int32)
+    # n random bits per draw: (bits * length) >> n indexes the user's history, uniform to within
+    # length/2**n, and is much cheaper than rng.integers with per-user bounds. 16 bits cover
+    # histories up to 65536 long with products that fit in uint32; past that 32 bits per draw,
+    # multiplied in uint64 so the product cannot wrap
+    if max(map(len, histories), default=0) <= SHORT_HISTORY:
+        width, bit_type, index_type = 16, np.uint16, np.uint32
+    else:
+        width, bit_type, index_type = 32, np.uint32, np.uint64
+    offsets = np.array([segments[id(history)] for history in histories], dtype=index_type)
+    lengths = np.array([len(history) for history in histories], dtype=index_type)
+
+    wins = np.zeros(users, dtype=np.int64)
+    podiums = np.zeros(users, dtype=np.int64)
+    points = np.zeros(users, dtype=np.float64)
+    batch = max(1, BATCH_ELEMENTS // max(users, 1))
+    for start in range(0, simulations, batch):
+        size = min(batch, simulations - start)
+        totals = np.tile(np.asarray(current, dtype=np.int32), (size, 1))
+        for _ in range(remaining):
+            bits = np.frombuffer(rng.bytes(width // 8 * size * users), dtype=bit_type).reshape(size, users)
+            picks = (bits * lengths) >> index_type(width)
+            picks += offsets
+            totals += scores[picks]
+
+        points += totals.sum(axis=0)
+        # argmax returns the first of equal totals, i.e. the user ranked higher now
+        rows = np.arange(size)
+        for place in range(min(PODIUM, users)):
+            leaders = totals.argmax(axis=1)
+            placed = np.bincount(leaders, minlength=users)
+            podiums += placed
+            if place == 0:
+                wins += placed
+            totals[rows, leaders] = np.iinfo(np.int32).min
+
+    return wins.tolist(), podiums.tolist(), (points / simulations).tolist()
+
+
+def simulate_python(current, histories, remaining, simulations, seed=None):
+    rng = random.Random(seed)
+    users = len(current)
+    wins, podiums, points = [0] * users, [0] * users, [0] * users
+
+    for _ in range(simulations):
+        totals = [total + sum(rng.choice(history) for _ in range(remaining)) for total, history in zip(current, histories)]
+        order = sorted(range(users), key=lambda index: (-totals[index], index))
+        wins[order[0]] += 1
+        for index in order[:PODIUM]:
+            podiums[index] += 1
+        for index, total in enumerate(totals):
+            points[index] += total
+
+    return wins, podiums, [total / simulations for total in points]
+
+
+def project(competition, simulations=None, seed=None):
+    """Win and podium probabilities for every participant, in standings order; three queries"""
+    simulations = simulations or settings.PROJECTION_SIMULATIONS
+    standings = list(
+        CompetitionStanding.objects.filter(competition=competition)
+        .order_by("rank")
+        .values_list("user_id", "user__profile__display_name", "rank", "total_points")
+    )
+    remaining = Race.objects.filter(competition=competition).exclude(status__in=["completed", "cancelled"]).count()
+
+    histories = {}
+    scored = (
+        Bet.objects.filter(race__competition=competition, is_scored=True)
+        .values("user_id", "race_id")
+        .annotate(points=Sum("points_earned"))
+        .order_by()
+    )
+    for row in scored:
+        histories.setdefault(row["user_id"], []).append(row["points"])
+    everyone = [points for history in histories.values() for points in history] or [0]
+
+    users = []
+    if standings:
+        wins, podiums, projected = simulate(
+            [total_points for user_id, name, rank, total_points in standings],
+            [histories.get(user_id, everyone) for user_id, name, rank, total_points in standings],
+            remaining,
+            simulations,
+            seed,
+        )
+        for index, (user_id, display_name, rank, total_points) in enumerate(standings):
+            users.append(
+                {
+                    "user": user_id,
+                    "user_display_name": display_name or "",
+                    "rank": rank,
+                    "total_points": total_points,
+                    "projected_points": round(projected[index], 1),
+                    "win_probability": round(wins[index] / simulations, 4),
+                    "podium_probability": round(podiums[index] / simulations, 4),
+                }
+            )
+
+    return {"simulations": simulations, "remaining_races": remaining, "users": users}
+
+
+def update_projection(competition_id):
+    """Simulate a competition's projection and store it with the standings version it starts from"""
+    version = standings_version(competition_id)
+    data = project(Competition.objects.get(id=competition_id))
+    CompetitionProjection.objects.update_or_create(
+        competition_id=competition_id, defaults={"standings_version": version, "data": data}
+    )
+    return {"users": len(data["users"])}
+
+
+def queue_projection(competition_id):
+    """Queue an update_projection job for run_worker, unless one is already waiting"""
+    waiting = Job.objects.filter(kind="update_projection", status="queued", payload__competition_id=competition_id)
+    if not waiting.exists():
+        Job.objects.create(kind="update_projection", payload={"competition_id": competition_id})
+
+
+def get_projection(competition):
+    """
+    The stored projection, flagged stale if standings have changed since; None if there is none yet
+    A missing or stale projection is queued for the worker, never simulated in the request.
+    """
+    stored = CompetitionProjection.objects.filter(competition=competition).first()
+    stale = stored is None or stored.standings_version != standings_version(competition.id)
+    if stale:
+        queue_projection(competition.id)
+    if stored is None:
+        return None
+    return {**stored.data, "computed_at": stored.computed_at, "stale": stale}
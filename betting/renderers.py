@@ -0,0 +1,91 @@
+"""
+orjson-backed JSON renderer and parser for the DRF API
+Drop-in replacements for DRF's JSONRenderer and JSONParser, selected in REST_FRAMEWORK settings,
+plus the CSV and NDJSON renderers the export endpoint negotiates with.
+Compact output is byte-for-byte what JSONRenderer produces: non-ASCII is written as UTF-8,
+U+2028/U+2029 are escaped, and types orjson does not handle natively (Decimal, lazy strings,
+timedeltas, querysets) go through DRF's own encoder. Datetimes are passed through to that
+encoder too, so 'Z' suffixes and precision match. Indented output (the browsable API,
+`Accept: application/json; indent=4`) and non-UTF-8 request bodies use the DRF classes, as does
+everything when orjson is not installed.
+"""
+
+import csv
+import io
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=OPTIONS)
+        for character, escaped in LINE_SEPARATORS:
+            if character in ret:
+                ret = ret.replace(character, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    text/csv, for the export endpoint
+    Exports stream their own body; this only renders error responses, as a header row of the
+    keys and a row of the values.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([list(data), [str(value) for value in data.values()]])
+        return buffer.getvalue().encode()
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Newline-delimited JSON, for the export endpoint (renders error responses as one line)"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return super().render(data, accepted_media_type, renderer_context) + b"\n"
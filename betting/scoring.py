@@ -0,0 +1,162 @@
+"""
+Race scoring and standings
+Set-based versions of the scoring rules, so a race is scored in a handful of queries
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .history import snapshot_standings
+from .live import notify_standings_changed
+from .models import Bet, CompetitionStanding, RaceResult, RaceScore, UserProfile
+from .projection import queue_projection
+
+
+def points_expression(race, results=None):
+    """
+    Build a CASE expression for a bet's points against a race's verified results
+    Exact position earns points_for_exact_position, a top 10 driver in the wrong
+    position earns points_for_correct_driver, anything else earns 0.
+    """
+    competition = race.competition
+    if results is None:
+        results = dict(RaceResult.objects.filter(race=race, verified=True).values_list("driver_id", "position"))
+
+    exact = [
+        When(driver_id=driver_id, predicted_position=position, then=Value(competition.points_for_exact_position))
+        for driver_id, position in results.items()
+    ]
+    top10 = [driver_id for driver_id, position in results.items() if position <= 10]
+
+    return Case(
+        *exact,
+        When(driver_id__in=top10, then=Value(competition.points_for_correct_driver)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def score_bets(race, rescore=False):
+    """
+    Score a race's bets with a single UPDATE
+    Returns (bets scored, points awarded). Already scored bets are skipped unless rescore=True.
+    """
+    bets = Bet.objects.filter(race=race)
+    if not rescore:
+        bets = bets.filter(is_scored=False)
+
+    points = points_expression(race)
+    summary = bets.aggregate(count=Count("id"), points=Sum(points))
+    bets.update(points_earned=points, is_scored=True, updated_at=timezone.now())
+
+    return summary["count"], summary["points"] or 0
+
+
+def record_race_scores(competition, race_ids=None):
+    """
+    Store each user's points and exact/partial picks per scored race, for the given races or the
+    whole competition, from one grouped query; returns the rows written
+    """
+    bets = Bet.objects.filter(race__competition=competition, is_scored=True)
+    scores = RaceScore.objects.filter(competition=competition)
+    if race_ids is not None:
+        bets = bets.filter(race_id__in=race_ids)
+        scores = scores.filter(race_id__in=race_ids)
+
+    rows = (
+        bets.values("race_id", "user_id")
+        .annotate(
+            points=Sum("points_earned"),
+            exact_predictions=Count("id", filter=Q(points_earned=competition.points_for_exact_position)),
+            partial_predictions=Count("id", filter=Q(points_earned=competition.points_for_correct_driver)),
+        )
+        .order_by()
+    )
+    race_scores = [RaceScore(competition=competition, **row) for row in rows]
+    scores.delete()
+    RaceScore.objects.bulk_create(race_scores, batch_size=5000)
+    return len(race_scores)
+
+
+def update_standings(competition):
+    """
+    Rebuild a competition's standings from its scored bets
+    Per-user totals come from one grouped query; ranks are written with one bulk upsert.
+    """
+    now = timezone.now()
+    stats = (
+        Bet.objects.filter(race__competition=competition)
+        .values("user_id")
+        .annotate(
+            total_points=Coalesce(Sum("points_earned", filter=Q(is_scored=True)), 0),
+            races_predicted=Count("race", distinct=True),
+            exact_predictions=Count("id", filter=Q(is_scored=True, points_earned=competition.points_for_exact_position)),
+            partial_predictions=Count("id", filter=Q(is_scored=True, points_earned=competition.points_for_correct_driver)),
+        )
+    )
+    rows = {row["user_id"]: row for row in stats}
+    bettors = list(rows)
+
+    # Participants without bets keep their existing totals but still get a rank
+    existing = CompetitionStanding.objects.filter(competition=competition).exclude(user_id__in=rows.keys())
+    for row in existing.values("user_id", "total_points", "races_predicted", "exact_predictions", "partial_predictions"):
+        rows[row["user_id"]] = row
+
+    emails = dict(User.objects.filter(id__in=rows.keys()).values_list("id", "email"))
+    ordered = sorted(rows.values(), key=lambda row: (-row["total_points"], emails.get(row["user_id"], "")))
+
+    standings = [
+        CompetitionStanding(
+            competition=competition,
+            user_id=row["user_id"],
+            total_points=row["total_points"],
+            races_predicted=row["races_predicted"],
+            exact_predictions=row["exact_predictions"],
+            partial_predictions=row["partial_predictions"],
+            rank=rank,
+            updated_at=now,
+        )
+        for rank, row in enumerate(ordered, start=1)
+    ]
+    CompetitionStanding.objects.bulk_create(
+        standings,
+        update_conflicts=True,
+        unique_fields=["competition", "user"],
+        update_fields=["total_points", "races_predicted", "exact_predictions", "partial_predictions", "rank", "updated_at"],
+    )
+
+    # Refresh profile totals (across all competitions) for the users who bet here
+    user_totals = (
+        Bet.objects.filter(user_id=OuterRef("user_id"), is_scored=True)
+        .values("user_id")
+        .annotate(total=Sum("points_earned"))
+        .values("total")
+    )
+    UserProfile.objects.filter(user_id__in=bettors).update(total_points=Coalesce(Subquery(user_totals), 0), updated_at=now)
+
+    # Push the new table to live leaderboard subscribers and have the worker re-simulate the
+    # championship projection once committed
+    transaction.on_commit(lambda: notify_standings_changed(competition.id))
+    transaction.on_commit(lambda: queue_projection(competition.id))
+
+    return len(standings)
+
+
+def score_race(race, rescore=False):
+    """
+    Score a race, record its per-user scores, rebuild its competition standings, mark it completed
+    and snapshot the standings as of its round, in one transaction
+    Returns a summary dict with the number of bets scored, points awarded and standings updated.
+    """
+    with transaction.atomic():
+        scored, points = score_bets(race, rescore=rescore)
+        record_race_scores(race.competition, [race.id])
+        standings = update_standings(race.competition)
+        race.status = "completed"
+        race.save(update_fields=["status", "updated_at"])
+        snapshot_standings(race.competition, from_round=race.round_number)
+
+    return {"bets": scored, "points": points, "standings": standings}
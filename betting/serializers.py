@@ -1,7 +1,31 @@
 from django.contrib.auth.models import User
+from django.db.models import BooleanField, CharField, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
 from rest_framework import serializers
 
-from .models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult, UserProfile
+from .models import Bet, BetType, Competition, CompetitionStanding, Driver, League, Race, RaceResult, UserProfile
+
+
+def requested_fields(request):
+    """Field names from a comma-separated ?fields= parameter on a read request, or None for all fields"""
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None
+    value = request.GET.get("fields")
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Return only the fields named in the request's ?fields= parameter; unknown names are ignored"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get("request"))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -50,13 +74,18 @@ class CompetitionSerializer(serializers.ModelSerializer):
         ]
 
     def get_participants_count(self, obj):
+        # Querysets can annotate the counts instead of loading every participant and race
+        if hasattr(obj, "participant_total"):
+            return obj.participant_total
         return obj.participants.count()
 
     def get_races_count(self, obj):
+        if hasattr(obj, "race_total"):
+            return obj.race_total
         return obj.races.count()
 
 
-class RaceSerializer(serializers.ModelSerializer):
+class RaceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     competition_name = serializers.CharField(source="competition.name", read_only=True)
     is_betting_open = serializers.BooleanField(read_only=True)
 
@@ -84,7 +113,7 @@ class BetTypeSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "code", "description", "is_active", "requires_positions", "max_selections"]
 
 
-class BetSerializer(serializers.ModelSerializer):
+class BetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_email = serializers.EmailField(source="user.email", read_only=True)
     race_name = serializers.CharField(source="race.name", read_only=True)
     driver_name = serializers.SerializerMethodField()
@@ -182,7 +211,37 @@ class RaceResultSerializer(serializers.ModelSerializer):
         return f"{obj.driver.first_name} {obj.driver.last_name}"
 
 
-class CompetitionStandingSerializer(serializers.ModelSerializer):
+class LeagueSerializer(serializers.ModelSerializer):
+    competition_name = serializers.CharField(source="competition.name", read_only=True)
+    members_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = League
+        fields = [
+            "id",
+            "competition",
+            "competition_name",
+            "name",
+            "invite_code",
+            "start_round",
+            "created_by",
+            "members_count",
+            "created_at",
+        ]
+        read_only_fields = ["invite_code", "created_by"]
+
+    def get_members_count(self, obj):
+        if hasattr(obj, "member_total"):
+            return obj.member_total
+        return obj.memberships.count()
+
+    def validate_competition(self, competition):
+        if competition.status not in ["published", "active"]:
+            raise serializers.ValidationError("Competition is not open for joining")
+        return competition
+
+
+class CompetitionStandingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_email = serializers.EmailField(source="user.email", read_only=True)
     user_display_name = serializers.CharField(source="user.profile.display_name", read_only=True)
     competition_name = serializers.CharField(source="competition.name", read_only=True)
@@ -236,3 +295,77 @@ class RaceDetailSerializer(serializers.ModelSerializer):
             bets = obj.bets.filter(user=request.user)
             return BetSerializer(bets, many=True).data
         return []
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for a ModelSerializer's list output
+    Rows come from a single .values() query and each value goes through the matching serializer
+    field's to_representation, so the output equals serializer_class(many=True).data without a
+    model instance or per-object field binding. Fields computed in Python (method fields, model
+    methods) need a database expression from get_expressions(). Honours ?fields=.
+    """
+
+    serializer_class = None
+
+    # Values of these field types are already what to_representation would return
+    PASSTHROUGH = (serializers.CharField, serializers.IntegerField, serializers.ChoiceField, serializers.RelatedField)
+
+    def __init__(self, queryset, request=None):
+        self.queryset = queryset
+        self.fields = self.serializer_class(context={"request": request}).fields
+        self.expressions = self.get_expressions()
+        self.converters = {
+            name: field.to_representation
+            for name, field in self.fields.items()
+            if name not in self.expressions and not isinstance(field, self.PASSTHROUGH)
+        }
+
+    def get_expressions(self):
+        return {}
+
+    def values(self):
+        columns, aliases = [], {}
+        for name, field in self.fields.items():
+            lookup = field.source.replace(".", "__")
+            if name in self.expressions:
+                aliases[name] = self.expressions[name]
+            elif lookup == name:
+                columns.append(name)
+            else:
+                aliases[name] = F(lookup)
+        return self.queryset.values(*columns, **aliases)
+
+    def to_representation(self, row):
+        converters = self.converters
+        return {
+            name: converters[name](row[name]) if name in converters and row[name] is not None else row[name]
+            for name in self.fields
+        }
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.values()]
+
+    async def adata(self):
+        return [self.to_representation(row) async for row in self.values()]
+
+
+class RaceValuesSerializer(ValuesSerializer):
+    serializer_class = RaceSerializer
+
+    def get_expressions(self):
+        # Race.is_betting_open() as SQL
+        is_open = Q(betting_deadline__gt=timezone.now(), status__in=["scheduled", "betting_open"])
+        return {"is_betting_open": ExpressionWrapper(is_open, output_field=BooleanField())}
+
+
+class BetValuesSerializer(ValuesSerializer):
+    serializer_class = BetSerializer
+
+    def get_expressions(self):
+        return {"driver_name": Concat("driver__first_name", Value(" "), "driver__last_name", output_field=CharField())}
+
+
+class CompetitionStandingValuesSerializer(ValuesSerializer):
+    serializer_class = CompetitionStandingSerializer
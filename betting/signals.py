@@ -13,7 +13,12 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save the UserProfile whenever the User is saved"""
-    if hasattr(instance, "profile"):
-        instance.profile.save()
+def save_user_profile(sender, instance, created, **kwargs):
+    """
+    Save edits made through user.profile when the User is saved
+    Only a profile already loaded on the instance is considered, and only its changed fields are
+    written, so saves that don't touch the profile (last_login on every login) cost no queries.
+    """
+    if created or not User.profile.is_cached(instance):
+        return
+    instance.profile.save_changes()
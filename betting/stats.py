@@ -0,0 +1,77 @@
+"""
+Admin dashboard statistics
+One conditional-aggregate query per table, cached for ADMIN_STATS_CACHE_TTL seconds under a key
+that includes the standings version, so every process recomputes them once a race is scored. The bets table is never scanned: its total is the planner's
+estimate on PostgreSQL once it is large, and unscored bets are counted from a partial index.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .leaderboard import standings_version
+from .models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult
+
+# Below this many rows an exact COUNT(*) is cheap enough
+ESTIMATE_ABOVE = 100_000
+
+
+def estimated_count(model, threshold=ESTIMATE_ABOVE):
+    """
+    Row count for a whole table
+    On PostgreSQL large tables use the planner's estimate from pg_class instead of COUNT(*).
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been analyzed
+        if row and row[0] >= threshold:
+            return row[0]
+    return model.objects.count()
+
+
+def collect_statistics():
+    """Dashboard counts, keyed the way templates/admin/index.html reads them"""
+    users = User.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        superusers=Count("id", filter=Q(is_superuser=True)),
+        # Semi-join on the bet user index rather than DISTINCT over every bet
+        with_bets=Count("id", filter=Q(Exists(Bet.objects.filter(user=OuterRef("pk"))))),
+    )
+    competitions = Competition.objects.aggregate(total=Count("id"), active=Count("id", filter=Q(status="active")))
+    races = Race.objects.aggregate(
+        total=Count("id"),
+        completed=Count("id", filter=Q(status="completed")),
+        upcoming=Count("id", filter=Q(status="scheduled", race_datetime__gte=timezone.now())),
+    )
+    drivers = Driver.objects.aggregate(total=Count("id"), active=Count("id", filter=Q(is_active=True)))
+    results = RaceResult.objects.aggregate(total=Count("id"), verified=Count("id", filter=Q(verified=True)))
+    bet_types = BetType.objects.aggregate(total=Count("id"), active=Count("id", filter=Q(is_active=True)))
+
+    total_bets = estimated_count(Bet)
+    unscored_bets = Bet.objects.filter(is_scored=False).count()
+
+    return {
+        "users": {**users, "groups": Group.objects.count()},
+        "competitions": competitions,
+        "races": {**races, "pending": races["total"] - races["completed"]},
+        "drivers": {**drivers, "inactive": drivers["total"] - drivers["active"]},
+        "bets": {"total": total_bets, "scored": max(total_bets - unscored_bets, 0), "unscored": unscored_bets},
+        "results": {**results, "unverified": results["total"] - results["verified"]},
+        "bet_types": bet_types,
+        "standings": {"total": CompetitionStanding.objects.count()},
+    }
+
+
+def cache_key(version):
+    return f"betting:admin-statistics:{version}"
+
+
+def get_statistics():
+    """Cached dashboard statistics, recomputed once any standings change"""
+    return cache.get_or_set(cache_key(standings_version()), collect_statistics, settings.ADMIN_STATS_CACHE_TTL)
@@ -0,0 +1,139 @@
+"""
+Benchmark the async read endpoints against the sync DRF ones
+
+Starts gunicorn twice on the local database: sync workers serving the WSGI app, and a single
+uvicorn worker serving the ASGI app. Then fires the same burst of slow clients at the DRF
+routes and the /api/async/ routes respectively: clients arrive over --ramp seconds and each
+trickles its request over --slow seconds, like phones on a congested network at the deadline.
+
+    python manage.py migrate && python manage.py seed_data
+    python -m betting.tests.bench_async_api --clients 200 --slow 0.5 --ramp 2
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from urllib.request import urlopen
+
+SERVERS = {
+    "sync": ["f1betting.wsgi:application", "--worker-class=sync"],
+    "async": ["f1betting.asgi:application", "--worker-class=uvicorn_worker.UvicornWorker"],
+}
+
+
+def routes(competition_id, race_id):
+    """(sync path, async path) pairs for the hot read endpoints"""
+    return [
+        (f"/api/competitions/{competition_id}/standings/", f"/api/async/competitions/{competition_id}/standings/"),
+        ("/api/races/?upcoming=true", "/api/async/races/upcoming/"),
+        ("/api/drivers/", "/api/async/drivers/"),
+        (f"/api/races/{race_id}/results/", f"/api/async/races/{race_id}/results/"),
+    ]
+
+
+def sample_ids():
+    """A competition and race from the local database to request"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+    import django
+
+    django.setup()
+    from betting.models import Race
+
+    race = Race.objects.order_by("race_datetime").first()
+    if race is None:
+        sys.exit("No races in the database; run `python manage.py seed_data` first")
+    return race.competition_id, race.id
+
+
+def start_server(kind, port, workers):
+    command = [sys.executable, "-m", "gunicorn", *SERVERS[kind], f"--bind=127.0.0.1:{port}", f"--workers={workers}"]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urlopen(f"http://127.0.0.1:{port}/health/", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    sys.exit(f"{kind} server did not start on port {port}")
+
+
+async def slow_request(port, path, slow, delay):
+    """One client arriving after `delay` and sending its request slowly; returns seconds until the full response arrived"""
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        lines = [
+            f"GET {path} HTTP/1.1\r\n",
+            "Host: 127.0.0.1\r\n",
+            "Accept: application/json\r\n",
+            "Connection: close\r\n\r\n",
+        ]
+        for line in lines:
+            writer.write(line.encode())
+            await writer.drain()
+            if line != lines[-1]:
+                await asyncio.sleep(slow / (len(lines) - 1))
+        response = await reader.read()
+    finally:
+        writer.close()
+    if not response.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(response.split(b"\r\n", 1)[0].decode(errors="replace"))
+    return time.perf_counter() - started
+
+
+async def burst(port, paths, clients, slow, ramp):
+    tasks = [slow_request(port, paths[index % len(paths)], slow, ramp * index / clients) for index in range(clients)]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    latencies = sorted(outcome for outcome in outcomes if isinstance(outcome, float))
+    errors = len(outcomes) - len(latencies)
+    return elapsed, latencies, errors
+
+
+def report(kind, elapsed, latencies, errors):
+    if not latencies:
+        print(f"  {kind:<6} all requests failed")
+        return
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"  {kind:<6} {elapsed:7.2f}s total  {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies):6.2f}s  p95 {p95:6.2f}s  errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async read endpoints under slow clients")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients per run")
+    parser.add_argument("--slow", type=float, default=0.5, help="Seconds each client takes to send its request")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which the clients arrive")
+    parser.add_argument("--sync-workers", type=int, default=4, help="Sync gunicorn workers (production default: 4)")
+    parser.add_argument("--port", type=int, default=8101)
+    args = parser.parse_args()
+
+    competition_id, race_id = sample_ids()
+    pairs = routes(competition_id, race_id)
+    print(f"{args.clients} clients arriving over {args.ramp}s, {args.slow}s to send each request")
+
+    for index, kind in enumerate(("sync", "async")):
+        port = args.port + index
+        workers = args.sync_workers if kind == "sync" else 1
+        paths = [pair[index] for pair in pairs]
+        process = start_server(kind, port, workers)
+        try:
+            report(f"{kind}", *asyncio.run(burst(port, paths, args.clients, args.slow, args.ramp)))
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
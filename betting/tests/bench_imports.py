@@ -0,0 +1,68 @@
+"""
+Benchmark the bulk bet importer
+
+Creates users, races and drivers inside a transaction that is rolled back afterwards, writes a
+CSV of bets for them (10 per user per race) and times importing it:
+    python manage.py migrate
+    python -m betting.tests.bench_imports --users 2000 --races 24
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import tempfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import_bets")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--gzip", action="store_true", help="Import a gzipped file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    from django.db import transaction
+
+    from betting.imports import BetImporter, import_file
+    from betting.models import Bet, CompetitionStanding, Driver, Race
+    from betting.tests.bench_serializers import Rollback, create_dataset
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bets.csv.gz" if args.gzip else "bets.csv")
+        try:
+            with transaction.atomic():
+                competition, user = create_dataset(args.users, args.races)
+                Bet.objects.all().delete()
+                usernames = CompetitionStanding.objects.filter(competition=competition).values_list(
+                    "user__username", flat=True
+                )
+                races = list(Race.objects.filter(competition=competition).values_list("id", flat=True))
+                numbers = list(Driver.objects.filter(team="Bench").values_list("driver_number", flat=True))
+
+                with gzip.open(path, "wt", newline="") if args.gzip else open(path, "w", newline="") as file:
+                    writer = csv.writer(file)
+                    writer.writerow(["username", "race_id", "driver_number", "predicted_position"])
+                    for username in usernames:
+                        for race in races:
+                            writer.writerows(
+                                [username, race, number, position] for position, number in enumerate(numbers, start=1)
+                            )
+
+                summary = import_file(BetImporter(), path, args.chunk_size)
+                rate = summary["read"] / summary["seconds"] * 60
+                print(f"Imported {summary['imported']} of {summary['read']} bets in {summary['seconds']:.1f}s")
+                print(f"  {rate:,.0f} rows/min, {args.chunk_size} rows per chunk")
+                raise Rollback
+        except Rollback:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark OpenF1 fetching against the local fake server
+
+Compares sequential vs concurrent season fetches and cold vs warm response cache:
+    python -m betting.tests.bench_ingestion --latency 0.1 --races 24 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<38} {elapsed:8.2f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark season ingestion against a fake OpenF1 server")
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--samples-per-driver", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds of simulated network latency per request")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="f1-bench-")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+    os.environ["F1_API_CACHE_DIR"] = cache_dir
+    os.environ["F1_API_BASE_URL"] = "http://placeholder/v1"
+
+    import django
+
+    django.setup()
+
+    from django.test import override_settings
+
+    from betting.f1_cache import F1ResponseCache
+    from betting.ingestion import fetch_season
+    from betting.tests.fake_openf1 import FakeOpenF1Data, FakeOpenF1Server
+
+    data = FakeOpenF1Data(year=2023, races=args.races, samples_per_driver=args.samples_per_driver)
+    server = FakeOpenF1Server(data=data, latency=args.latency, rate_limit_rate=args.rate_limit_rate)
+
+    def fetch(max_in_flight):
+        asyncio.run(fetch_season(2023, max_in_flight=max_in_flight))
+
+    try:
+        with server, override_settings(F1_API_BASE_URL=server.base_url, F1_API_CACHE_DIR=cache_dir):
+            print(f"Season of {args.races} races, {args.latency * 1000:.0f}ms latency per request")
+
+            sequential = timed("sequential fetch (cold cache)", lambda: fetch(1))
+            F1ResponseCache(cache_dir).clear()
+            requests_before = server.count()
+            concurrent = timed(f"concurrent fetch x{args.concurrency} (cold cache)", lambda: fetch(args.concurrency))
+            cold_requests = server.count() - requests_before
+
+            requests_before = server.count()
+            timed(f"concurrent fetch x{args.concurrency} (warm cache)", lambda: fetch(args.concurrency))
+            warm_requests = server.count() - requests_before
+
+            print(f"  speedup from concurrency: {sequential / concurrent:.1f}x")
+            print(f"  requests: cold={cold_requests} warm={warm_requests} (peak in flight {server.peak_in_flight})")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark the leaderboard slice endpoints at growing pool sizes
+
+Fills the local database with synthetic standings inside a transaction that is rolled back
+afterwards, then times top-N, around-me and percentile requests for a user mid-table:
+    python manage.py migrate
+    python -m betting.tests.bench_leaderboard --users 1000 10000 100000
+"""
+
+import argparse
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard slices")
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    from django.db import transaction
+    from rest_framework.test import APIClient
+
+    from betting.tests.bench_serializers import Rollback, create_dataset
+
+    client = APIClient()
+    for users in args.users:
+        try:
+            with transaction.atomic():
+                competition, first = create_dataset(users, 1)
+                middle = first.id + users // 2
+                print(f"{users} participants")
+                for path, params in [
+                    ("top", {"n": 10}),
+                    ("around-me", {"user": middle, "k": 5}),
+                    ("percentile", {"user": middle}),
+                ]:
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        client.get(f"/api/standings/{path}/", {"competition": competition.id, **params})
+                    elapsed = (time.perf_counter() - started) / args.repeat
+                    print(f"  {path:<12} {elapsed * 1000:7.2f}ms")
+                raise Rollback
+        except Rollback:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark the championship projection engine
+
+Times betting.projection.simulate on synthetic standings and score histories, with NumPy and,
+optionally, with the pure-Python fallback:
+    python -m betting.tests.bench_projection --users 5000 --races 12
+"""
+
+import argparse
+import os
+import random
+import time
+from unittest.mock import patch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the projection engine")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--races", type=int, default=12, help="Races left to simulate")
+    parser.add_argument("--scored", type=int, default=12, help="Races already scored (history length)")
+    parser.add_argument("--simulations", type=int, default=10000)
+    parser.add_argument("--python", action="store_true", help="Also time the pure-Python engine")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    from betting import projection
+
+    rng = random.Random(0)
+    histories = [[rng.randint(0, 60) for _ in range(args.scored)] for _ in range(args.users)]
+    current = sorted((sum(history) for history in histories), reverse=True)
+
+    engines = [("numpy", projection.np)] if projection.np is not None else []
+    if args.python or not engines:
+        engines.append(("python", None))
+    print(f"{args.users} users, {args.races} races left, {args.simulations} simulations")
+    for label, module in engines:
+        with patch.object(projection, "np", module):
+            started = time.perf_counter()
+            wins, podiums, points = projection.simulate(current, histories, args.races, args.simulations, seed=0)
+            elapsed = time.perf_counter() - started
+        print(f"  {label:<8} {elapsed:8.2f}s  leader wins {wins[0] / args.simulations:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark the orjson renderer against DRF's JSONRenderer on real endpoint payloads
+
+Builds a synthetic season inside a transaction that is rolled back afterwards, requests each
+endpoint once to get its response data, then times rendering that data both ways:
+    python manage.py migrate
+    python -m betting.tests.bench_renderers --users 5000 --races 24
+"""
+
+import argparse
+import os
+import time
+
+
+def timed(render, data, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(data)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON renderers on endpoint payloads")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    from django.db import transaction
+    from django.test.utils import setup_test_environment
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from betting.renderers import FastJSONRenderer
+    from betting.tests.bench_serializers import Rollback, create_dataset
+
+    setup_test_environment()
+    drf, fast = JSONRenderer(), FastJSONRenderer()
+
+    try:
+        with transaction.atomic():
+            competition, user = create_dataset(args.users, args.races)
+            client = APIClient()
+            client.force_authenticate(user)
+            endpoints = [
+                f"/api/competitions/{competition.id}/standings/",
+                "/api/bets/my_bets/",
+                f"/api/competitions/{competition.id}/races/",
+                "/api/competitions/",
+                "/api/drivers/",
+                "/api/bootstrap/",
+            ]
+
+            print(f"{'endpoint':<44} {'bytes':>9} {'DRF':>9} {'orjson':>9} {'speedup':>8}")
+            for url in endpoints:
+                data = client.get(url).data
+                assert fast.render(data) == drf.render(data), f"{url}: output differs"
+                slow_time = timed(drf.render, data, args.repeat)
+                fast_time = timed(fast.render, data, args.repeat)
+                print(
+                    f"{url:<44} {len(drf.render(data)):>9} {slow_time * 1000:>7.2f}ms {fast_time * 1000:>7.2f}ms"
+                    f" {slow_time / fast_time:>7.1f}x"
+                )
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
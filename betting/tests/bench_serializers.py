@@ -0,0 +1,130 @@
+"""
+Benchmark the values()-based serializers against the ModelSerializers they replace
+
+Fills the local database with synthetic standings and bets inside a transaction that is rolled
+back afterwards, then times serializing them both ways:
+    python manage.py migrate
+    python -m betting.tests.bench_serializers --users 5000 --races 24
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+
+def measure(label, func, repeat):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = func()
+    elapsed = (time.perf_counter() - started) / repeat
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<34} {elapsed * 1000:9.1f}ms  {peak / 1_000_000:7.1f}MB peak  ({len(rows)} rows)")
+    return elapsed
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_dataset(users, races):
+    """
+    A competition with `users` ranked participants, and `races` races with 10 bets each by the first user
+    Returns (competition, that user). Call inside a transaction that is rolled back.
+    """
+    from datetime import timedelta
+
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race
+
+    now = timezone.now()
+    participants = User.objects.bulk_create([User(username=f"bench{n}", email=f"bench{n}@example.com") for n in range(users)])
+    competition = Competition.objects.create(
+        name="Bench", year=2099, status="active", start_date=now.date(), end_date=now.date(), created_by=participants[0]
+    )
+    CompetitionStanding.objects.bulk_create(
+        CompetitionStanding(competition=competition, user=user, total_points=users - rank, rank=rank)
+        for rank, user in enumerate(participants, start=1)
+    )
+    drivers = Driver.objects.bulk_create(
+        Driver(first_name=f"Driver{n}", last_name="Bench", driver_number=900 + n, team="Bench") for n in range(10)
+    )
+    race_rows = Race.objects.bulk_create(
+        Race(
+            competition=competition,
+            name=f"Bench GP {n}",
+            country="Bench",
+            round_number=n,
+            race_datetime=now + timedelta(days=n),
+            betting_deadline=now + timedelta(days=n),
+        )
+        for n in range(1, races + 1)
+    )
+    bet_type, _ = BetType.objects.get_or_create(code="top10", defaults={"name": "Top 10"})
+    Bet.objects.bulk_create(
+        Bet(user=participants[0], race=race, bet_type=bet_type, driver=driver, predicted_position=position)
+        for race in race_rows
+        for position, driver in enumerate(drivers, start=1)
+    )
+    return competition, participants[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark values()-based serializers")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--races", type=int, default=24, help="Races the benchmark user has bet on (10 bets each)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    from django.db import transaction
+
+    from betting.models import Bet, CompetitionStanding
+    from betting.serializers import (
+        BetSerializer,
+        BetValuesSerializer,
+        CompetitionStandingSerializer,
+        CompetitionStandingValuesSerializer,
+    )
+
+    try:
+        with transaction.atomic():
+            competition, user = create_dataset(args.users, args.races)
+            standings = CompetitionStanding.objects.filter(competition=competition).order_by("rank")
+            bets = Bet.objects.filter(user=user).order_by("race", "predicted_position")
+
+            print(f"Standings of {args.users} users")
+            slow = measure(
+                "ModelSerializer",
+                lambda: CompetitionStandingSerializer(
+                    standings.select_related("competition", "user", "user__profile"), many=True
+                ).data,
+                args.repeat,
+            )
+            fast = measure("ValuesSerializer", lambda: CompetitionStandingValuesSerializer(standings).data, args.repeat)
+            print(f"  speedup: {slow / fast:.1f}x")
+
+            print(f"My bets: {args.races * 10} bets")
+            slow = measure(
+                "ModelSerializer",
+                lambda: BetSerializer(bets.select_related("race", "driver", "bet_type", "user"), many=True).data,
+                args.repeat,
+            )
+            fast = measure("ValuesSerializer", lambda: BetValuesSerializer(bets).data, args.repeat)
+            print(f"  speedup: {slow / fast:.1f}x")
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Local stand-in for the OpenF1 API
+Serves recorded or synthetic drivers, sessions, position, session_result, starting_grid
+and laps payloads at production sizes, with configurable latency, error rate and 429s.
+
+Run standalone and point F1_API_BASE_URL at it:
+    python -m betting.tests.fake_openf1 --port 8765 --latency 0.05
+    F1_API_BASE_URL=http://127.0.0.1:8765/v1 python manage.py import_season 2024 --competition 1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from betting.f1_api import get_sample_f1_drivers, get_sample_f1_schedule
+
+FIRST_SESSION_KEY = 9000
+
+
+class FakeOpenF1Data:
+    """Deterministic synthetic OpenF1 payloads for one season"""
+
+    def __init__(self, year=2024, races=24, samples_per_driver=200, laps=57, seed=0):
+        self.year = year
+        self.seed = seed
+        self.samples_per_driver = samples_per_driver
+        self.laps = laps
+        self.drivers = get_sample_f1_drivers()
+        schedule = get_sample_f1_schedule()
+        self.sessions = []
+        for index in range(races):
+            race = schedule[index % len(schedule)]
+            start = datetime(year, 3, 1, 15, tzinfo=timezone.utc) + timedelta(days=14 * index)
+            self.sessions.append(
+                {
+                    "session_key": FIRST_SESSION_KEY + index + 1,
+                    "meeting_key": 1200 + index + 1,
+                    "session_name": "Race",
+                    "session_type": "Race",
+                    "year": year,
+                    "country_name": race["country"],
+                    "location": race["location"],
+                    "circuit_short_name": race["location"],
+                    "date_start": start.isoformat(),
+                    "date_end": (start + timedelta(hours=2)).isoformat(),
+                }
+            )
+
+    def session(self, session_key):
+        for session in self.sessions:
+            if session["session_key"] == session_key:
+                return session
+        return None
+
+    def finishing_order(self, session_key):
+        """Driver numbers in finishing order for a session"""
+        numbers = [d["number"] for d in self.drivers]
+        random.Random(self.seed * 100003 + session_key).shuffle(numbers)
+        return numbers
+
+    def get_drivers(self, params):
+        session_key = params.get("session_key", "latest")
+        return [
+            {
+                "driver_number": d["number"],
+                "broadcast_name": f"{d['first_name'][0]} {d['last_name'].upper()}",
+                "full_name": f"{d['first_name']} {d['last_name']}",
+                "first_name": d["first_name"],
+                "last_name": d["last_name"],
+                "name_acronym": d["last_name"][:3].upper(),
+                "team_name": d["team"],
+                "country_code": d["nationality"][:3].upper(),
+                "headshot_url": None,
+                "session_key": session_key,
+            }
+            for d in self.drivers
+        ]
+
+    def get_sessions(self, params):
+        year = params.get("year")
+        if year is not None and int(year) != self.year:
+            return []
+        return self.sessions
+
+    def get_position(self, params):
+        session = self.session(int(params["session_key"]))
+        if session is None:
+            return []
+        order = self.finishing_order(session["session_key"])
+        rng = random.Random(session["session_key"])
+        start = datetime.fromisoformat(session["date_start"])
+        samples = []
+        running = order[:]
+        for step in range(self.samples_per_driver):
+            # Shuffle mid-race, then settle on the finishing order for the last sample
+            if step < self.samples_per_driver - 1:
+                rng.shuffle(running)
+            else:
+                running = order
+            date = (start + timedelta(seconds=20 * step)).isoformat()
+            for position, number in enumerate(running, start=1):
+                samples.append(
+                    {
+                        "date": date,
+                        "driver_number": number,
+                        "meeting_key": session["meeting_key"],
+                        "position": position,
+                        "session_key": session["session_key"],
+                    }
+                )
+        return samples
+
+    def get_session_result(self, params):
+        session = self.session(int(params["session_key"]))
+        if session is None:
+            return []
+        order = self.finishing_order(session["session_key"])
+        # Last finisher retires
+        return [
+            {
+                "position": None if position == len(order) else position,
+                "driver_number": number,
+                "number_of_laps": self.laps - 10 if position == len(order) else self.laps,
+                "dnf": position == len(order),
+                "dns": False,
+                "dsq": False,
+                "session_key": session["session_key"],
+                "meeting_key": session["meeting_key"],
+            }
+            for position, number in enumerate(order, start=1)
+        ]
+
+    def get_starting_grid(self, params):
+        session = self.session(int(params["session_key"]))
+        if session is None:
+            return []
+        grid = list(reversed(self.finishing_order(session["session_key"])))
+        return [
+            {"position": position, "driver_number": number, "session_key": session["session_key"]}
+            for position, number in enumerate(grid, start=1)
+        ]
+
+    def get_laps(self, params):
+        session = self.session(int(params["session_key"]))
+        if session is None:
+            return []
+        order = self.finishing_order(session["session_key"])
+        rng = random.Random(session["session_key"] + 1)
+        return [
+            {
+                "driver_number": number,
+                "lap_number": lap,
+                "lap_duration": None if lap == 1 else round(90 + rng.random() * 5, 3),
+                "session_key": session["session_key"],
+            }
+            for lap in range(1, self.laps + 1)
+            for number in order
+        ]
+
+
+class FakeOpenF1Server:
+    """
+    Threaded HTTP server speaking the OpenF1 /v1 API
+
+    latency: seconds added to every response
+    error_rate: probability of answering 500
+    rate_limit_rate: probability of answering 429 (with Retry-After: retry_after)
+    recorded: {endpoint: payload} or {(endpoint, session_key): payload} served instead of synthetic data
+    """
+
+    ENDPOINTS = ("drivers", "sessions", "position", "session_result", "starting_grid", "laps")
+
+    def __init__(
+        self,
+        data=None,
+        latency=0.0,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        retry_after=0,
+        recorded=None,
+        seed=0,
+        host="127.0.0.1",
+        port=0,
+    ):
+        self.data = data or FakeOpenF1Data(seed=seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.recorded = recorded or {}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bodies = {}
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.httpd = ThreadingHTTPServer((host, port), FakeOpenF1Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs):
+        """Serve recorded payloads from <endpoint>.json or <endpoint>_<session_key>.json files"""
+        recorded = {}
+        for path in Path(directory).glob("*.json"):
+            # Split at the last underscore: endpoint names such as session_result contain one
+            endpoint, _, session_key = path.stem.rpartition("_")
+            if endpoint not in cls.ENDPOINTS or not session_key.isdigit():
+                endpoint, session_key = path.stem, ""
+            key = (endpoint, int(session_key)) if session_key else endpoint
+            recorded[key] = json.loads(path.read_text(encoding="utf-8"))
+        return cls(recorded=recorded, **kwargs)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fake-openf1", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, endpoint=None):
+        """Number of requests received, optionally for one endpoint"""
+        with self.lock:
+            return sum(1 for path, _ in self.requests if endpoint is None or path == endpoint)
+
+    def body(self, endpoint, params):
+        """Encoded response body for a request, generated once and memoised"""
+        session_key = params.get("session_key")
+        key = (endpoint, tuple(sorted(params.items())))
+        with self.lock:
+            if key in self.bodies:
+                return self.bodies[key]
+
+        if session_key is not None and session_key.isdigit() and (endpoint, int(session_key)) in self.recorded:
+            payload = self.recorded[(endpoint, int(session_key))]
+        elif endpoint in self.recorded:
+            payload = self.recorded[endpoint]
+        else:
+            payload = getattr(self.data, f"get_{endpoint}")(params)
+
+        body = json.dumps(payload).encode("utf-8")
+        with self.lock:
+            self.bodies[key] = body
+        return body
+
+    def _roll(self):
+        """Decide whether this request fails: returns 429, 500 or None"""
+        with self.lock:
+            roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+class FakeOpenF1Handler(BaseHTTPRequestHandler):
+    """Request handler for FakeOpenF1Server; the owning server is self.server.fake"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        with fake.lock:
+            fake.requests.append((endpoint, params))
+            fake.in_flight += 1
+            fake.peak_in_flight = max(fake.peak_in_flight, fake.in_flight)
+        try:
+            if fake.latency:
+                time.sleep(fake.latency)
+            self._respond(fake, endpoint, params)
+        finally:
+            with fake.lock:
+                fake.in_flight -= 1
+
+    def _respond(self, fake, endpoint, params):
+        if endpoint not in fake.ENDPOINTS:
+            return self._send(404, b'{"detail": "Not Found"}')
+
+        failure = fake._roll()
+        if failure == 429:
+            return self._send(429, b'{"detail": "Too Many Requests"}', {"Retry-After": str(fake.retry_after)})
+        if failure == 500:
+            return self._send(500, b'{"detail": "Internal Server Error"}')
+
+        body = fake.body(endpoint, params)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()  # nosec - cache validator, not security
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", {"ETag": etag})
+        self._send(200, body, {"ETag": etag})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the OpenF1 API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--samples-per-driver", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 response")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of a 429 response")
+    parser.add_argument("--recorded", help="Directory of recorded <endpoint>[_<session_key>].json payloads")
+    args = parser.parse_args()
+
+    # The synthetic schedule is built with Django's timezone helpers, which read settings
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "f1betting.settings")
+
+    import django
+
+    django.setup()
+
+    options = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "host": args.host,
+        "port": args.port,
+    }
+    if args.recorded:
+        server = FakeOpenF1Server.from_directory(args.recorded, **options)
+    else:
+        data = FakeOpenF1Data(year=args.year, races=args.races, samples_per_driver=args.samples_per_driver)
+        server = FakeOpenF1Server(data=data, **options)
+
+    print(f"Fake OpenF1 API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Tests for the admin changelists, forms and actions
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from betting.admin import EstimatedCountPaginator
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Job, Race, RaceResult
+
+
+class AdminChangelistTest(TestCase):
+    """Changelists should cost the same number of queries however many rows they show"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="admin123")
+        self.client.force_login(self.admin)
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.bet_type = BetType.objects.create(name="Top 10", code="top10")
+        self.drivers = [
+            Driver.objects.create(first_name=f"Driver{n}", last_name=f"Number{n}", driver_number=n, team="Team")
+            for n in range(1, 11)
+        ]
+        self.races = [
+            Race.objects.create(
+                competition=self.competition,
+                name=f"Race {n}",
+                location="Circuit",
+                country="Country",
+                round_number=n,
+                race_datetime=timezone.now() + timedelta(days=n),
+                betting_deadline=timezone.now() + timedelta(days=n, hours=-2),
+            )
+            for n in range(1, 4)
+        ]
+
+    def add_rows(self, users):
+        start = User.objects.filter(is_superuser=False).count()
+        for index in range(start, start + users):
+            user = User.objects.create_user(username=f"fan{index}", email=f"fan{index}@example.com", password="pass12345")
+            CompetitionStanding.objects.create(competition=self.competition, user=user, rank=index + 1)
+            for race in self.races:
+                for position, driver in enumerate(self.drivers[:3], start=1):
+                    Bet.objects.create(
+                        user=user, race=race, bet_type=self.bet_type, driver=driver, predicted_position=position
+                    )
+        for race in self.races:
+            for position, driver in enumerate(self.drivers, start=1):
+                RaceResult.objects.get_or_create(race=race, driver=driver, defaults={"position": position})
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        self.add_rows(1)
+        few = self.count_queries(url)
+        self.add_rows(3)
+        self.assertEqual(self.count_queries(url), few)
+
+    def test_bet_changelist(self):
+        """Should join users, races and drivers into the bet changelist query"""
+        self.assert_constant_queries("/admin/betting/bet/")
+
+    def test_race_result_changelist(self):
+        """Should join races and drivers into the result changelist query"""
+        self.assert_constant_queries("/admin/betting/raceresult/")
+
+    def test_standing_changelist(self):
+        """Should join users and competitions into the standings changelist query"""
+        self.assert_constant_queries("/admin/betting/competitionstanding/")
+
+    def test_competition_form_uses_autocomplete(self):
+        """Should not render every user into the competition form"""
+        self.add_rows(3)
+        response = self.client.get(f"/admin/betting/competition/{self.competition.id}/change/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "admin-autocomplete")
+        self.assertNotContains(response, "fan2@example.com")
+
+    def test_autocomplete_endpoint(self):
+        """Should search users for the bet form"""
+        self.add_rows(3)
+        response = self.client.get(
+            "/admin/autocomplete/",
+            {"app_label": "betting", "model_name": "bet", "field_name": "user", "term": "fan1"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["text"] for row in response.json()["results"]], ["fan1"])
+
+    def test_estimated_count_paginator(self):
+        """Should count filtered changelists exactly"""
+        self.add_rows(2)
+        self.assertEqual(EstimatedCountPaginator(Bet.objects.all(), 100).count, 18)
+        self.assertEqual(EstimatedCountPaginator(Bet.objects.filter(race=self.races[0]), 100).count, 6)
+
+
+class AdminActionsTest(TestCase):
+    """Tests for the verify and scoring actions on races and results"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="admin123")
+        self.client.force_login(self.admin)
+        competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.races = [
+            Race.objects.create(
+                competition=competition,
+                name=f"Race {n}",
+                location="Circuit",
+                country="Country",
+                round_number=n,
+                race_datetime=timezone.now() - timedelta(days=n),
+                betting_deadline=timezone.now() - timedelta(days=n, hours=2),
+                status="in_progress",
+            )
+            for n in range(1, 4)
+        ]
+        driver = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        for race in self.races[:2]:
+            RaceResult.objects.create(race=race, driver=driver, position=1)
+
+    def run_action(self, model, action, objects):
+        return self.client.post(
+            f"/admin/betting/{model}/",
+            {"action": action, "_selected_action": [obj.pk for obj in objects]},
+            follow=True,
+        )
+
+    def test_verify_results(self):
+        """Should verify every result of the selected races"""
+        response = self.run_action("race", "verify_results", self.races)
+
+        self.assertContains(response, "Verified 2 result(s).")
+        self.assertEqual(RaceResult.objects.filter(verified=False).count(), 0)
+
+    def test_score_races_queues_jobs(self):
+        """Should queue a scoring job per race with verified results and skip the rest"""
+        RaceResult.objects.update(verified=True)
+        response = self.run_action("race", "score_races", self.races)
+
+        self.assertContains(response, "Queued 2 scoring job(s).")
+        self.assertContains(response, "Skipped 1 race(s) without verified results.")
+        self.assertEqual(
+            sorted(Job.objects.values_list("payload", flat=True), key=lambda payload: payload["race_id"]),
+            [{"race_id": race.id, "rescore": False} for race in self.races[:2]],
+        )
+        # Nothing is scored on the request itself
+        self.assertFalse(Race.objects.filter(status="completed").exists())
+
+    def test_warns_without_worker(self):
+        """Should warn when earlier jobs are still waiting for a worker"""
+        RaceResult.objects.update(verified=True)
+        response = self.run_action("race", "score_races", self.races)
+        self.assertNotContains(response, "without a worker claiming them")
+
+        Job.objects.update(run_after=timezone.now() - timedelta(minutes=5))
+        response = self.run_action("race", "score_races", self.races)
+        self.assertContains(response, "2 job(s) have been waiting over a minute without a worker claiming them.")
+
+    def test_rescore_from_results(self):
+        """Should queue one re-scoring job per race of the selected results"""
+        RaceResult.objects.update(verified=True)
+        response = self.run_action("raceresult", "rescore_races", RaceResult.objects.all())
+
+        self.assertContains(response, "Queued 2 scoring job(s).")
+        self.assertTrue(all(job.payload["rescore"] for job in Job.objects.all()))
+
+    def test_verify_selected_results(self):
+        """Should verify only the selected results"""
+        result = RaceResult.objects.first()
+        response = self.run_action("raceresult", "verify_selected", [result])
+
+        self.assertContains(response, "Verified 1 result(s).")
+        self.assertEqual(list(RaceResult.objects.filter(verified=True)), [result])
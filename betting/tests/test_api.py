@@ -138,6 +138,33 @@ class DriverAPITest(TestCase):
         self.assertEqual(response.data["first_name"], "Lewis")
 
 
+class ConditionalGetTest(TestCase):
+    """Test ETag revalidation of API responses"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.driver = Driver.objects.create(driver_number=44, first_name="Lewis", last_name="Hamilton", team="Mercedes")
+
+    def test_unchanged_response_not_modified(self):
+        """Test an unchanged response is answered with an empty 304"""
+        response = self.client.get("/api/async/drivers/")
+        etag = response["ETag"]
+
+        response = self.client.get("/api/async/drivers/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_changed_response_sent_again(self):
+        """Test a changed response is sent in full with a new ETag"""
+        etag = self.client.get("/api/async/drivers/")["ETag"]
+        self.driver.team = "Ferrari"
+        self.driver.save()
+
+        response = self.client.get("/api/async/drivers/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
 class RaceAPITest(TestCase):
     """Test Race API endpoints"""
 
@@ -344,6 +371,28 @@ class BetAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Bet.objects.filter(user=self.user).count(), 10)
 
+    def test_filter_my_bets_upcoming(self):
+        """Test filtering user's bets to races that have not started"""
+        self.client.force_authenticate(user=self.user)
+        past_race = Race.objects.create(
+            competition=self.competition,
+            name="Australian GP",
+            round_number=0,
+            race_datetime=timezone.now() - timedelta(days=7),
+            betting_deadline=timezone.now() - timedelta(days=7),
+            status="completed",
+        )
+        for race in (past_race, self.race):
+            Bet.objects.create(user=self.user, race=race, bet_type=self.bet_type, driver=self.driver, predicted_position=1)
+
+        response = self.client.get("/api/bets/my_bets/?upcoming=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([bet["race"] for bet in response.data], [self.race.id])
+
+        for value in ("false", "0", "False"):
+            response = self.client.get(f"/api/bets/my_bets/?upcoming={value}")
+            self.assertEqual(len(response.data), 2, value)
+
 
 class RaceResultAPITest(TestCase):
     """Test RaceResult API endpoints"""
@@ -0,0 +1,109 @@
+"""
+Tests for the async read endpoints
+"""
+
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.models import Competition, CompetitionStanding, Driver, Race, RaceResult
+
+
+def results(data):
+    """Unwrap a paginated DRF response"""
+    return data["results"] if isinstance(data, dict) and "results" in data else data
+
+
+class AsyncReadEndpointsTest(TestCase):
+    """Async endpoints should return exactly what the DRF endpoints return"""
+
+    def setUp(self):
+        self.api = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.max = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        self.lando = Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren")
+        Driver.objects.create(first_name="Old", last_name="Driver", driver_number=99, team="None", is_active=False)
+
+        now = timezone.now()
+        self.past_race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            location="Sakhir",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=now - timedelta(days=7),
+            betting_deadline=now - timedelta(days=7, hours=2),
+            status="completed",
+        )
+        self.next_race = Race.objects.create(
+            competition=self.competition,
+            name="Saudi GP",
+            location="Jeddah",
+            country="Saudi Arabia",
+            round_number=2,
+            race_datetime=now + timedelta(days=7),
+            betting_deadline=now + timedelta(days=7) - timedelta(hours=2),
+        )
+        RaceResult.objects.create(race=self.past_race, driver=self.lando, position=2, verified=True)
+        RaceResult.objects.create(race=self.past_race, driver=self.max, position=1, verified=True)
+        CompetitionStanding.objects.create(competition=self.competition, user=self.admin, total_points=15, rank=1)
+
+    async def get(self, url):
+        response = await AsyncClient().get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def sync_get(self, url):
+        response = await sync_to_async(self.api.get)(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def test_drivers(self):
+        """Should list active drivers like /api/drivers/"""
+        expected = results(await self.sync_get("/api/drivers/"))
+        data = await self.get("/api/async/drivers/")
+        self.assertEqual(data, expected)
+        self.assertEqual([d["driver_number"] for d in data], [1, 4])
+
+    async def test_upcoming_races(self):
+        """Should list upcoming races like /api/races/?upcoming=true"""
+        expected = results(await self.sync_get(f"/api/races/?upcoming=true&competition={self.competition.id}"))
+        data = await self.get(f"/api/async/races/upcoming/?competition={self.competition.id}")
+        self.assertEqual(data, expected)
+        self.assertEqual([race["name"] for race in data], ["Saudi GP"])
+
+    async def test_race_results(self):
+        """Should list verified results in finishing order like /api/races/{id}/results/"""
+        expected = await self.sync_get(f"/api/races/{self.past_race.id}/results/")
+        data = await self.get(f"/api/async/races/{self.past_race.id}/results/")
+        self.assertEqual(data, expected)
+        self.assertEqual([r["driver_name"] for r in data], ["Max Verstappen", "Lando Norris"])
+
+    async def test_standings(self):
+        """Should return the leaderboard like /api/competitions/{id}/standings/"""
+        expected = await self.sync_get(f"/api/competitions/{self.competition.id}/standings/")
+        data = await self.get(f"/api/async/competitions/{self.competition.id}/standings/")
+        self.assertEqual(data, expected)
+
+    async def test_missing_objects(self):
+        """Should return 404 for unknown races and competitions"""
+        client = AsyncClient()
+        self.assertEqual((await client.get("/api/async/races/999999/results/")).status_code, 404)
+        self.assertEqual((await client.get("/api/async/competitions/999999/standings/")).status_code, 404)
+
+    async def test_read_only(self):
+        """Should reject writes"""
+        response = await AsyncClient().post("/api/async/drivers/")
+        self.assertEqual(response.status_code, 405)
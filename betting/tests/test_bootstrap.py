@@ -0,0 +1,101 @@
+"""
+Tests for the SPA bootstrap endpoint
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.models import Bet, BetType, Competition, Driver, Race
+
+
+class BootstrapEndpointTest(TestCase):
+    """Tests for /api/bootstrap/"""
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.user = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.competition.participants.add(self.user, self.admin)
+        Competition.objects.create(
+            name="Draft",
+            year=2026,
+            status="draft",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        now = timezone.now()
+        self.past_race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            location="Sakhir",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=now - timedelta(days=7),
+            betting_deadline=now - timedelta(days=7, hours=2),
+        )
+        self.next_race = Race.objects.create(
+            competition=self.competition,
+            name="Saudi GP",
+            location="Jeddah",
+            country="Saudi Arabia",
+            round_number=2,
+            race_datetime=now + timedelta(days=7),
+            betting_deadline=now + timedelta(days=7, hours=-2),
+        )
+        self.driver = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        self.bet_type = BetType.objects.create(name="Top 10", code="top10")
+        for race in (self.past_race, self.next_race):
+            Bet.objects.create(user=self.user, race=race, bet_type=self.bet_type, driver=self.driver, predicted_position=1)
+
+    def test_anonymous(self):
+        """Should return the shared data without a profile or bets"""
+        response = self.api.get("/api/bootstrap/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIsNone(data["profile"])
+        self.assertEqual(data["bets"], [])
+        self.assertEqual([c["name"] for c in data["competitions"]], ["F1 2025"])
+        self.assertEqual(data["competitions"][0]["participants_count"], 2)
+        self.assertEqual(data["competitions"][0]["races_count"], 2)
+        self.assertEqual([r["id"] for r in data["upcoming_races"]], [self.next_race.id])
+        self.assertEqual([d["id"] for d in data["drivers"]], [self.driver.id])
+        self.assertEqual([t["code"] for t in data["bet_types"]], ["top10"])
+
+    def test_authenticated(self):
+        """Should include the user's profile and bets on upcoming races"""
+        self.api.force_authenticate(self.user)
+        data = self.api.get("/api/bootstrap/").json()
+
+        self.assertEqual(data["profile"]["email"], "fan@example.com")
+        self.assertEqual([bet["race"] for bet in data["bets"]], [self.next_race.id])
+
+    def test_matches_list_endpoints(self):
+        """Should serialize competitions and races the way their list endpoints do"""
+        data = self.api.get("/api/bootstrap/").json()
+
+        self.assertEqual(data["competitions"], self.api.get("/api/competitions/").json()["results"])
+        self.assertEqual(data["upcoming_races"], self.api.get("/api/async/races/upcoming/").json())
+
+    def test_query_count(self):
+        """Should use a fixed number of queries, and only the per-user ones once cached"""
+        self.api.force_authenticate(self.user)
+        with self.assertNumQueries(6):
+            self.api.get("/api/bootstrap/")
+        with self.assertNumQueries(2):
+            self.api.get("/api/bootstrap/")
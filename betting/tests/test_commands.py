@@ -389,3 +389,89 @@ class RunCommandTest(TestCase):
         # Check default port is used
         args = mock_execvp.call_args[0][1]
         self.assertIn("8000", args)
+
+
+class ImportSeasonCommandTest(TestCase):
+    """Test import_season management command"""
+
+    def setUp(self):
+        admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2023",
+            year=2023,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=admin,
+        )
+
+    @patch("betting.management.commands.import_season.import_season")
+    def test_import_season_reports_counts(self, mock_import):
+        """Test import_season runs the pipeline and reports counts"""
+        mock_import.return_value = {"drivers": 20, "races": 22, "results": 440}
+
+        out = StringIO()
+        call_command("import_season", "2023", f"--competition={self.competition.id}", "--concurrency=4", stdout=out)
+
+        mock_import.assert_called_once_with(self.competition, 2023, max_in_flight=4, include_results=True)
+        self.assertIn("Imported 22 races, 20 drivers and 440 results", out.getvalue())
+
+    def test_import_season_unknown_competition(self):
+        """Test import_season with a missing competition"""
+        out = StringIO()
+        call_command("import_season", "2023", "--competition=999", stdout=out)
+
+        self.assertIn("not found", out.getvalue())
+
+
+class IngestResultsCommandTest(TestCase):
+    """Test ingest_results management command"""
+
+    def setUp(self):
+        admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=admin,
+        )
+        self.finished = Race.objects.create(
+            competition=self.competition,
+            name="Finished GP",
+            round_number=1,
+            race_datetime=timezone.now() - timedelta(days=1),
+            betting_deadline=timezone.now() - timedelta(days=1),
+            status="in_progress",
+            api_race_id="9158",
+        )
+        Race.objects.create(
+            competition=self.competition,
+            name="Future GP",
+            round_number=2,
+            race_datetime=timezone.now() + timedelta(days=7),
+            betting_deadline=timezone.now() + timedelta(days=7),
+            api_race_id="9159",
+        )
+
+    @patch("betting.management.commands.ingest_results.ingest_results")
+    def test_ingest_results_defaults_to_finished_races(self, mock_ingest):
+        """Test ingest_results picks finished, uncompleted races by default"""
+        mock_ingest.return_value = {"races": 1, "results": 20, "scored": 1}
+
+        out = StringIO()
+        call_command("ingest_results", "--score", stdout=out)
+
+        races = mock_ingest.call_args[0][0]
+        self.assertEqual(races, [self.finished])
+        self.assertTrue(mock_ingest.call_args[1]["score"])
+        self.assertIn("Stored 20 results for 1 race(s)", out.getvalue())
+        self.assertIn("Scored 1 race(s)", out.getvalue())
+
+    def test_ingest_results_nothing_to_do(self):
+        """Test ingest_results with no matching races"""
+        out = StringIO()
+        call_command("ingest_results", "999", stdout=out)
+
+        self.assertIn("No races with an API race ID to ingest", out.getvalue())
@@ -0,0 +1,183 @@
+"""
+Tests for crowd pick tallies and the race crowd endpoint
+"""
+
+import csv
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.crowd import tally_races
+from betting.imports import BetImporter, import_file
+from betting.lifecycle import advance_races
+from betting.models import Bet, BetType, Competition, CrowdPick, Driver, Race
+
+
+class CrowdTestCase(TestCase):
+    """Shared fixtures: three users' top three picks for a race whose betting has closed"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=name, email=f"{name}@example.com", password="pass12345")
+            for name in ("alice", "bob", "carol")
+        ]
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, status="active", start_date=today, end_date=today, created_by=self.users[0]
+        )
+        now = timezone.now()
+        self.race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=now + timedelta(hours=1),
+            betting_deadline=now - timedelta(hours=1),
+            status="betting_closed",
+        )
+        self.drivers = [
+            Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull"),
+            Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren"),
+            Driver.objects.create(first_name="Charles", last_name="Leclerc", driver_number=16, team="Ferrari"),
+        ]
+        self.bet_type = BetType.objects.create(name="Top 10", code="top10")
+        max_, lando, charles = self.drivers
+        picks = {
+            self.users[0]: [max_, lando, charles],
+            self.users[1]: [max_, charles, lando],
+            self.users[2]: [charles, lando, max_],
+        }
+        for user, drivers in picks.items():
+            self.bet(user, self.race, drivers)
+        self.url = f"/api/races/{self.race.id}/crowd/"
+
+    def bet(self, user, race, drivers):
+        for position, driver in enumerate(drivers, start=1):
+            Bet.objects.create(user=user, race=race, bet_type=self.bet_type, driver=driver, predicted_position=position)
+
+
+class CrowdAPITest(CrowdTestCase):
+    """Tests for /api/races/{id}/crowd/"""
+
+    def test_distribution(self):
+        """Should count each position's picks per driver, most picked first"""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["bettors"], 3)
+        first = response.data["positions"][0]
+        self.assertEqual((first["position"], first["picks"]), (1, 3))
+        self.assertEqual(
+            [(driver["driver_name"], driver["picks"], driver["share"]) for driver in first["drivers"]],
+            [("Max Verstappen", 2, 0.6667), ("Charles Leclerc", 1, 0.3333)],
+        )
+
+    def test_consensus_and_contrarian(self):
+        """Should order drivers by Borda count and list the picks furthest from it first"""
+        data = APIClient().get(self.url).data
+        max_, lando, charles = self.drivers
+
+        self.assertEqual([row["driver"] for row in data["consensus"]], [max_.id, charles.id, lando.id])
+        # carol's Max in P3 is two places off the consensus; picks that match it are left out
+        self.assertEqual(
+            [(row["position"], row["driver"], row["consensus_position"]) for row in data["contrarian"]],
+            [(3, max_.id, 1), (2, lando.id, 3), (1, charles.id, 2), (3, charles.id, 2)],
+        )
+
+    def test_hidden_while_betting_is_open(self):
+        """Should not reveal picks before the deadline"""
+        self.race.betting_deadline = timezone.now() + timedelta(hours=1)
+        self.race.status = "betting_open"
+        self.race.save()
+
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CrowdPick.objects.exists())
+
+    def test_unknown_bet_type(self):
+        """Should reject an unknown bet type"""
+        self.assertEqual(APIClient().get(self.url, {"bet_type": "podium"}).status_code, 400)
+
+    def test_served_from_tally(self):
+        """Should tally on first view, then read the tally without touching bets"""
+        client = APIClient()
+        first = client.get(self.url).data
+        Bet.objects.filter(race=self.race).delete()
+
+        # race, bet type, tally rows
+        with self.assertNumQueries(3):
+            self.assertEqual(client.get(self.url).data, first)
+
+    def test_empty_tally_not_repeated(self):
+        """Should serve empty statistics for a tallied race without bets, without tallying again"""
+        Bet.objects.filter(race=self.race).delete()
+        client = APIClient()
+        client.get(self.url)
+
+        with self.assertNumQueries(3):
+            data = client.get(self.url).data
+        self.assertEqual((data["bettors"], data["positions"], data["consensus"]), (0, [], []))
+
+
+class TallyTest(CrowdTestCase):
+    """Tests for when bets are tallied"""
+
+    def test_tallied_when_betting_closes(self):
+        """Should tally a race's bets as the scheduler closes betting on it"""
+        now = timezone.now()
+        race = Race.objects.create(
+            competition=self.competition,
+            name="Saudi GP",
+            country="Saudi Arabia",
+            round_number=2,
+            race_datetime=now + timedelta(hours=2),
+            betting_deadline=now + timedelta(hours=1),
+            status="betting_open",
+        )
+        self.bet(self.users[0], race, self.drivers)
+
+        advance_races(now)
+        self.assertFalse(CrowdPick.objects.filter(race=race).exists())
+        advance_races(now + timedelta(hours=1))
+
+        self.assertEqual(
+            sorted(CrowdPick.objects.filter(race=race).values_list("predicted_position", "driver_id", "picks")),
+            [(1, self.drivers[0].id, 1), (2, self.drivers[1].id, 1), (3, self.drivers[2].id, 1)],
+        )
+
+    def test_imports_retally_closed_races(self):
+        """Should refresh the tally of a closed race after importing bets into it"""
+        APIClient().get(self.url)
+        dave = User.objects.create_user(username="dave", email="dave@example.com", password="pass12345")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bets.csv")
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["username", "race_id", "driver_number", "predicted_position"])
+                writer.writerow([dave.username, self.race.id, 4, 1])
+            import_file(BetImporter(), path)
+
+        tally = dict(
+            CrowdPick.objects.filter(race=self.race, predicted_position=1).values_list("driver__driver_number", "picks")
+        )
+        self.assertEqual(tally, {1: 2, 16: 1, 4: 1})
+
+    def test_concurrent_tallies(self):
+        """Should not fail when another tally writes the same rows between the delete and the insert"""
+        tally_races([self.race.id])
+        # As seen by the second of two simultaneous first views: the rows reappear after its delete
+        with patch("django.db.models.query.QuerySet.delete", return_value=(0, {})):
+            tally_races([self.race.id])
+
+        tally = dict(
+            CrowdPick.objects.filter(race=self.race, predicted_position=1).values_list("driver__driver_number", "picks")
+        )
+        self.assertEqual(tally, {1: 2, 16: 1})
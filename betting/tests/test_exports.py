@@ -0,0 +1,208 @@
+"""
+Tests for the streaming CSV/NDJSON exports
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.exports import Export
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult
+
+
+def read_csv(body):
+    return list(csv.DictReader(io.StringIO(body.decode())))
+
+
+def read_ndjson(body):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+class ExportTestCase(TestCase):
+    """Shared fixtures: two competitions, bets on two races, results and standings"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="admin123")
+        self.fan = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, start_date=today, end_date=today + timedelta(days=300), created_by=self.admin
+        )
+        self.other = Competition.objects.create(
+            name="F1 2026", year=2026, start_date=today, end_date=today + timedelta(days=300), created_by=self.admin
+        )
+        now = timezone.now()
+        self.races = [
+            Race.objects.create(
+                competition=competition,
+                name=f"GP {n}",
+                country="Bahrain",
+                round_number=n,
+                race_datetime=now - timedelta(days=n),
+                betting_deadline=now - timedelta(days=n, hours=2),
+            )
+            for n, competition in ((1, self.competition), (2, self.competition), (3, self.other))
+        ]
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        drivers = [
+            Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull"),
+            Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren"),
+        ]
+        for race in self.races:
+            for position, driver in enumerate(drivers, start=1):
+                Bet.objects.create(user=self.fan, race=race, bet_type=bet_type, driver=driver, predicted_position=position)
+                RaceResult.objects.create(race=race, driver=driver, position=position, verified=True)
+        CompetitionStanding.objects.create(competition=self.competition, user=self.fan, total_points=25, rank=1)
+        CompetitionStanding.objects.create(competition=self.competition, user=self.admin, total_points=10, rank=2)
+        CompetitionStanding.objects.create(competition=self.other, user=self.fan, total_points=3, rank=1)
+
+
+class ExportTest(ExportTestCase):
+    """Tests for the Export streamer"""
+
+    def body(self, export):
+        return b"".join(export.chunks())
+
+    def test_csv(self):
+        """Should write a header and one row per bet, filtered by competition"""
+        rows = read_csv(self.body(Export("bets", competition=self.competition.id)))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["username"], "fan")
+        self.assertEqual(rows[0]["driver_number"], "1")
+        self.assertEqual(rows[0]["bet_type"], "top10")
+        self.assertEqual({row["competition_id"] for row in rows}, {str(self.competition.id)})
+        self.assertTrue(rows[0]["created_at"].endswith("Z"))
+
+    def test_ndjson(self):
+        """Should write one JSON object per line"""
+        rows = read_ndjson(self.body(Export("results", "ndjson", race=self.races[0].id)))
+
+        self.assertEqual([row["driver"] for row in rows], ["Max Verstappen", "Lando Norris"])
+        self.assertEqual(rows[0]["verified"], True)
+
+    def test_standings(self):
+        """Should export standings in rank order and reject a race filter"""
+        rows = read_csv(self.body(Export("standings", competition=self.competition.id)))
+        self.assertEqual([row["username"] for row in rows], ["fan", "admin"])
+
+        with self.assertRaises(ValueError):
+            Export("standings", race=self.races[0].id)
+
+    def test_chunks(self):
+        """Should encode one block per chunk of rows and count them"""
+        export = Export("bets", chunk_size=2)
+        chunks = list(export.chunks())
+
+        # Header, three full chunks, then the (empty) final one
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(export.rows, 6)
+
+    def test_gzip(self):
+        """Should gzip on the fly to the same content"""
+        plain = self.body(Export("bets", "ndjson", chunk_size=4))
+        compressed = self.body(Export("bets", "ndjson", compress=True, chunk_size=4))
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_invalid(self):
+        """Should reject unknown exports and formats"""
+        with self.assertRaises(ValueError):
+            Export("users")
+        with self.assertRaises(ValueError):
+            Export("bets", "xml")
+
+
+class ExportAPITest(ExportTestCase):
+    """Tests for /api/export/<kind>/"""
+
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def test_csv(self):
+        """Should stream CSV as an attachment"""
+        response = self.api.get(f"/api/export/bets/?competition={self.competition.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f'filename="bets-competition-{self.competition.id}.csv"', response["Content-Disposition"])
+        self.assertEqual(len(read_csv(response.getvalue())), 4)
+
+    def test_ndjson(self):
+        """Should stream NDJSON with ?format=ndjson or an Accept header"""
+        response = self.api.get("/api/export/standings/?format=ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(read_ndjson(response.getvalue())), 3)
+
+        response = self.api.get("/api/export/standings/", HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(len(read_ndjson(response.getvalue())), 3)
+
+    def test_gzip(self):
+        """Should compress for clients that accept gzip"""
+        response = self.api.get(f"/api/export/results/?race={self.races[0].id}", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(read_csv(gzip.decompress(response.getvalue()))), 2)
+
+    def test_admin_only(self):
+        """Should refuse non-staff users"""
+        self.api.force_authenticate(self.fan)
+        self.assertEqual(self.api.get("/api/export/bets/").status_code, 403)
+
+    def test_bad_requests(self):
+        """Should return 404 for unknown exports and 400 for bad filters"""
+        self.assertEqual(self.api.get("/api/export/users/").status_code, 404)
+        self.assertEqual(self.api.get("/api/export/bets/?race=abc").status_code, 400)
+        self.assertEqual(self.api.get(f"/api/export/standings/?race={self.races[0].id}").status_code, 400)
+
+    async def test_asgi(self):
+        """Should stream from the async ORM under ASGI"""
+        client = AsyncClient()
+        await client.aforce_login(self.admin)
+        response = await client.get("/api/export/bets/?format=ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(read_ndjson(body)), 6)
+
+
+class ExportCommandTest(ExportTestCase):
+    """Tests for the export_data command"""
+
+    def test_stdout(self):
+        """Should write CSV to stdout"""
+        out = StringIO()
+        call_command("export_data", "bets", f"--race={self.races[0].id}", stdout=out, stderr=StringIO())
+        self.assertEqual(len(read_csv(out.getvalue().encode())), 2)
+
+    def test_gzip_file(self):
+        """Should gzip output files ending in .gz and report the row count"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.ndjson.gz")
+            err = StringIO()
+            call_command("export_data", "results", "--format=ndjson", f"--output={path}", stdout=StringIO(), stderr=err)
+            with gzip.open(path) as file:
+                self.assertEqual(len(read_ndjson(file.read())), 6)
+
+        self.assertIn("Exported 6 results rows", err.getvalue())
+
+    def test_invalid_filter(self):
+        """Should fail for a race filter on standings"""
+        with self.assertRaises(CommandError):
+            call_command("export_data", "standings", "--race=1", stdout=StringIO(), stderr=StringIO())
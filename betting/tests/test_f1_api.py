@@ -2,6 +2,10 @@
 Tests for F1 API integration module
 """
 
+import json
+import shutil
+import tempfile
+import time
 from unittest.mock import MagicMock, patch
 
 import requests
@@ -9,6 +13,8 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from betting.f1_api import F1API, get_sample_f1_drivers, get_sample_f1_schedule
+from betting.f1_cache import F1ResponseCache
+from betting.f1_stream import iter_json_array, reduce_fastest_lap, reduce_final_positions
 
 
 class TestGetSampleF1Drivers(TestCase):
@@ -349,3 +355,251 @@ class TestF1APIGetRaceResults(TestCase):
         result = self.api.get_race_results(session_key="2024_1")
 
         self.assertIsNone(result)
+
+
+class TestF1ResponseCache(TestCase):
+    """Tests for the on-disk F1 response cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = F1ResponseCache(self.cache_dir, live_ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_miss_returns_none(self):
+        """Should return None for an unknown endpoint/params pair"""
+        self.assertIsNone(self.cache.get("drivers", {"session_key": "9999_latest"}))
+
+    def test_roundtrip_payload(self):
+        """Should return the stored payload for the same endpoint and params"""
+        payload = [{"driver_number": 1, "last_name": "Verstappen"}]
+        self.cache.set("drivers", {"session_key": "2023_latest"}, payload)
+
+        entry = self.cache.get("drivers", {"session_key": "2023_latest"})
+        self.assertEqual(entry["payload"], payload)
+        self.assertIsNone(self.cache.get("drivers", {"session_key": "2022_latest"}))
+
+    def test_key_ignores_param_order(self):
+        """Params in a different order should hit the same entry"""
+        key_a = F1ResponseCache.make_key("sessions", {"year": 2023, "session_type": "Race"})
+        key_b = F1ResponseCache.make_key("sessions", {"session_type": "Race", "year": 2023})
+        self.assertEqual(key_a, key_b)
+
+    def test_immutable_entry_never_expires(self):
+        """Entries stored without a ttl should always be fresh"""
+        entry = self.cache.set("position", {"session_key": 1}, [], ttl=None)
+        self.assertTrue(self.cache.is_fresh(entry))
+
+    def test_live_entry_expires(self):
+        """Entries stored with a ttl should go stale after it elapses"""
+        entry = self.cache.set("position", {"session_key": 1}, [], ttl=60)
+        self.assertTrue(self.cache.is_fresh(entry))
+        entry["expires_at"] = time.time() - 1
+        self.assertFalse(self.cache.is_fresh(entry))
+
+    def test_payload_is_compressed_on_disk(self):
+        """Stored files should be gzip-compressed"""
+        self.cache.set("drivers", {}, [{"team": "Ferrari"}] * 500)
+        files = list(self.cache.directory.rglob("*.json.gz"))
+        self.assertEqual(len(files), 1)
+        with open(files[0], "rb") as fh:
+            self.assertEqual(fh.read(2), b"\x1f\x8b")
+
+    def test_from_settings_disabled_without_dir(self):
+        """Caching should be disabled when F1_API_CACHE_DIR is empty"""
+        with override_settings(F1_API_CACHE_DIR=""):
+            self.assertIsNone(F1ResponseCache.from_settings())
+
+
+class TestF1APICaching(TestCase):
+    """Tests for F1API responses served through the cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            F1_API_BASE_URL="https://api.openf1.org/v1", F1_API_CACHE_DIR=self.cache_dir, F1_API_CACHE_LIVE_TTL=60
+        )
+        self.settings_override.enable()
+        self.api = F1API()
+        self.results = [{"position": 1, "driver_number": 1}]
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _response(self, status_code=200, payload=None, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = payload
+        response.headers = headers or {}
+        return response
+
+    @patch.object(requests.Session, "get")
+    def test_completed_session_costs_one_request(self, mock_get):
+        """Completed session results should be fetched once and then served from disk"""
+        mock_get.return_value = self._response(payload=self.results)
+
+        first = self.api.get_race_results(session_key=9158, completed=True)
+        second = F1API().get_race_results(session_key=9158, completed=True)
+
+        self.assertEqual(first, self.results)
+        self.assertEqual(second, self.results)
+        mock_get.assert_called_once()
+
+    @patch.object(requests.Session, "get")
+    def test_past_season_schedule_is_immutable(self, mock_get):
+        """A past season's schedule should never be refetched"""
+        mock_get.return_value = self._response(payload=[{"session_key": 1}])
+
+        self.api.get_race_schedule(year=2023)
+        self.api.get_race_schedule(year=2023)
+
+        mock_get.assert_called_once()
+
+    @patch.object(requests.Session, "get")
+    def test_stale_live_entry_revalidates_with_etag(self, mock_get):
+        """A stale live entry should send If-None-Match and reuse the payload on 304"""
+        mock_get.return_value = self._response(payload=self.results, headers={"ETag": '"abc"'})
+        self.api.get_race_results(session_key=9999)
+
+        # Expire the live entry
+        entry = self.api.cache.get("position", {"session_key": 9999})
+        self.api.cache.set("position", entry["params"], entry["payload"], ttl=-1, etag=entry["etag"])
+
+        mock_get.return_value = self._response(status_code=304)
+        result = self.api.get_race_results(session_key=9999)
+
+        self.assertEqual(result, self.results)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args[1]["headers"]["If-None-Match"], '"abc"')
+        self.assertTrue(self.api.cache.is_fresh(self.api.cache.get("position", {"session_key": 9999})))
+
+    @patch.object(requests.Session, "get")
+    def test_error_response_is_not_cached(self, mock_get):
+        """Failed responses should not be written to the cache"""
+        mock_get.return_value = self._response(status_code=500)
+
+        self.assertIsNone(self.api.get_race_results(session_key=1, completed=True))
+        self.assertIsNone(self.api.cache.get("position", {"session_key": 1}))
+
+    @patch.object(requests.Session, "get")
+    def test_network_error_serves_stale_entry(self, mock_get):
+        """A stale entry should be returned when the API is unreachable"""
+        self.api.cache.set("position", {"session_key": 2}, self.results, ttl=-1)
+        mock_get.side_effect = requests.RequestException("Connection failed")
+
+        self.assertEqual(self.api.get_race_results(session_key=2), self.results)
+
+    def test_use_cache_false_disables_cache(self):
+        """F1API(use_cache=False) should bypass the cache entirely"""
+        self.assertIsNone(F1API(use_cache=False).cache)
+
+
+class TestIterJsonArray(TestCase):
+    """Tests for the incremental JSON array parser"""
+
+    def _chunks(self, text, size):
+        data = text.encode("utf-8")
+        return [data[i : i + size] for i in range(0, len(data), size)]
+
+    def test_parses_across_chunk_boundaries(self):
+        """Records split across any chunk boundary should decode identically"""
+        records = [{"driver_number": n, "position": n, "name": "Pérez"} for n in range(1, 30)]
+        text = json.dumps(records)
+
+        for size in (1, 7, 64, len(text)):
+            self.assertEqual(list(iter_json_array(self._chunks(text, size))), records)
+
+    def test_empty_array(self):
+        """An empty array should yield nothing"""
+        self.assertEqual(list(iter_json_array([b" [ ] "])), [])
+
+    def test_truncated_feed_raises(self):
+        """A feed cut off mid-array should raise ValueError"""
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"position": 1}, {"posi']))
+
+    def test_non_array_raises(self):
+        """A top-level object should be rejected"""
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"detail": "error"}']))
+
+
+class TestReduceFinalPositions(TestCase):
+    """Tests for reducing position samples to the final classification"""
+
+    def test_latest_sample_per_driver(self):
+        """Each driver's latest sample should win, ordered by position"""
+        samples = iter(
+            [
+                {"date": "2024-03-02T15:00:00", "driver_number": 16, "position": 1},
+                {"date": "2024-03-02T15:00:00", "driver_number": 1, "position": 2},
+                {"date": "2024-03-02T16:30:00", "driver_number": 1, "position": 1},
+                {"date": "2024-03-02T16:30:00", "driver_number": 16, "position": 2},
+                {"date": "2024-03-02T16:31:00", "driver_number": 44, "position": None},
+            ]
+        )
+
+        rows = reduce_final_positions(samples)
+
+        self.assertEqual([(r["driver_number"], r["position"]) for r in rows], [(1, 1), (16, 2)])
+
+
+class TestReduceFastestLap(TestCase):
+    """Tests for reducing lap records to the fastest lap"""
+
+    def test_fastest_timed_lap(self):
+        """Should return the quickest timed lap, ignoring untimed ones"""
+        laps = iter(
+            [
+                {"driver_number": 1, "lap_number": 1, "lap_duration": None},
+                {"driver_number": 1, "lap_number": 2, "lap_duration": 95.2},
+                {"driver_number": 16, "lap_number": 44, "lap_duration": 94.8},
+            ]
+        )
+        self.assertEqual(reduce_fastest_lap(laps), {"driver_number": 16, "lap_number": 44, "lap_duration": 94.8})
+
+    def test_no_laps(self):
+        """Should return None when there are no timed laps"""
+        self.assertIsNone(reduce_fastest_lap(iter([])))
+
+
+@override_settings(F1_API_BASE_URL="https://api.openf1.org/v1", F1_API_CACHE_DIR="")
+class TestF1APIGetFinalPositions(TestCase):
+    """Tests for F1API.get_final_positions streaming method"""
+
+    def setUp(self):
+        self.api = F1API()
+
+    @patch.object(requests.Session, "get")
+    def test_streams_and_reduces_feed(self, mock_get):
+        """Should stream the /position feed and return the final classification"""
+        samples = [
+            {"date": "2024-03-02T15:00:00", "driver_number": 16, "position": 1},
+            {"date": "2024-03-02T16:30:00", "driver_number": 16, "position": 2},
+            {"date": "2024-03-02T16:30:00", "driver_number": 1, "position": 1},
+        ]
+        data = json.dumps(samples).encode("utf-8")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [data[i : i + 10] for i in range(0, len(data), 10)]
+        mock_get.return_value = mock_response
+
+        rows = self.api.get_final_positions(session_key=9472)
+
+        self.assertEqual([(r["driver_number"], r["position"]) for r in rows], [(1, 1), (16, 2)])
+        self.assertIn("/position", mock_get.call_args[0][0])
+        self.assertTrue(mock_get.call_args[1]["stream"])
+        mock_response.json.assert_not_called()
+        mock_response.close.assert_called_once()
+
+    @patch.object(requests.Session, "get")
+    def test_malformed_feed_returns_none(self, mock_get):
+        """Should return None when the feed is not a complete JSON array"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [b'[{"position": 1']
+        mock_get.return_value = mock_response
+
+        self.assertIsNone(self.api.get_final_positions(session_key=9472))
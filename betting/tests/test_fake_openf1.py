@@ -0,0 +1,154 @@
+"""
+End-to-end tests for the F1 API client and ingestion against a local fake OpenF1 server
+"""
+
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from betting.f1_api import F1API
+from betting.ingestion import import_season
+from betting.models import Competition, Race, RaceResult
+from betting.tests.fake_openf1 import FIRST_SESSION_KEY, FakeOpenF1Data, FakeOpenF1Server
+
+
+class FakeOpenF1TestCase(TestCase):
+    """Starts a fake OpenF1 server and points F1API at it"""
+
+    server_options = {}
+
+    def setUp(self):
+        self.server = FakeOpenF1Server(data=FakeOpenF1Data(year=2023, races=4), **self.server_options).start()
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            F1_API_BASE_URL=self.server.base_url, F1_API_CACHE_DIR=self.cache_dir, F1_API_MAX_RETRIES=3
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.server.stop()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class F1APIAgainstFakeServerTest(FakeOpenF1TestCase):
+    """Tests for F1API over real HTTP"""
+
+    def test_schedule_and_drivers(self):
+        """Should fetch sessions and drivers over HTTP"""
+        api = F1API()
+
+        self.assertEqual(len(api.get_race_schedule(year=2023)), 4)
+        self.assertEqual(len(api.get_drivers(year=2023)), 20)
+
+    def test_final_positions_match_finishing_order(self):
+        """Streaming the position feed should yield the server's finishing order"""
+        session_key = FIRST_SESSION_KEY + 1
+        rows = F1API().get_final_positions(session_key)
+
+        expected = self.server.data.finishing_order(session_key)
+        self.assertEqual([row["driver_number"] for row in rows], expected)
+
+    def test_completed_session_is_served_from_cache(self):
+        """A completed session should cost one request across client instances"""
+        F1API().get_final_positions(FIRST_SESSION_KEY + 1, completed=True)
+        F1API().get_final_positions(FIRST_SESSION_KEY + 1, completed=True)
+
+        self.assertEqual(self.server.count("position"), 1)
+
+    @override_settings(F1_API_CACHE_LIVE_TTL=0)
+    def test_live_data_revalidates_with_etag(self):
+        """Stale live data should be revalidated with a conditional request"""
+        api = F1API()
+        first = api.get_race_schedule(year=timezone.now().year)
+        second = api.get_race_schedule(year=timezone.now().year)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.count("sessions"), 2)
+        self.assertEqual(self.server.requests[-1][0], "sessions")
+
+    def test_recorded_payloads(self):
+        """Recorded payloads on disk should override synthetic data"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        with open(f"{directory}/position_9158.json", "w") as fh:
+            json.dump([{"date": "2023-09-17T13:00:00", "driver_number": 55, "position": 1}], fh)
+
+        with FakeOpenF1Server.from_directory(directory) as recorded:
+            with override_settings(F1_API_BASE_URL=recorded.base_url):
+                rows = F1API(use_cache=False).get_final_positions(9158)
+
+        self.assertEqual([(r["driver_number"], r["position"]) for r in rows], [(55, 1)])
+
+    def test_recorded_endpoint_with_underscore(self):
+        """Recorded files for endpoints with an underscore in their name should be keyed by session"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        with open(f"{directory}/session_result_9158.json", "w") as fh:
+            json.dump([{"driver_number": 55, "position": 1}], fh)
+        with open(f"{directory}/starting_grid.json", "w") as fh:
+            json.dump([{"driver_number": 4, "position": 1}], fh)
+
+        server = FakeOpenF1Server.from_directory(directory)
+        server.httpd.server_close()
+
+        self.assertEqual(server.recorded[("session_result", 9158)], [{"driver_number": 55, "position": 1}])
+        self.assertEqual(server.recorded["starting_grid"], [{"driver_number": 4, "position": 1}])
+
+
+class F1APIRateLimitTest(FakeOpenF1TestCase):
+    """Tests for F1API behaviour when the API rate-limits"""
+
+    server_options = {"rate_limit_rate": 0.5, "retry_after": 0, "seed": 3}
+
+    def test_retries_through_429s(self):
+        """Requests answered with 429 should be retried until they succeed"""
+        api = F1API(use_cache=False)
+        for _ in range(5):
+            self.assertEqual(len(api.get_drivers(year=2023)), 20)
+
+        self.assertGreater(self.server.count("drivers"), 5)
+
+
+class ImportSeasonAgainstFakeServerTest(FakeOpenF1TestCase):
+    """End-to-end season import over HTTP"""
+
+    server_options = {"latency": 0.02}
+
+    def setUp(self):
+        super().setUp()
+        admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2023",
+            year=2023,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=admin,
+        )
+
+    def test_import_full_season(self):
+        """Should import every race with a full classification, fetching concurrently"""
+        counts = import_season(self.competition, 2023, max_in_flight=8)
+
+        self.assertEqual(counts, {"drivers": 20, "races": 4, "results": 80})
+        self.assertGreater(self.server.peak_in_flight, 1)
+
+        race = Race.objects.get(competition=self.competition, round_number=1)
+        results = RaceResult.objects.filter(race=race)
+        self.assertEqual(results.filter(did_not_finish=True).count(), 1)
+        self.assertEqual(results.filter(fastest_lap=True).count(), 1)
+        self.assertFalse(results.filter(grid_position__isnull=True).exists())
+
+    def test_reimport_costs_no_requests(self):
+        """Re-importing a past season should be served entirely from the cache"""
+        import_season(self.competition, 2023)
+        requests_after_first = self.server.count()
+
+        import_season(self.competition, 2023)
+
+        self.assertEqual(self.server.count(), requests_after_first)
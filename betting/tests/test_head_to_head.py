@@ -0,0 +1,89 @@
+"""
+Tests for per-race scores and the head-to-head endpoint
+"""
+
+from rest_framework.test import APIClient
+
+from betting.models import RaceScore
+from betting.scoring import score_race
+from betting.tests.test_history import HistoryTestCase
+
+
+class HeadToHeadTestCase(HistoryTestCase):
+    """Shared fixtures: the history fixtures with every race scored"""
+
+    def setUp(self):
+        super().setUp()
+        for race in self.races:
+            score_race(race)
+        self.alice, self.bob, self.carol = self.users
+        self.url = f"/api/competitions/{self.competition.id}/head-to-head/"
+
+
+class RaceScoreTest(HeadToHeadTestCase):
+    """Tests for the RaceScore rows written by score_race"""
+
+    def test_scores_per_race(self):
+        """Should store each bettor's points and exact and partial picks per race"""
+        scores = RaceScore.objects.filter(competition=self.competition).order_by("race__round_number", "user__username")
+        self.assertEqual(
+            [(s.race.round_number, s.user.username, s.points, s.exact_predictions, s.partial_predictions) for s in scores],
+            [(1, "alice", 20, 2, 0), (2, "alice", 10, 0, 2), (2, "bob", 20, 2, 0), (3, "bob", 20, 2, 0)],
+        )
+
+    def test_rescore_replaces(self):
+        """Should replace a race's scores when it is rescored"""
+        score_race(self.races[1], rescore=True)
+        self.assertEqual(RaceScore.objects.filter(race=self.races[1]).count(), 2)
+
+
+class HeadToHeadAPITest(HeadToHeadTestCase):
+    """Tests for /api/competitions/{id}/head-to-head/"""
+
+    def test_comparison(self):
+        """Should return both users' scores race by race, with nulls where one did not bet"""
+        response = APIClient().get(self.url, {"users": f"{self.alice.id},{self.bob.id}"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual([user["user"] for user in data["users"]], [self.alice.id, self.bob.id])
+        self.assertEqual(
+            [(race["round_number"], race["points"], race["exact"]) for race in data["races"]],
+            [(1, [20, None], [2, None]), (2, [10, 20], [0, 2]), (3, [None, 20], [None, 2])],
+        )
+        self.assertEqual(
+            data["totals"],
+            {"points": [30, 40], "exact": [2, 4], "partial": [2, 0], "races_won": [1, 2], "races_tied": 0},
+        )
+
+    def test_picks_side_by_side(self):
+        """Should pair the users' picks by position"""
+        data = APIClient().get(self.url, {"users": f"{self.alice.id},{self.bob.id}"}).data
+        max_, lando = self.drivers
+
+        self.assertEqual(
+            [(pick["position"], pick["drivers"]) for pick in data["races"][1]["picks"]],
+            [(1, [lando.id, max_.id]), (2, [max_.id, lando.id])],
+        )
+        self.assertEqual(data["races"][0]["picks"][0]["driver_names"], ["Max Verstappen", None])
+
+    def test_query_count(self):
+        """Should read the competition, both standings, the race scores and the picks"""
+        client = APIClient()
+        users = f"{self.alice.id},{self.bob.id}"
+        with self.assertNumQueries(4):
+            client.get(self.url, {"users": users})
+        with self.assertNumQueries(3):
+            response = client.get(self.url, {"users": users, "picks": "false"})
+        self.assertNotIn("picks", response.data["races"][0])
+
+    def test_invalid_users(self):
+        """Should reject anything but two different user IDs"""
+        client = APIClient()
+        for users in ("", "1", "a,b", f"{self.alice.id},{self.alice.id}", "1,2,3"):
+            self.assertEqual(client.get(self.url, {"users": users}).status_code, 400, users)
+
+    def test_user_not_in_competition(self):
+        """Should return 404 unless both users are in the standings"""
+        response = APIClient().get(self.url, {"users": f"{self.alice.id},999"})
+        self.assertEqual(response.status_code, 404)
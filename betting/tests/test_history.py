@@ -0,0 +1,150 @@
+"""
+Tests for standings snapshots and the rank-progression endpoint
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.history import progression, snapshot_standings
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult, StandingSnapshot
+from betting.scoring import score_race
+
+
+class HistoryTestCase(TestCase):
+    """Shared fixtures: three users betting on three races"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=name, email=f"{name}@example.com", password="pass12345")
+            for name in ("alice", "bob", "carol")
+        ]
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, status="active", start_date=today, end_date=today, created_by=self.users[0]
+        )
+        now = timezone.now()
+        self.races = [
+            Race.objects.create(
+                competition=self.competition,
+                name=f"GP {n}",
+                country="Bahrain",
+                round_number=n,
+                race_datetime=now - timedelta(days=10 - n),
+                betting_deadline=now - timedelta(days=10 - n, hours=2),
+            )
+            for n in (1, 2, 3)
+        ]
+        self.drivers = [
+            Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull"),
+            Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren"),
+        ]
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        for user in self.users:
+            CompetitionStanding.objects.create(competition=self.competition, user=user)
+        for race in self.races:
+            for position, driver in enumerate(self.drivers, start=1):
+                RaceResult.objects.create(race=race, driver=driver, position=position, verified=True)
+
+        # alice is exact in round 1 only, bob in rounds 2 and 3; carol never bets
+        picks = {self.users[0]: [self.drivers, self.drivers[::-1], []], self.users[1]: [[], self.drivers, self.drivers]}
+        for user, races in picks.items():
+            for race, drivers in zip(self.races, races):
+                for position, driver in enumerate(drivers, start=1):
+                    Bet.objects.create(user=user, race=race, bet_type=bet_type, driver=driver, predicted_position=position)
+
+    def ranks(self, round_number):
+        snapshots = StandingSnapshot.objects.filter(competition=self.competition, round_number=round_number)
+        return [(s.user.username, s.rank, s.total_points) for s in snapshots.select_related("user").order_by("rank")]
+
+
+class SnapshotTest(HistoryTestCase):
+    """Tests for snapshot_standings"""
+
+    def test_scoring_snapshots_each_round(self):
+        """Should record cumulative points and ranks after every scored race"""
+        for race in self.races:
+            score_race(race)
+
+        self.assertEqual(self.ranks(1), [("alice", 1, 20), ("bob", 2, 0), ("carol", 3, 0)])
+        self.assertEqual(self.ranks(2), [("alice", 1, 30), ("bob", 2, 20), ("carol", 3, 0)])
+        self.assertEqual(self.ranks(3), [("bob", 1, 40), ("alice", 2, 30), ("carol", 3, 0)])
+
+    def test_rescore_rewrites_later_rounds(self):
+        """Should rewrite a rescored round and every later one"""
+        for race in self.races:
+            score_race(race)
+        RaceResult.objects.filter(race=self.races[0]).delete()
+        score_race(self.races[0], rescore=True)
+
+        self.assertEqual(self.ranks(1)[0][2], 0)
+        self.assertEqual(self.ranks(3)[:2], [("bob", 1, 40), ("alice", 2, 10)])
+
+    def test_incremental(self):
+        """Should only read bets since the latest earlier snapshot"""
+        score_race(self.races[0])
+        score_race(self.races[1])
+        # Totals before round 2 come from the round 1 snapshot, not the round 1 bets
+        StandingSnapshot.objects.filter(round_number=1, user=self.users[0]).update(total_points=100)
+        snapshot_standings(self.competition, from_round=2)
+
+        self.assertEqual(self.ranks(2)[0], ("alice", 1, 110))
+
+    def test_backfill(self):
+        """Should fill in rounds scored before snapshots existed"""
+        for race in self.races:
+            score_race(race)
+        StandingSnapshot.objects.all().delete()
+
+        self.assertEqual(snapshot_standings(self.competition, from_round=3), 9)
+        self.assertEqual(self.ranks(2)[0], ("alice", 1, 30))
+
+
+class ProgressionTest(HistoryTestCase):
+    """Tests for /api/competitions/{id}/progression/"""
+
+    def setUp(self):
+        super().setUp()
+        for race in self.races[:2]:
+            score_race(race)
+        CompetitionStanding.objects.filter(user=self.users[2]).update(rank=3)
+        self.api = APIClient()
+        self.url = f"/api/competitions/{self.competition.id}/progression/"
+
+    def test_top(self):
+        """Should return the current top N's rank and points per round as arrays"""
+        with self.assertNumQueries(2):
+            data = progression(self.competition, top=2)
+
+        self.assertEqual(data["rounds"], [1, 2])
+        self.assertEqual(
+            data["users"],
+            [
+                {"user": self.users[0].id, "user_display_name": "", "rank": [1, 1], "points": [20, 30]},
+                {"user": self.users[1].id, "user_display_name": "", "rank": [2, 2], "points": [0, 20]},
+            ],
+        )
+
+    def test_users(self):
+        """Should return the requested users, with nulls for rounds they have no snapshot for"""
+        StandingSnapshot.objects.filter(user=self.users[2], round_number=1).delete()
+        response = self.api.get(self.url, {"users": f"{self.users[0].id},{self.users[2].id}"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rounds"], [1, 2])
+        ranks = {series["user"]: series["rank"] for series in response.data["users"]}
+        self.assertEqual(ranks, {self.users[0].id: [1, 1], self.users[2].id: [None, 3]})
+
+    def test_top_clamped(self):
+        """Should clamp ?top= to at least one user"""
+        for top in ("-1", "0"):
+            response = self.api.get(self.url, {"top": top})
+            self.assertEqual(response.status_code, 200, top)
+            self.assertEqual([series["user"] for series in response.data["users"]], [self.users[0].id])
+
+    def test_bad_parameters(self):
+        """Should reject non-numeric users"""
+        self.assertEqual(self.api.get(self.url, {"users": "alice"}).status_code, 400)
@@ -0,0 +1,228 @@
+"""
+Tests for the bulk bet and result importers
+"""
+
+import csv
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from betting.exports import Export
+from betting.imports import BetImporter, ResultImporter, import_file, rejects_path
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult
+
+
+class ImportTestCase(TestCase):
+    """Shared fixtures: a competition with two races, two drivers and two users"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.fan = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, start_date=today, end_date=today + timedelta(days=300), created_by=self.admin
+        )
+        now = timezone.now()
+        self.races = [
+            Race.objects.create(
+                competition=self.competition,
+                name=f"GP {n}",
+                country="Bahrain",
+                round_number=n,
+                race_datetime=now - timedelta(days=n),
+                betting_deadline=now - timedelta(days=n, hours=2),
+            )
+            for n in (1, 2)
+        ]
+        self.bet_type = BetType.objects.create(name="Top 10", code="top10")
+        self.drivers = {
+            1: Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull"),
+            4: Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren"),
+        }
+
+    def write(self, name, rows):
+        path = os.path.join(self.directory.name, name)
+        with gzip.open(path, "wt") if name.endswith(".gz") else open(path, "w", newline="") as file:
+            if ".csv" in name:
+                writer = csv.DictWriter(file, list({name: None for row in rows for name in row}))
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                file.writelines(row if isinstance(row, str) else json.dumps(row) + "\n" for row in rows)
+        return path
+
+
+class BetImportTest(ImportTestCase):
+    """Tests for importing bets"""
+
+    def bet(self, **overrides):
+        return {"username": "fan", "race_id": self.races[0].id, "driver_number": 1, "predicted_position": 1, **overrides}
+
+    def test_import_csv(self):
+        """Should create bets, resolving users, races, drivers and bet types"""
+        path = self.write("bets.csv", [self.bet(), self.bet(driver_number=4, predicted_position=2, is_scored="True")])
+        summary = import_file(BetImporter(), path)
+
+        self.assertEqual((summary["read"], summary["imported"], summary["rejected"]), (2, 2, 0))
+        self.assertIsNone(summary["rejects"])
+        bets = list(Bet.objects.order_by("predicted_position"))
+        self.assertEqual([bet.driver.driver_number for bet in bets], [1, 4])
+        self.assertEqual(bets[0].user, self.fan)
+        self.assertEqual(bets[0].bet_type, self.bet_type)
+        self.assertEqual([bet.is_scored for bet in bets], [False, True])
+
+    def test_rejects(self):
+        """Should write rejected rows with their reason and import the rest"""
+        rows = [
+            self.bet(),
+            self.bet(username="ghost"),
+            self.bet(driver_number=99),
+            self.bet(predicted_position=21),
+            self.bet(race_id=999999),
+            self.bet(driver_number=4),
+        ]
+        path = self.write("bets.csv", rows)
+        summary = import_file(BetImporter(), path)
+
+        self.assertEqual((summary["imported"], summary["rejected"]), (1, 5))
+        self.assertEqual(summary["rejects"], os.path.join(self.directory.name, "bets.rejected.csv"))
+        with open(summary["rejects"]) as file:
+            errors = [row["error"] for row in csv.DictReader(file)]
+        self.assertEqual(
+            errors,
+            [
+                "Unknown username 'ghost'",
+                "Unknown driver_number 99",
+                "predicted_position must be between 1 and 20, got 21",
+                "Unknown race_id 999999",
+                "Duplicate of an earlier row in the file",
+            ],
+        )
+
+    def test_duplicates_across_chunks(self):
+        """Should reject rows that already exist, including ones from earlier chunks"""
+        Bet.objects.create(
+            user=self.fan, race=self.races[1], bet_type=self.bet_type, driver=self.drivers[1], predicted_position=1
+        )
+        rows = [self.bet(), self.bet(), self.bet(race_id=self.races[1].id)]
+        summary = import_file(BetImporter(), self.write("bets.ndjson", rows), chunk_size=1)
+
+        self.assertEqual((summary["imported"], summary["rejected"]), (1, 2))
+        self.assertEqual(Bet.objects.count(), 2)
+
+    def test_ndjson_rejects(self):
+        """Should reject bad JSON lines on their own and write NDJSON rejects"""
+        path = self.write("bets.ndjson.gz", [self.bet(), "{not json\n", self.bet(username="")])
+        summary = import_file(BetImporter(), path)
+
+        self.assertEqual((summary["imported"], summary["rejected"]), (1, 2))
+        self.assertTrue(summary["rejects"].endswith("bets.rejected.ndjson.gz"))
+        with gzip.open(summary["rejects"], "rt") as file:
+            rejected = [json.loads(line) for line in file]
+        self.assertEqual(rejected[0]["line"], "{not json")
+        self.assertEqual(rejected[1]["error"], "username is required")
+
+    def test_round_trip(self):
+        """Should import what export_data writes, matching races by round in another competition"""
+        for position, number in enumerate((1, 4), start=1):
+            Bet.objects.create(
+                user=self.fan,
+                race=self.races[1],
+                bet_type=self.bet_type,
+                driver=self.drivers[number],
+                predicted_position=position,
+            )
+        path = os.path.join(self.directory.name, "bets.csv.gz")
+        with open(path, "wb") as file:
+            file.writelines(Export("bets", compress=True).chunks())
+
+        copy = Competition.objects.create(
+            name="Copy", year=2024, start_date=timezone.now().date(), end_date=timezone.now().date(), created_by=self.admin
+        )
+        race = Race.objects.create(
+            competition=copy,
+            name="GP 2",
+            country="Bahrain",
+            round_number=2,
+            race_datetime=timezone.now(),
+            betting_deadline=timezone.now(),
+        )
+        summary = import_file(BetImporter(competition=copy.id), path)
+
+        self.assertEqual(summary["imported"], 2)
+        self.assertEqual(Bet.objects.filter(race=race).count(), 2)
+
+
+class ResultImportTest(ImportTestCase):
+    """Tests for importing race results"""
+
+    def test_import(self):
+        """Should create results matched by competition and round"""
+        rows = [
+            {"competition_id": self.competition.id, "round_number": 1, "driver_number": 4, "position": 1, "verified": "yes"},
+            {"competition_id": self.competition.id, "round_number": 1, "driver_number": 1, "position": 2, "grid_position": ""},
+            {"competition_id": self.competition.id, "round_number": 3, "driver_number": 1, "position": 1},
+        ]
+        summary = import_file(ResultImporter(), self.write("results.csv", rows))
+
+        self.assertEqual((summary["imported"], summary["rejected"]), (2, 1))
+        results = list(RaceResult.objects.filter(race=self.races[0]).order_by("position"))
+        self.assertEqual(
+            [(r.driver.driver_number, r.verified, r.grid_position) for r in results], [(4, True, None), (1, False, None)]
+        )
+
+    def test_rejects_path(self):
+        """Should put the rejects next to the input, keeping its extensions"""
+        self.assertEqual(rejects_path("/data/results.csv"), "/data/results.rejected.csv")
+        self.assertEqual(rejects_path("results.jsonl.gz"), "results.rejected.jsonl.gz")
+
+
+class ImportCommandTest(ImportTestCase):
+    """Tests for the import_bets and import_results commands"""
+
+    def test_import_bets(self):
+        """Should report throughput and rejects, and rebuild standings on request"""
+        rows = [
+            {
+                "username": "fan",
+                "race_id": self.races[0].id,
+                "driver_number": 1,
+                "predicted_position": 1,
+                "points_earned": 10,
+                "is_scored": "true",
+            },
+            {"username": "ghost", "race_id": self.races[0].id, "driver_number": 1, "predicted_position": 1},
+        ]
+        out = StringIO()
+        call_command("import_bets", self.write("bets.csv", rows), "--update-standings", stdout=out)
+
+        self.assertIn("Imported 1 of 2 rows", out.getvalue())
+        self.assertIn("rows/min", out.getvalue())
+        self.assertIn("Rejected 1 rows", out.getvalue())
+        self.assertEqual(CompetitionStanding.objects.get(competition=self.competition, user=self.fan).total_points, 10)
+
+    def test_import_results(self):
+        """Should import results"""
+        path = self.write("results.ndjson", [{"race_id": self.races[0].id, "driver_number": 1, "position": 1}])
+        call_command("import_results", path, stdout=StringIO())
+        self.assertEqual(RaceResult.objects.count(), 1)
+
+    def test_errors(self):
+        """Should fail for unknown formats, missing files and competitions"""
+        with self.assertRaises(CommandError):
+            call_command("import_bets", "bets.xlsx", stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("import_bets", os.path.join(self.directory.name, "missing.csv"), stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("import_results", self.write("r.csv", [{"a": 1}]), "--competition=999999", stdout=StringIO())
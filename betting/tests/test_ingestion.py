@@ -0,0 +1,311 @@
+"""
+Tests for OpenF1 season ingestion
+"""
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from betting.f1_stream import reduce_final_positions
+from betting.ingestion import (
+    fetch_season,
+    ingest_results,
+    merge_classification,
+    upsert_drivers,
+    upsert_races,
+    upsert_results,
+)
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult
+
+SESSIONS = [
+    {
+        "session_key": 9002,
+        "country_name": "Saudi Arabia",
+        "circuit_short_name": "Jeddah",
+        "date_start": "2023-03-19T17:00:00+00:00",
+        "date_end": "2023-03-19T19:00:00+00:00",
+    },
+    {
+        "session_key": 9001,
+        "country_name": "Bahrain",
+        "circuit_short_name": "Sakhir",
+        "date_start": "2023-03-05T15:00:00+00:00",
+        "date_end": "2023-03-05T17:00:00+00:00",
+    },
+]
+
+DRIVERS = [
+    {
+        "driver_number": 1,
+        "first_name": "Max",
+        "last_name": "Verstappen",
+        "team_name": "Red Bull Racing",
+        "country_code": "NED",
+    },
+    {"driver_number": 11, "first_name": "Sergio", "last_name": "Perez", "team_name": "Red Bull Racing", "country_code": "MEX"},
+]
+
+POSITIONS = [
+    {"date": "2023-03-05T15:00:00", "driver_number": 11, "position": 1},
+    {"date": "2023-03-05T15:00:00", "driver_number": 1, "position": 2},
+    {"date": "2023-03-05T16:30:00", "driver_number": 1, "position": 1},
+    {"date": "2023-03-05T16:30:00", "driver_number": 11, "position": 2},
+]
+
+SESSION_RESULT = [
+    {"position": None, "driver_number": 11, "dnf": True, "dns": False, "dsq": False},
+    {"position": 1, "driver_number": 1, "dnf": False, "dns": False, "dsq": False},
+]
+
+GRID = [{"position": 1, "driver_number": 11}, {"position": 2, "driver_number": 1}]
+
+
+class FakeF1API:
+    """Stand-in for F1API that records concurrency"""
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    calls = []
+
+    def _enter(self, name):
+        with self.lock:
+            FakeF1API.in_flight += 1
+            FakeF1API.peak = max(FakeF1API.peak, FakeF1API.in_flight)
+            FakeF1API.calls.append(name)
+        time.sleep(0.02)
+        with self.lock:
+            FakeF1API.in_flight -= 1
+
+    def get_race_schedule(self, year):
+        self._enter("sessions")
+        return SESSIONS
+
+    def get_drivers(self, year):
+        self._enter("drivers")
+        return DRIVERS
+
+    def get_session_result(self, session_key, completed=False):
+        self._enter(f"session_result:{session_key}:{completed}")
+        return SESSION_RESULT if str(session_key) == "9002" else []
+
+    def get_starting_grid(self, session_key, completed=False):
+        self._enter(f"starting_grid:{session_key}")
+        return GRID if str(session_key) == "9001" else []
+
+    def get_fastest_lap(self, session_key, completed=False):
+        self._enter(f"laps:{session_key}")
+        return {"driver_number": 11, "lap_number": 50, "lap_duration": 93.1}
+
+    def get_final_positions(self, session_key, completed=False):
+        self._enter(f"position:{session_key}:{completed}")
+        return reduce_final_positions(POSITIONS) if str(session_key) == "9001" else []
+
+
+class FetchSeasonTest(TestCase):
+    """Tests for the concurrent season fetch"""
+
+    def setUp(self):
+        FakeF1API.in_flight = 0
+        FakeF1API.peak = 0
+        FakeF1API.calls = []
+
+    def test_fetches_every_session(self):
+        """Should fetch results for every race session, ordered by start date"""
+        season = asyncio.run(fetch_season(2023, max_in_flight=4, api_factory=FakeF1API))
+
+        self.assertEqual([s["session_key"] for s in season["sessions"]], [9001, 9002])
+        self.assertEqual(season["drivers"], DRIVERS)
+        self.assertEqual([row["driver_number"] for row in season["results"][9001]], [1, 11])
+        self.assertIn("position:9001:True", FakeF1API.calls)
+        # Sessions with an official result don't need the position feed
+        self.assertNotIn("position:9002:True", FakeF1API.calls)
+
+    def test_in_flight_requests_are_bounded(self):
+        """No more than max_in_flight requests should run at once"""
+        asyncio.run(fetch_season(2023, max_in_flight=1, api_factory=FakeF1API))
+        self.assertEqual(FakeF1API.peak, 1)
+
+    def test_skip_results(self):
+        """include_results=False should not request positions"""
+        season = asyncio.run(fetch_season(2023, include_results=False, api_factory=FakeF1API))
+
+        self.assertEqual(season["results"], {})
+        self.assertEqual(sorted(FakeF1API.calls), ["drivers", "sessions"])
+
+
+class UpsertTest(TestCase):
+    """Tests for bulk upserts of ingested data"""
+
+    def setUp(self):
+        admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2023",
+            year=2023,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=admin,
+        )
+        self.sessions = sorted(SESSIONS, key=lambda s: s["date_start"])
+
+    def test_upsert_drivers_updates_existing(self):
+        """Existing drivers should be updated in place by driver_number"""
+        Driver.objects.create(driver_number=1, first_name="M", last_name="V", team="Old Team", nationality="Dutch")
+
+        upsert_drivers(DRIVERS)
+        upsert_drivers(DRIVERS)
+
+        self.assertEqual(Driver.objects.count(), 2)
+        max_v = Driver.objects.get(driver_number=1)
+        self.assertEqual(max_v.team, "Red Bull Racing")
+        self.assertEqual(max_v.api_driver_id, "1")
+        self.assertEqual(max_v.nationality, "Dutch")
+
+    def test_upsert_races_assigns_rounds(self):
+        """Races should be numbered by start date and linked to their session"""
+        upsert_races(self.competition, self.sessions)
+        upsert_races(self.competition, self.sessions)
+
+        races = list(Race.objects.filter(competition=self.competition).order_by("round_number"))
+        self.assertEqual(len(races), 2)
+        self.assertEqual(races[0].country, "Bahrain")
+        self.assertEqual(races[0].api_race_id, "9001")
+        self.assertEqual(races[0].status, "completed")
+        self.assertEqual(races[0].betting_deadline, races[0].race_datetime - timedelta(hours=2))
+
+    def test_upsert_races_keeps_status(self):
+        """Re-importing should keep existing races' status, only moving finished ones on to completed"""
+        first, second = upsert_races(self.competition, self.sessions)
+        Race.objects.filter(id=first.id).update(status="in_progress")
+        Race.objects.filter(id=second.id).update(status="cancelled")
+
+        upsert_races(self.competition, self.sessions)
+        statuses = Race.objects.filter(competition=self.competition).order_by("round_number").values_list("status", flat=True)
+        self.assertEqual(list(statuses), ["completed", "cancelled"])
+
+        # Sessions not finished as of `now` would insert as scheduled, but never move a race back
+        upsert_races(self.competition, self.sessions, now=first.race_datetime - timedelta(days=1))
+        self.assertEqual(list(statuses.all()), ["completed", "cancelled"])
+
+    def test_upsert_results_maps_classification(self):
+        """Results should be written from the classification and be idempotent"""
+        upsert_drivers(DRIVERS)
+        race = upsert_races(self.competition, self.sessions)[0]
+
+        classification = merge_classification(positions=reduce_final_positions(POSITIONS), grid=GRID)
+        upsert_results({race.id: classification})
+        upsert_results({race.id: classification})
+
+        results = RaceResult.objects.filter(race=race).order_by("position")
+        self.assertEqual([(r.driver.driver_number, r.grid_position) for r in results], [(1, 2), (11, 1)])
+        self.assertFalse(any(r.verified for r in results))
+
+    def test_upsert_results_removes_stale_rows(self):
+        """Drivers missing from a new classification should lose their old result"""
+        upsert_drivers(DRIVERS)
+        race = upsert_races(self.competition, self.sessions)[0]
+        upsert_results({race.id: merge_classification(positions=reduce_final_positions(POSITIONS))})
+
+        upsert_results({race.id: [{"driver_number": 1, "position": 1}]}, verify=True)
+
+        results = RaceResult.objects.filter(race=race)
+        self.assertEqual(results.count(), 1)
+        self.assertTrue(results.get().verified)
+
+    def test_upsert_results_prefers_api_driver_id(self):
+        """Drivers should resolve by api_driver_id before driver_number"""
+        Driver.objects.create(driver_number=3, first_name="Old", last_name="Number", team="T", api_driver_id="33")
+        Driver.objects.create(driver_number=33, first_name="Max", last_name="Verstappen", team="T", api_driver_id="1")
+        race = upsert_races(self.competition, self.sessions)[0]
+
+        upsert_results({race.id: [{"driver_number": 33, "position": 1}, {"driver_number": 1, "position": 2}]})
+
+        results = {r.position: r.driver.first_name for r in RaceResult.objects.filter(race=race)}
+        self.assertEqual(results, {1: "Old", 2: "Max"})
+
+
+class MergeClassificationTest(TestCase):
+    """Tests for merging OpenF1 classification sources"""
+
+    def test_session_result_with_dnf(self):
+        """Unclassified drivers should be placed last and flagged as DNF"""
+        rows = merge_classification(SESSION_RESULT, grid=GRID, fastest_lap={"driver_number": 11})
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "driver_number": 1,
+                    "position": 1,
+                    "did_not_finish": False,
+                    "dnf_reason": "",
+                    "grid_position": 2,
+                    "fastest_lap": False,
+                },
+                {
+                    "driver_number": 11,
+                    "position": 2,
+                    "did_not_finish": True,
+                    "dnf_reason": "DNF",
+                    "grid_position": 1,
+                    "fastest_lap": True,
+                },
+            ],
+        )
+
+    def test_falls_back_to_positions(self):
+        """Without a session result the streamed final positions should be used"""
+        rows = merge_classification([], positions=reduce_final_positions(POSITIONS))
+        self.assertEqual([(r["driver_number"], r["position"]) for r in rows], [(1, 1), (11, 2)])
+
+
+class IngestResultsTest(TestCase):
+    """Tests for the race-to-scoring ingestion pipeline"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="fan", email="fan@example.com", password="fan123")
+        self.competition = Competition.objects.create(
+            name="F1 2023",
+            year=2023,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.user,
+        )
+        upsert_drivers(DRIVERS)
+        self.race = upsert_races(self.competition, sorted(SESSIONS, key=lambda s: s["date_start"]))[1]
+        self.race.status = "in_progress"
+        self.race.save()
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        for position, number in ((1, 1), (2, 11)):
+            Bet.objects.create(
+                user=self.user,
+                race=self.race,
+                bet_type=bet_type,
+                driver=Driver.objects.get(driver_number=number),
+                predicted_position=position,
+            )
+
+    def test_ingest_and_score(self):
+        """Ingesting with score=True should verify results, score bets and update standings"""
+        summary = ingest_results([self.race], score=True, api_factory=FakeF1API)
+
+        self.assertEqual(summary, {"races": 1, "results": 2, "scored": 1})
+        self.assertTrue(all(RaceResult.objects.filter(race=self.race).values_list("verified", flat=True)))
+        self.assertEqual(sorted(Bet.objects.values_list("points_earned", flat=True)), [10, 10])
+
+        standing = CompetitionStanding.objects.get(competition=self.competition, user=self.user)
+        self.assertEqual((standing.total_points, standing.rank, standing.exact_predictions), (20, 1, 2))
+        self.race.refresh_from_db()
+        self.assertEqual(self.race.status, "completed")
+
+    def test_ingest_without_scoring(self):
+        """Without score=True bets should stay unscored"""
+        summary = ingest_results([self.race], api_factory=FakeF1API)
+
+        self.assertEqual((summary["races"], summary["scored"]), (1, 0))
+        self.assertFalse(Bet.objects.filter(is_scored=True).exists())
@@ -0,0 +1,150 @@
+"""
+Tests for the background job queue
+"""
+
+from concurrent.futures import Future
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from betting.jobs import claim_jobs, enqueue, requeue_stale, run_job
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Job, Race, RaceResult
+
+
+class InlineExecutor:
+    """ThreadPoolExecutor stand-in that runs each job on the calling thread"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(run_job(*args))
+        return future
+
+
+class JobQueueTestCase(TestCase):
+    """Shared fixtures: a race with one verified result and one bet"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.user = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            location="Sakhir",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=timezone.now() - timedelta(days=1),
+            betting_deadline=timezone.now() - timedelta(days=1, hours=2),
+            status="in_progress",
+        )
+        driver = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        RaceResult.objects.create(race=self.race, driver=driver, position=1, verified=True)
+        Bet.objects.create(user=self.user, race=self.race, bet_type=bet_type, driver=driver, predicted_position=1)
+
+
+class JobQueueTest(JobQueueTestCase):
+    """Tests for enqueueing, claiming and running jobs"""
+
+    def test_enqueue_rejects_unknown_kind(self):
+        """Should refuse job kinds without a handler"""
+        with self.assertRaises(ValueError):
+            enqueue("launch_rockets")
+
+    def test_run_score_race_job(self):
+        """Should score the race and store the handler's result"""
+        job = enqueue("score_race", race_id=self.race.id)
+
+        [claimed] = claim_jobs("test-worker")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, "running")
+
+        run_job(claimed)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.result, {"bets": 1, "points": 10, "standings": 1})
+        self.assertEqual(CompetitionStanding.objects.get(user=self.user).total_points, 10)
+
+    def test_claim_is_exclusive(self):
+        """Should never hand the same job to two workers"""
+        enqueue("update_standings", competition_id=self.competition.id)
+        enqueue("update_standings", competition_id=self.competition.id)
+
+        first = claim_jobs("worker-1", limit=1)
+        second = claim_jobs("worker-2", limit=5)
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].id, second[0].id)
+        self.assertEqual(claim_jobs("worker-3", limit=5), [])
+
+    def test_delayed_jobs_wait(self):
+        """Should not claim jobs before their run_after time"""
+        enqueue("update_standings", delay=timedelta(minutes=5), competition_id=self.competition.id)
+        self.assertEqual(claim_jobs("test-worker"), [])
+
+    def test_failed_job_is_retried_then_fails(self):
+        """Should requeue a failing job with backoff until max_attempts is reached"""
+        job = enqueue("score_race", max_attempts=2, race_id=999999)
+
+        [claimed] = claim_jobs("test-worker")
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("queued", 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("DoesNotExist", job.last_error)
+
+        [claimed] = claim_jobs("test-worker", now=job.run_after)
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+
+    def test_requeue_stale(self):
+        """Should put jobs locked by a dead worker back on the queue"""
+        job = enqueue("update_standings", competition_id=self.competition.id)
+        Job.objects.filter(id=job.id).update(status="running", locked_by="dead", locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ("queued", ""))
+
+
+class RunWorkerCommandTest(JobQueueTestCase):
+    """Tests for the run_worker management command"""
+
+    def test_burst_runs_all_jobs(self):
+        """Should run every queued job and exit when the queue is empty"""
+        enqueue("score_race", race_id=self.race.id)
+        enqueue("update_standings", competition_id=self.competition.id)
+        out = StringIO()
+
+        # Pool threads would open their own connections outside the test transaction; run jobs inline instead
+        with patch("betting.management.commands.run_worker.ThreadPoolExecutor", InlineExecutor):
+            call_command("run_worker", "--burst", "--concurrency", "2", stdout=out)
+
+        self.assertEqual(Job.objects.filter(status="succeeded").count(), 2)
+        self.assertIn("Worker stopped", out.getvalue())
+        self.race.refresh_from_db()
+        self.assertEqual(self.race.status, "completed")
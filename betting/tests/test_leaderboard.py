@@ -0,0 +1,90 @@
+"""
+Tests for the top-N, around-me and percentile leaderboard endpoints
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.models import Competition, CompetitionStanding
+
+
+class LeaderboardTest(TestCase):
+    """Tests for /api/standings/top/, /api/standings/around-me/ and /api/standings/percentile/"""
+
+    def setUp(self):
+        self.users = User.objects.bulk_create(
+            [User(username=f"user{n:02d}", email=f"user{n:02d}@example.com") for n in range(1, 31)]
+        )
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, status="active", start_date=today, end_date=today, created_by=self.users[0]
+        )
+        CompetitionStanding.objects.bulk_create(
+            CompetitionStanding(competition=self.competition, user=user, rank=rank, total_points=1000 - rank)
+            for rank, user in enumerate(self.users, start=1)
+        )
+        # Joined since the last standings update, so not ranked yet
+        self.newcomer = User.objects.create_user(username="newcomer", email="newcomer@example.com", password="pass12345")
+        CompetitionStanding.objects.create(competition=self.competition, user=self.newcomer)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[14])
+        self.params = {"competition": self.competition.id}
+
+    def ranks(self, rows):
+        return [row["rank"] for row in rows]
+
+    def test_top(self):
+        """Should return the top n by rank"""
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/standings/top/", {**self.params, "n": 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.ranks(response.data), [1, 2, 3])
+        self.assertEqual(response.data[0]["user"], self.users[0].id)
+        self.assertEqual(len(self.client.get("/api/standings/top/", {**self.params, "n": 1000}).data), 30)
+
+    def test_around_me(self):
+        """Should return the k places either side of the current user"""
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/standings/around-me/", {**self.params, "k": 2})
+
+        self.assertEqual(response.data["rank"], 15)
+        self.assertEqual(self.ranks(response.data["standings"]), [13, 14, 15, 16, 17])
+
+    def test_around_another_user(self):
+        """Should centre on ?user=, cut off at the top of the table"""
+        response = APIClient().get("/api/standings/around-me/", {**self.params, "user": self.users[0].id, "k": 2})
+        self.assertEqual(self.ranks(response.data["standings"]), [1, 2, 3])
+
+    def test_percentile(self):
+        """Should place the user among all ranked users"""
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/standings/percentile/", {**self.params, "user": self.users[2].id})
+
+        self.assertEqual(
+            response.data, {"user": self.users[2].id, "rank": 3, "total": 30, "top_percent": 10.0, "percentile": 90.0}
+        )
+
+    def test_unranked(self):
+        """Should return 404 for a user without a rank yet"""
+        client = APIClient()
+        client.force_authenticate(user=self.newcomer)
+        self.assertEqual(client.get("/api/standings/around-me/", self.params).status_code, 404)
+        self.assertEqual(client.get("/api/standings/percentile/", self.params).status_code, 404)
+
+    def test_clamped_parameters(self):
+        """Should clamp n to at least 1 and k to at least 0"""
+        for n in ("0", "-5"):
+            self.assertEqual(self.ranks(self.client.get("/api/standings/top/", {**self.params, "n": n}).data), [1], n)
+        response = self.client.get("/api/standings/around-me/", {**self.params, "k": -3})
+        self.assertEqual(self.ranks(response.data["standings"]), [15])
+
+    def test_invalid_parameters(self):
+        """Should require a competition and whole numbers, and a user when anonymous"""
+        self.assertEqual(self.client.get("/api/standings/top/").status_code, 400)
+        self.assertEqual(self.client.get("/api/standings/top/", {**self.params, "n": "ten"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/standings/around-me/", {**self.params, "user": "me"}).status_code, 400)
+        self.assertEqual(APIClient().get("/api/standings/percentile/", self.params).status_code, 401)
@@ -0,0 +1,124 @@
+"""
+Tests for private leagues
+"""
+
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from betting.leagues import create_league
+from betting.models import CompetitionStanding, League, LeagueMembership
+from betting.tests.test_head_to_head import HeadToHeadTestCase
+
+
+class LeagueTestCase(HeadToHeadTestCase):
+    """Shared fixtures: the scored history fixtures, with API clients for alice and bob"""
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def setUp(self):
+        super().setUp()
+        self.alice_client = self.client_for(self.alice)
+        self.bob_client = self.client_for(self.bob)
+
+
+class LeagueAPITest(LeagueTestCase):
+    """Tests for /api/leagues/"""
+
+    def test_create(self):
+        """Should create a league with an invite code and its creator as a member"""
+        response = self.alice_client.post("/api/leagues/", {"competition": self.competition.id, "name": "Office"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["invite_code"]), 8)
+        self.assertEqual(response.data["members_count"], 1)
+        self.assertEqual(response.data["created_by"], self.alice.id)
+        self.assertTrue(LeagueMembership.objects.filter(league_id=response.data["id"], user=self.alice).exists())
+
+    def test_create_in_closed_competition(self):
+        """Should not create leagues in competitions that are not open for joining"""
+        self.competition.status = "completed"
+        self.competition.save()
+
+        response = self.alice_client.post("/api/leagues/", {"competition": self.competition.id, "name": "Office"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_join(self):
+        """Should join by invite code, in any case, and only once"""
+        league = create_league(self.competition, self.alice, "Office")
+
+        response = self.bob_client.post("/api/leagues/join/", {"invite_code": league.invite_code.lower()})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["members_count"], 2)
+        response = self.bob_client.post("/api/leagues/join/", {"invite_code": league.invite_code})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.bob_client.post("/api/leagues/join/", {"invite_code": "NOPE"}).status_code, 404)
+
+    def test_join_adds_to_competition(self):
+        """Should make a new member a participant of the league's competition"""
+        league = create_league(self.competition, self.alice, "Office")
+        dave = User.objects.create_user(username="dave", email="dave@example.com", password="pass12345")
+
+        self.client_for(dave).post("/api/leagues/join/", {"invite_code": league.invite_code})
+
+        self.assertTrue(self.competition.participants.filter(id=dave.id).exists())
+        self.assertTrue(CompetitionStanding.objects.filter(competition=self.competition, user=dave).exists())
+
+    def test_only_members_see_a_league(self):
+        """Should list and show only the user's own leagues"""
+        league = create_league(self.competition, self.alice, "Office")
+        create_league(self.competition, self.bob, "Family")
+
+        response = self.alice_client.get("/api/leagues/")
+        self.assertEqual([row["name"] for row in response.data["results"]], ["Office"])
+        self.assertEqual(self.bob_client.get(f"/api/leagues/{league.id}/standings/").status_code, 404)
+
+    def test_leave(self):
+        """Should remove the user from the league"""
+        league = create_league(self.competition, self.alice, "Office")
+
+        response = self.alice_client.post(f"/api/leagues/{league.id}/leave/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(League.objects.get(id=league.id).members.exists())
+
+
+class LeagueStandingsTest(LeagueTestCase):
+    """Tests for /api/leagues/{id}/standings/"""
+
+    def setUp(self):
+        super().setUp()
+        self.league = create_league(self.competition, self.alice, "Office")
+        LeagueMembership.objects.create(league=self.league, user=self.bob)
+
+    def test_standings(self):
+        """Should rank only the members, on the shared race scores"""
+        response = self.alice_client.get(f"/api/leagues/{self.league.id}/standings/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["rank"], row["user"], row["total_points"], row["exact_predictions"]) for row in response.data],
+            [(1, self.bob.id, 40, 4), (2, self.alice.id, 30, 2)],
+        )
+
+    def test_start_round(self):
+        """Should only count rounds from the league's start round on"""
+        self.league.start_round = 3
+        self.league.save()
+        LeagueMembership.objects.create(league=self.league, user=self.carol)
+
+        response = self.alice_client.get(f"/api/leagues/{self.league.id}/standings/")
+
+        self.assertEqual(
+            [(row["user"], row["total_points"], row["races_predicted"]) for row in response.data],
+            [(self.bob.id, 20, 1), (self.alice.id, 0, 0), (self.carol.id, 0, 0)],
+        )
+
+    def test_query_count(self):
+        """Should read the league, its members and their summed race scores"""
+        with self.assertNumQueries(3):
+            self.alice_client.get(f"/api/leagues/{self.league.id}/standings/")
@@ -0,0 +1,167 @@
+"""
+Tests for the race lifecycle scheduler
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from betting.lifecycle import advance_races, complete_races, finished_races, next_due
+from betting.models import Competition, Driver, Job, Race, RaceResult
+
+
+@override_settings(BETTING_WINDOW_DAYS=7, RACE_RESULTS_AFTER_MINUTES=150, RACE_RESULTS_RETRY_MINUTES=15)
+class RaceLifecycleTestCase(TestCase):
+    """Shared fixtures for lifecycle tests"""
+
+    def setUp(self):
+        self.now = timezone.now().replace(microsecond=0)
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=self.now.date(),
+            end_date=self.now.date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.round = 0
+
+    def race(self, starts_in, status="scheduled", api_race_id=None):
+        self.round += 1
+        race_datetime = self.now + starts_in
+        return Race.objects.create(
+            competition=self.competition,
+            name=f"Race {self.round}",
+            location="Somewhere",
+            country="Somewhere",
+            round_number=self.round,
+            race_datetime=race_datetime,
+            betting_deadline=race_datetime - timedelta(hours=2),
+            status=status,
+            api_race_id=api_race_id,
+        )
+
+
+class AdvanceRacesTest(RaceLifecycleTestCase):
+    """Tests for advance_races"""
+
+    def test_transitions(self):
+        """Should open, close and start races whose deadlines have passed"""
+        far = self.race(timedelta(days=30))
+        soon = self.race(timedelta(days=3))
+        closing = self.race(timedelta(hours=1), status="betting_open")
+        starting = self.race(-timedelta(minutes=5), status="betting_closed")
+
+        moved = advance_races(self.now)
+
+        self.assertEqual(moved, {"betting_open": 1, "betting_closed": 1, "in_progress": 1})
+        statuses = dict(Race.objects.values_list("id", "status"))
+        self.assertEqual(statuses[far.id], "scheduled")
+        self.assertEqual(statuses[soon.id], "betting_open")
+        self.assertEqual(statuses[closing.id], "betting_closed")
+        self.assertEqual(statuses[starting.id], "in_progress")
+
+    def test_catches_up_missed_deadlines(self):
+        """Should move a scheduled race that missed every deadline straight to in progress"""
+        race = self.race(-timedelta(hours=1))
+
+        advance_races(self.now)
+
+        race.refresh_from_db()
+        self.assertEqual(race.status, "in_progress")
+
+    def test_leaves_finished_races_alone(self):
+        """Should not touch completed or cancelled races"""
+        completed = self.race(-timedelta(days=1), status="completed")
+        cancelled = self.race(-timedelta(days=1), status="cancelled")
+
+        self.assertEqual(sum(advance_races(self.now).values()), 0)
+        self.assertEqual(Race.objects.get(id=completed.id).status, "completed")
+        self.assertEqual(Race.objects.get(id=cancelled.id).status, "cancelled")
+
+
+class NextDueTest(RaceLifecycleTestCase):
+    """Tests for next_due and finished_races"""
+
+    def test_next_due_is_earliest_transition(self):
+        """Should return the earliest upcoming transition across all statuses"""
+        self.race(timedelta(days=30))  # opens 7 days before its deadline
+        closing = self.race(timedelta(days=3), status="betting_open")
+
+        self.assertEqual(next_due(self.now), closing.betting_deadline)
+
+    def test_next_due_for_results(self):
+        """Should be due when a race in progress is expected to have results"""
+        race = self.race(-timedelta(minutes=30), status="in_progress")
+
+        self.assertEqual(next_due(self.now), race.race_datetime + timedelta(minutes=150))
+
+    def test_nothing_due(self):
+        """Should return None without pending races"""
+        self.race(-timedelta(days=1), status="completed")
+        self.assertIsNone(next_due(self.now))
+
+    def test_finished_races(self):
+        """Should only return races in progress long enough, with an API race ID"""
+        finished = self.race(-timedelta(hours=3), status="in_progress", api_race_id="9001")
+        self.race(-timedelta(hours=1), status="in_progress", api_race_id="9002")
+        self.race(-timedelta(hours=3), status="in_progress")
+
+        self.assertEqual(finished_races(self.now), [finished])
+
+
+class RunSchedulerCommandTest(RaceLifecycleTestCase):
+    """Tests for the run_scheduler management command"""
+
+    def test_single_pass(self):
+        """Should advance races and ingest finished ones"""
+        finished = self.race(-timedelta(hours=3), status="in_progress", api_race_id="9001")
+        self.race(timedelta(hours=1), status="betting_open")
+        out = StringIO()
+
+        driver = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+
+        def ingest_results(races, score=False):
+            RaceResult.objects.create(race=races[0], driver=driver, position=1, verified=score)
+            return {"races": 1, "results": 1, "scored": int(score)}
+
+        with patch("betting.lifecycle.ingest_results", side_effect=ingest_results) as ingest:
+            call_command("run_scheduler", "--once", stdout=out)
+
+        self.assertEqual(ingest.call_args.args[0], [finished])
+        self.assertTrue(ingest.call_args.kwargs["score"])
+        self.assertIn("1 race(s) now betting closed", out.getvalue())
+        self.assertIn("Stored and scored results for Race 1", out.getvalue())
+
+    def test_retries_races_without_results(self):
+        """Should report races whose results are not available yet"""
+        self.race(-timedelta(hours=3), status="in_progress", api_race_id="9001")
+        out = StringIO()
+
+        with patch("betting.lifecycle.ingest_results", return_value={"races": 0, "results": 0, "scored": 0}):
+            call_command("run_scheduler", "--once", stdout=out)
+
+        self.assertIn("No results yet for Race 1", out.getvalue())
+
+    def test_enqueue(self):
+        """Should hand finished races to the job queue with --enqueue"""
+        finished = self.race(-timedelta(hours=3), status="in_progress", api_race_id="9001")
+
+        with patch("betting.lifecycle.ingest_results") as ingest:
+            call_command("run_scheduler", "--once", "--enqueue", stdout=StringIO())
+
+        ingest.assert_not_called()
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.payload), ("ingest_results", {"race_ids": [finished.id], "score": True}))
+
+    def test_complete_races_without_races(self):
+        """Should not call the API when nothing finished"""
+        with patch("betting.lifecycle.ingest_results") as ingest:
+            self.assertEqual(complete_races([]), set())
+        ingest.assert_not_called()
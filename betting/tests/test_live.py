@@ -0,0 +1,147 @@
+"""
+Tests for the live leaderboard stream
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+
+from betting.live import StandingsBroadcaster, diff_standings, notify_standings_changed
+from betting.models import Competition, CompetitionStanding
+
+
+def parse_events(body):
+    """Split an SSE body into (event, data) pairs"""
+    events = []
+    for message in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class LiveStandingsTestCase(TestCase):
+    """Shared fixtures for live leaderboard tests"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="pass12345")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com", password="pass12345")
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        CompetitionStanding.objects.create(competition=self.competition, user=self.alice, total_points=20, rank=1)
+        CompetitionStanding.objects.create(competition=self.competition, user=self.bob, total_points=10, rank=2)
+
+
+class DiffStandingsTest(TestCase):
+    """Tests for diff_standings"""
+
+    def test_reports_changed_and_removed_rows(self):
+        """Should return changed rows in rank order and removed user IDs"""
+        previous = {1: {"user": 1, "rank": 1}, 2: {"user": 2, "rank": 2}, 3: {"user": 3, "rank": 3}}
+        current = {1: {"user": 1, "rank": 2}, 2: {"user": 2, "rank": 1}, 4: {"user": 4, "rank": 3}}
+
+        diff = diff_standings(previous, current)
+
+        self.assertEqual([row["user"] for row in diff["changed"]], [2, 1, 4])
+        self.assertEqual(diff["removed"], [3])
+
+    def test_no_changes(self):
+        """Should return None when nothing changed"""
+        rows = {1: {"user": 1, "rank": 1}}
+        self.assertIsNone(diff_standings(rows, dict(rows)))
+
+
+class StandingsStreamViewTest(LiveStandingsTestCase):
+    """Tests for the standings stream endpoint"""
+
+    def test_wsgi_sends_single_snapshot(self):
+        """Should answer a WSGI request with one snapshot, then tell the client the stream has ended"""
+        response = self.client.get(f"/api/competitions/{self.competition.id}/standings/stream/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = response.content.decode()
+        self.assertTrue(body.startswith("retry: "))
+        [(event, rows), (end, data)] = parse_events(body)
+        self.assertEqual((event, end, data), ("snapshot", "end", None))
+        self.assertEqual([row["user_email"] for row in rows], ["alice@example.com", "bob@example.com"])
+
+    def test_unknown_competition(self):
+        """Should return 404 for a competition that does not exist"""
+        response = self.client.get("/api/competitions/999999/standings/stream/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_asgi_streams_snapshot(self):
+        """Should stream a snapshot first over ASGI"""
+        response = await AsyncClient().get(f"/api/competitions/{self.competition.id}/standings/stream/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = aiter(response.streaming_content)
+        body = (await anext(chunks)).decode() + (await anext(chunks)).decode()
+        await chunks.aclose()
+
+        [(event, rows)] = parse_events(body)
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(rows[0]["user_email"], "alice@example.com")
+
+
+class StandingsBroadcasterTest(LiveStandingsTestCase):
+    """Tests for StandingsBroadcaster fan-out"""
+
+    async def test_subscribers_share_one_read(self):
+        """Should load the standings once for all subscribers and push the same diff to each"""
+        broadcaster = StandingsBroadcaster.for_competition(self.competition.id)
+        broadcaster.interval = 60
+        try:
+            subscriptions = [await broadcaster.subscribe() for _ in range(5)]
+            self.assertIs(StandingsBroadcaster.for_competition(self.competition.id), broadcaster)
+            self.assertEqual(broadcaster.reads, 1)
+            self.assertEqual(subscriptions[0][1][0]["user_email"], "alice@example.com")
+
+            await sync_to_async(CompetitionStanding.objects.filter(competition=self.competition, user=self.bob).update)(
+                total_points=30, rank=1, updated_at=timezone.now()
+            )
+            await sync_to_async(CompetitionStanding.objects.filter(competition=self.competition, user=self.alice).update)(
+                rank=2, updated_at=timezone.now()
+            )
+            await sync_to_async(notify_standings_changed)(self.competition.id)
+
+            for queue, _ in subscriptions:
+                event, diff = await asyncio.wait_for(queue.get(), timeout=5)
+                self.assertEqual(event, "diff")
+                self.assertEqual([row["user"] for row in diff["changed"]], [self.bob.id, self.alice.id])
+            self.assertEqual(broadcaster.reads, 2)
+        finally:
+            for queue, _ in subscriptions:
+                broadcaster.unsubscribe(queue)
+
+        self.assertIsNone(broadcaster.task)
+        fresh = StandingsBroadcaster.for_competition(self.competition.id)
+        self.assertIsNot(fresh, broadcaster)
+        fresh.stop()
+
+    async def test_unchanged_standings_are_not_reloaded(self):
+        """Should only check the change marker when nothing moved"""
+        broadcaster = StandingsBroadcaster.for_competition(self.competition.id)
+        broadcaster.interval = 60
+        queue, _ = await broadcaster.subscribe()
+        try:
+            await broadcaster.refresh()
+            await broadcaster.refresh()
+            self.assertEqual(broadcaster.reads, 1)
+            self.assertTrue(queue.empty())
+        finally:
+            broadcaster.unsubscribe(queue)
@@ -43,6 +43,45 @@ class UserProfileModelTest(TestCase):
         self.assertEqual(profile.display_name, "")
 
 
+class UserProfileSyncTest(TestCase):
+    """Test the User post_save profile sync"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="racer", email="racer@example.com", password="testpass123")
+
+    def test_profile_created_once(self):
+        """Should create the profile with the user and not save it again"""
+        with self.assertNumQueries(2):
+            user = User.objects.create(username="new", email="new@example.com")
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_login_does_not_touch_profile(self):
+        """Should neither load nor write the profile when only last_login changes"""
+        user = User.objects.get(id=self.user.id)
+        user.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_unchanged_profile_not_written(self):
+        """Should skip the write when a loaded profile has not changed"""
+        user = User.objects.select_related("profile").get(id=self.user.id)
+        updated_at = user.profile.updated_at
+        with self.assertNumQueries(1):
+            user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).updated_at, updated_at)
+
+    def test_changed_fields_saved(self):
+        """Should save only the fields edited through user.profile"""
+        user = User.objects.select_related("profile").get(id=self.user.id)
+        user.profile.display_name = "Racer X"
+        self.assertEqual(user.profile.changed_fields(), ["display_name"])
+
+        with self.assertNumQueries(2):
+            user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).display_name, "Racer X")
+        self.assertEqual(user.profile.changed_fields(), [])
+
+
 class CompetitionModelTest(TestCase):
     """Test Competition model"""
 
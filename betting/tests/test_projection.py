@@ -0,0 +1,158 @@
+"""
+Tests for the Monte Carlo championship projection
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.jobs import claim_jobs, run_job
+from betting.models import Bet, BetType, Competition, CompetitionProjection, CompetitionStanding, Driver, Job, Race, RaceResult
+from betting.projection import project, simulate, update_projection
+from betting.scoring import score_race
+
+
+class SimulateTest(SimpleTestCase):
+    """Tests for the simulation engines"""
+
+    def check_coin_flip(self, simulations, places):
+        # Level on points, one race left, each scores 0 or 10: the leader wins unless only the other scores
+        wins, podiums, points = simulate([50, 50], [[0, 10], [0, 10]], 1, simulations, seed=1)
+
+        self.assertEqual(sum(wins), simulations)
+        self.assertAlmostEqual(wins[0] / simulations, 0.75, places=places)
+        self.assertEqual(podiums, [simulations, simulations])
+        self.assertAlmostEqual(points[1], 55, delta=1)
+
+    def test_numpy(self):
+        """Should estimate probabilities with NumPy"""
+        self.check_coin_flip(20000, 2)
+
+    def test_without_numpy(self):
+        """Should make the same estimates in pure Python"""
+        with patch("betting.projection.np", None):
+            self.check_coin_flip(4000, 1)
+
+    def test_decided(self):
+        """Should be certain when no races remain, with ties going to the higher-ranked user"""
+        wins, podiums, points = simulate([30, 20, 20, 10], [[5]] * 4, 0, 100)
+
+        self.assertEqual(wins, [100, 0, 0, 0])
+        self.assertEqual(podiums, [100, 100, 100, 0])
+        self.assertEqual(points, [30, 20, 20, 10])
+
+    def test_shared_history(self):
+        """Should draw from a history shared by several users"""
+        everyone = [0, 30]
+        wins, podiums, points = simulate([0, 0, 0, 0, 0], [everyone] * 4 + [[100]], 2, 1000, seed=3)
+        self.assertEqual(wins[4], 1000)
+        self.assertTrue(all(0 <= total <= 60 for total in points[:4]))
+
+    def test_long_history(self):
+        """Should reach every entry of a history longer than 65536 without the index wrapping"""
+        # Entries past 65536 are the only ones worth points, so a 16-bit index would never draw them
+        history = [0] * 70000 + [1] * 30000
+        wins, podiums, points = simulate([0], [history], 1, 20000, seed=5)
+        self.assertAlmostEqual(points[0], 0.3, delta=0.02)
+
+
+class ProjectionAPITest(TestCase):
+    """Tests for /api/competitions/{id}/projection/"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=name, email=f"{name}@example.com", password="pass12345")
+            for name in ("alice", "bob", "carol")
+        ]
+        today = timezone.now().date()
+        self.competition = Competition.objects.create(
+            name="F1 2025", year=2025, status="active", start_date=today, end_date=today, created_by=self.users[0]
+        )
+        now = timezone.now()
+        self.races = [
+            Race.objects.create(
+                competition=self.competition,
+                name=f"GP {n}",
+                country="Bahrain",
+                round_number=n,
+                race_datetime=now + timedelta(days=n - 2),
+                betting_deadline=now + timedelta(days=n - 2, hours=-2),
+            )
+            for n in (1, 2, 3)
+        ]
+        driver = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        RaceResult.objects.create(race=self.races[0], driver=driver, position=1, verified=True)
+        for user in self.users[:2]:
+            Bet.objects.create(user=user, race=self.races[0], bet_type=bet_type, driver=driver, predicted_position=1)
+        CompetitionStanding.objects.create(competition=self.competition, user=self.users[2])
+        with self.captureOnCommitCallbacks(execute=True):
+            score_race(self.races[0])
+        self.url = f"/api/competitions/{self.competition.id}/projection/"
+
+    def run_jobs(self):
+        for job in claim_jobs("test", limit=10):
+            self.assertEqual(run_job(job).status, "succeeded", job.last_error)
+
+    def test_projection(self):
+        """Should return every participant's odds in standings order, as simulated by the worker"""
+        self.run_jobs()
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["remaining_races"], 2)
+        self.assertFalse(response.data["stale"])
+        users = response.data["users"]
+        self.assertEqual([user["user"] for user in users], [u.id for u in self.users])
+        self.assertEqual(
+            set(users[0]),
+            {"user", "user_display_name", "rank", "total_points", "projected_points", "win_probability", "podium_probability"},
+        )
+        self.assertAlmostEqual(sum(user["win_probability"] for user in users), 1, places=3)
+        # carol has no scored bets, so draws from everyone's scores (always 10 here): she can only tie
+        self.assertEqual(users[2]["win_probability"], 0)
+        self.assertEqual(users[2]["projected_points"], 20)
+
+    def test_scoring_queues_projection(self):
+        """Should queue one projection job per competition once scoring commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            score_race(self.races[1])
+
+        jobs = Job.objects.filter(kind="update_projection")
+        self.assertEqual(list(jobs.values_list("payload", flat=True)), [{"competition_id": self.competition.id}])
+
+    def test_pending(self):
+        """Should answer 202 without simulating until the first projection is stored"""
+        client = APIClient()
+        with patch("betting.projection.project") as project_mock:
+            self.assertEqual(client.get(self.url).status_code, 202)
+        project_mock.assert_not_called()
+        self.assertEqual(Job.objects.filter(kind="update_projection", status="queued").count(), 1)
+
+    def test_stale_until_simulated(self):
+        """Should serve the stored projection flagged stale once standings move, and queue a refresh"""
+        update_projection(self.competition.id)
+        Job.objects.all().delete()
+        client = APIClient()
+        self.assertFalse(client.get(self.url).data["stale"])
+
+        # Scored without its commit hook, as if the worker has not picked the job up yet
+        score_race(self.races[1])
+        with patch("betting.projection.project") as project_mock:
+            response = client.get(self.url)
+        project_mock.assert_not_called()
+        self.assertTrue(response.data["stale"])
+        self.assertEqual(Job.objects.filter(kind="update_projection").count(), 1)
+
+        self.run_jobs()
+        self.assertFalse(client.get(self.url).data["stale"])
+        self.assertEqual(CompetitionProjection.objects.count(), 1)
+
+    def test_query_count(self):
+        """Should read standings, remaining races and score histories in three queries"""
+        with self.assertNumQueries(3):
+            project(self.competition, simulations=100)
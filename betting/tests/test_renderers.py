@@ -0,0 +1,85 @@
+"""
+Tests for the orjson renderer and parser
+"""
+
+import uuid
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from betting.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    "name": "Sergio Pérez",
+    "quote": 'line\u2028separator\u2029paragraph "quoted" \\ \n\t\x01',
+    "created_at": datetime(2025, 3, 2, 15, 4, 5, 123456, tzinfo=dt_timezone.utc),
+    "local": datetime(2025, 3, 2, 15, 4, 5),
+    "offset": datetime(2025, 3, 2, 15, 4, 5, tzinfo=dt_timezone(timedelta(hours=3))),
+    "day": date(2025, 3, 2),
+    "lap": time(1, 23, 45, 678000),
+    "gap": timedelta(seconds=1.234),
+    "points": Decimal("12.50"),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Top 10"),
+    "ranks": {1: "Max", 2: "Lando"},
+    "rows": [ReturnDict({"rank": 1, "total": 25, "scored": True, "note": None}, serializer=None), (1, 2.5)],
+}
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """The orjson renderer should produce exactly DRF's JSONRenderer output"""
+
+    def test_matches_drf_output(self):
+        """Should render the same bytes for every type DRF supports"""
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_escapes_line_separators(self):
+        """Should escape U+2028 and U+2029 so the output is valid JavaScript"""
+        rendered = FastJSONRenderer().render({"text": "a\u2028b\u2029c"})
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_indented_output_uses_drf(self):
+        """Should fall back to DRF for indented output"""
+        media_type = "application/json; indent=4"
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD, media_type), JSONRenderer().render(PAYLOAD, media_type))
+
+    def test_empty(self):
+        """Should render None as an empty body"""
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_without_orjson(self):
+        """Should behave like DRF's renderer when orjson is not installed"""
+        with patch("betting.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+
+class FastJSONParserTest(SimpleTestCase):
+    """The orjson parser should accept and reject what DRF's JSONParser does"""
+
+    def parse(self, parser, body, encoding="utf-8"):
+        return parser.parse(BytesIO(body), "application/json", {"encoding": encoding})
+
+    def test_matches_drf(self):
+        """Should parse to the same data"""
+        body = '{"race": 1, "predictions": [{"driver": 44, "position": 1}], "name": "Pérez", "ratio": 0.5}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_json(self):
+        """Should raise a ParseError"""
+        for body in (b"{", b'{"a": NaN}', b"\xff"):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_other_encodings_use_drf(self):
+        """Should decode non-UTF-8 bodies with DRF's parser"""
+        body = '{"name": "Pérez"}'.encode("utf-16")
+        self.assertEqual(self.parse(FastJSONParser(), body, "utf-16"), {"name": "Pérez"})
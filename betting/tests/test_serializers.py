@@ -0,0 +1,143 @@
+"""
+Tests for sparse fieldsets and the values()-based serializers
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from betting.models import Bet, BetType, Competition, CompetitionStanding, Driver, Race
+from betting.serializers import (
+    BetSerializer,
+    BetValuesSerializer,
+    CompetitionStandingSerializer,
+    CompetitionStandingValuesSerializer,
+    RaceSerializer,
+    RaceValuesSerializer,
+)
+
+
+class SerializerTestCase(TestCase):
+    """Shared fixtures: an open and a closed race with bets and standings"""
+
+    def setUp(self):
+        self.api = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", password="admin123")
+        self.user = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        self.user.profile.display_name = "Fan"
+        self.user.profile.save()
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        now = timezone.now()
+        self.closed_race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            location="Sakhir",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=now - timedelta(days=7),
+            betting_deadline=now - timedelta(days=7, hours=2),
+            status="completed",
+        )
+        self.open_race = Race.objects.create(
+            competition=self.competition,
+            name="Saudi GP",
+            location="Jeddah",
+            country="Saudi Arabia",
+            round_number=2,
+            race_datetime=now + timedelta(days=7),
+            betting_deadline=now + timedelta(days=7, hours=-2),
+        )
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        drivers = [
+            Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull"),
+            Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren"),
+        ]
+        for race in (self.closed_race, self.open_race):
+            for position, driver in enumerate(drivers, start=1):
+                Bet.objects.create(user=self.user, race=race, bet_type=bet_type, driver=driver, predicted_position=position)
+        for rank, user in enumerate((self.user, self.admin), start=1):
+            CompetitionStanding.objects.create(competition=self.competition, user=user, total_points=20 - rank, rank=rank)
+
+
+class ValuesSerializerTest(SerializerTestCase):
+    """Values serializers should produce exactly what their ModelSerializers produce"""
+
+    def assert_same_output(self, values_serializer, serializer, queryset):
+        self.assertEqual(values_serializer(queryset).data, serializer(queryset, many=True).data)
+
+    def test_bets(self):
+        """Should match BetSerializer, including the computed driver name"""
+        self.assert_same_output(BetValuesSerializer, BetSerializer, Bet.objects.order_by("id"))
+
+    def test_races(self):
+        """Should match RaceSerializer, including is_betting_open for open and closed races"""
+        self.assert_same_output(RaceValuesSerializer, RaceSerializer, Race.objects.order_by("id"))
+        self.assertEqual([race["is_betting_open"] for race in RaceValuesSerializer(Race.objects.all()).data], [False, True])
+
+    def test_standings(self):
+        """Should match CompetitionStandingSerializer"""
+        self.assert_same_output(
+            CompetitionStandingValuesSerializer, CompetitionStandingSerializer, CompetitionStanding.objects.order_by("rank")
+        )
+
+    def test_single_query(self):
+        """Should fetch every related value in one query"""
+        with self.assertNumQueries(1):
+            BetValuesSerializer(Bet.objects.all()).data
+
+    def test_sparse_fields(self):
+        """Should select only the requested fields"""
+        request = RequestFactory().get("/", {"fields": "id,driver_name"})
+        with self.assertNumQueries(1):
+            data = BetValuesSerializer(Bet.objects.order_by("id"), request).data
+
+        self.assertEqual(data[0], {"id": Bet.objects.order_by("id").first().id, "driver_name": "Max Verstappen"})
+
+
+class SparseFieldsetTest(SerializerTestCase):
+    """Tests for ?fields= on the API"""
+
+    def test_my_bets(self):
+        """Should return only the requested bet fields"""
+        self.api.force_authenticate(self.user)
+        response = self.api.get("/api/bets/my_bets/", {"fields": "race,predicted_position"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({tuple(bet) for bet in response.data}, {("race", "predicted_position")})
+
+    def test_paginated_races(self):
+        """Should apply to ModelSerializer-backed list endpoints"""
+        response = self.api.get("/api/races/", {"fields": "id,name,unknown"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0], {"id": self.closed_race.id, "name": "Bahrain GP"})
+
+    def test_async_standings(self):
+        """Should apply to the async endpoints"""
+        response = self.client.get(
+            f"/api/async/competitions/{self.competition.id}/standings/", {"fields": "rank,user_display_name"}
+        )
+
+        self.assertEqual(response.json(), [{"rank": 1, "user_display_name": "Fan"}, {"rank": 2, "user_display_name": ""}])
+
+    def test_ignored_on_writes(self):
+        """Should not drop writable fields from a POST"""
+        self.api.force_authenticate(self.user)
+        bet = Bet.objects.filter(race=self.open_race).first()
+        response = self.api.post(
+            "/api/bets/?fields=id",
+            {"race": self.open_race.id, "bet_type": bet.bet_type_id, "driver": bet.driver_id, "predicted_position": 3},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("predicted_position", response.data)
@@ -0,0 +1,90 @@
+"""
+Tests for the admin dashboard statistics
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from betting.models import Bet, BetType, Competition, Driver, Race, RaceResult
+from betting.scoring import score_race
+from betting.stats import collect_statistics, estimated_count, get_statistics
+
+
+class AdminStatisticsTest(TestCase):
+    """Tests for collect_statistics and its cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="admin123")
+        self.fan = User.objects.create_user(username="fan", email="fan@example.com", password="pass12345")
+        User.objects.create_user(username="idle", email="idle@example.com", password="pass12345", is_active=False)
+        self.competition = Competition.objects.create(
+            name="F1 2025",
+            year=2025,
+            status="active",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=300),
+            created_by=self.admin,
+        )
+        self.race = Race.objects.create(
+            competition=self.competition,
+            name="Bahrain GP",
+            location="Sakhir",
+            country="Bahrain",
+            round_number=1,
+            race_datetime=timezone.now() + timedelta(days=1),
+            betting_deadline=timezone.now() + timedelta(hours=22),
+        )
+        self.max = Driver.objects.create(first_name="Max", last_name="Verstappen", driver_number=1, team="Red Bull")
+        self.lando = Driver.objects.create(first_name="Lando", last_name="Norris", driver_number=4, team="McLaren")
+        bet_type = BetType.objects.create(name="Top 10", code="top10")
+        for position, driver in enumerate([self.max, self.lando], start=1):
+            Bet.objects.create(user=self.fan, race=self.race, bet_type=bet_type, driver=driver, predicted_position=position)
+        RaceResult.objects.create(race=self.race, driver=self.max, position=1, verified=True)
+        RaceResult.objects.create(race=self.race, driver=self.lando, position=2)
+
+    def test_collect_statistics(self):
+        """Should count every table with conditional aggregates"""
+        stats = collect_statistics()
+
+        self.assertEqual(stats["users"], {"total": 3, "active": 2, "superusers": 1, "with_bets": 1, "groups": 0})
+        self.assertEqual(stats["competitions"], {"total": 1, "active": 1})
+        self.assertEqual(stats["races"], {"total": 1, "completed": 0, "upcoming": 1, "pending": 1})
+        self.assertEqual(stats["drivers"], {"total": 2, "active": 2, "inactive": 0})
+        self.assertEqual(stats["bets"], {"total": 2, "scored": 0, "unscored": 2})
+        self.assertEqual(stats["results"], {"total": 2, "verified": 1, "unverified": 1})
+        self.assertEqual(stats["bet_types"], {"total": 1, "active": 1})
+        self.assertEqual(stats["standings"], {"total": 0})
+
+    def test_query_count(self):
+        """Should need one query per table, and only the standings version check once cached"""
+        with self.assertNumQueries(11):
+            get_statistics()
+        with self.assertNumQueries(1):
+            get_statistics()
+
+    def test_scoring_invalidates_cache(self):
+        """Should recompute the statistics after a race is scored, with no invalidation hook needed"""
+        self.assertEqual(get_statistics()["bets"]["scored"], 0)
+
+        # Commit hooks are not run: scoring in another process could not clear this one's cache
+        score_race(self.race)
+
+        self.assertEqual(get_statistics()["bets"]["scored"], 2)
+        self.assertEqual(get_statistics()["races"]["completed"], 1)
+
+    def test_estimated_count_small_table(self):
+        """Should fall back to an exact count"""
+        self.assertEqual(estimated_count(Bet), 2)
+
+    def test_admin_index(self):
+        """Should render the dashboard with the statistics"""
+        self.client.force_login(self.admin)
+        response = self.client.get("/admin/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["statistics"]["bets"]["total"], 2)
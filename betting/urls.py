@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import async_views, views
 
 # Create a router and register viewsets
 router = DefaultRouter()
@@ -11,10 +11,19 @@ router.register(r"drivers", views.DriverViewSet, basename="driver")
 router.register(r"bet-types", views.BetTypeViewSet, basename="bettype")
 router.register(r"bets", views.BetViewSet, basename="bet")
 router.register(r"profiles", views.UserProfileViewSet, basename="userprofile")
+router.register(r"leagues", views.LeagueViewSet, basename="league")
 router.register(r"standings", views.CompetitionStandingViewSet, basename="standing")
 router.register(r"race-results", views.RaceResultViewSet, basename="raceresult")
 
 urlpatterns = [
     path("health/", views.health_check, name="health_check"),
+    path("api/bootstrap/", views.bootstrap_view, name="bootstrap"),
+    path("api/competitions/<int:competition_id>/standings/stream/", views.standings_stream, name="standings_stream"),
+    path("api/export/<str:kind>/", views.export_view, name="export"),
+    # Async (ASGI-native) versions of the hottest read endpoints
+    path("api/async/drivers/", async_views.drivers, name="async_drivers"),
+    path("api/async/races/upcoming/", async_views.upcoming_races, name="async_upcoming_races"),
+    path("api/async/races/<int:race_id>/results/", async_views.race_results, name="async_race_results"),
+    path("api/async/competitions/<int:competition_id>/standings/", async_views.standings, name="async_standings"),
     path("api/", include(router.urls)),
 ]
@@ -1,17 +1,47 @@
-from django.http import JsonResponse
+import re
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import permissions, status, viewsets
-from rest_framework.decorators import action
+from django.utils.cache import patch_vary_headers
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 
-from .models import Bet, BetType, Competition, CompetitionStanding, Driver, Race, RaceResult, UserProfile
+from . import leaderboard
+from .bootstrap import bootstrap
+from .crowd import crowd
+from .exports import CONTENT_TYPES, EXPORTS, Export
+from .head_to_head import head_to_head
+from .history import progression
+from .leagues import create_league, join_league, league_standings
+from .live import format_event, load_standings, stream_standings
+from .models import (
+    Bet,
+    BetType,
+    Competition,
+    CompetitionStanding,
+    Driver,
+    League,
+    LeagueMembership,
+    Race,
+    RaceResult,
+    UserProfile,
+)
+from .projection import get_projection
+from .renderers import CSVRenderer, NDJSONRenderer
 from .serializers import (
     BetCreateSerializer,
     BetSerializer,
     BetTypeSerializer,
+    BetValuesSerializer,
     CompetitionSerializer,
     CompetitionStandingSerializer,
+    CompetitionStandingValuesSerializer,
     DriverSerializer,
+    LeagueSerializer,
     RaceDetailSerializer,
     RaceResultSerializer,
     RaceSerializer,
@@ -27,6 +57,73 @@ def health_check(request):
     return JsonResponse({"status": "healthy", "service": "f1betting"})
 
 
+@api_view(["GET"])
+def bootstrap_view(request):
+    """
+    Initial data for the SPA in one round trip
+    Competitions, upcoming races, drivers, bet types, and the user's profile and upcoming bets.
+    """
+    return Response(bootstrap(request.user))
+
+
+async def standings_stream(request, competition_id):
+    """
+    Live leaderboard for a competition as Server-Sent Events
+    Sends a "snapshot" event with the full standings, then a "diff" event whenever they change.
+    Under WSGI there is no event loop to hold the connection open, so a single snapshot is sent,
+    followed by an "end" event telling the client not to reconnect.
+    """
+    if not await Competition.objects.filter(id=competition_id).aexists():
+        raise Http404("Competition not found")
+
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(stream_standings(competition_id), content_type="text/event-stream")
+    else:
+        rows = sorted((await load_standings(competition_id)).values(), key=lambda row: row["rank"])
+        body = f"retry: {settings.LEADERBOARD_STREAM_RETRY_MS}\n" + format_event("snapshot", rows) + format_event("end", None)
+        response = HttpResponse(body, content_type="text/event-stream")
+
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+@renderer_classes([CSVRenderer, NDJSONRenderer])
+def export_view(request, kind):
+    """
+    Stream bets, results or standings as CSV, or NDJSON with ?format=ndjson (admins only)
+    Filter with ?competition= and ?race=. Compressed on the fly for clients that accept gzip.
+    """
+    if kind not in EXPORTS:
+        raise Http404("Unknown export")
+
+    try:
+        filters = {name: int(request.query_params[name]) for name in ("competition", "race") if name in request.query_params}
+        export = Export(
+            kind,
+            request.accepted_renderer.format,
+            compress=bool(ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))),
+            **filters,
+        )
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # ASGI buffers sync iterators whole before sending, so stream from the async one there
+    chunks = export.achunks() if isinstance(request._request, ASGIRequest) else export.chunks()
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[export.format])
+    response["Content-Disposition"] = f'attachment; filename="{export.filename}"'
+    if export.compress:
+        response["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
 class IsAuthenticatedOrReadOnly(permissions.BasePermission):
     """Allow read access to all, write access only to authenticated users"""
 
@@ -52,9 +149,10 @@ class CompetitionViewSet(viewsets.ReadOnlyModelViewSet):
         Override queryset to include all competitions for detail views,
         but filter to published/active/completed for list views.
         """
-        queryset = Competition.objects.select_related("created_by", "created_by__profile").prefetch_related(
-            "participants", "races"
-        )
+        queryset = Competition.objects.select_related("created_by", "created_by__profile")
+        # Extra actions (standings, head-to-head, ...) only need the competition itself
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("participants", "races")
 
         # Only filter by status for list views
         if self.action == "list":
@@ -71,8 +169,57 @@ class CompetitionViewSet(viewsets.ReadOnlyModelViewSet):
             .select_related("user", "user__profile")
             .order_by("rank")
         )
-        serializer = CompetitionStandingSerializer(standings, many=True)
-        return Response(serializer.data)
+        return Response(CompetitionStandingValuesSerializer(standings, request).data)
+
+    @action(detail=True, methods=["get"])
+    def progression(self, request, pk=None):
+        """
+        Rank and points after each round, as columnar arrays for charts
+        For ?users=1,2,3, or the current top ?top=N (default 10, 1 to 100).
+        """
+        competition = self.get_object()
+        try:
+            user_ids = (
+                [int(user_id) for user_id in request.query_params["users"].split(",")]
+                if "users" in request.query_params
+                else None
+            )
+            top = max(1, min(int(request.query_params.get("top", 10)), 100))
+        except ValueError:
+            return Response({"error": "users and top must be whole numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(progression(competition, user_ids, top))
+
+    @action(detail=True, methods=["get"], url_path="head-to-head")
+    def head_to_head(self, request, pk=None):
+        """
+        Two users' points, exact and partial picks and picks race by race, side by side
+        For ?users=A,B; ?picks=false leaves the picks out.
+        """
+        competition = self.get_object()
+        try:
+            user_ids = [int(user_id) for user_id in request.query_params.get("users", "").split(",")]
+        except ValueError:
+            user_ids = []
+        if len(user_ids) != 2 or user_ids[0] == user_ids[1]:
+            return Response({"error": "users must be two different user IDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        picks = request.query_params.get("picks", "true").lower() not in ("0", "false")
+        comparison = head_to_head(competition, user_ids, picks)
+        if comparison is None:
+            return Response({"error": "Both users must be in the competition"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(comparison)
+
+    @action(detail=True, methods=["get"])
+    def projection(self, request, pk=None):
+        """
+        Each participant's chance of winning and of finishing on the podium
+        From Monte Carlo simulations of the remaining races, run by the job worker after each scoring.
+        Returns 202 until the first projection has been simulated.
+        """
+        projection = get_projection(self.get_object())
+        if projection is None:
+            return Response({"detail": "The projection is being simulated"}, status=status.HTTP_202_ACCEPTED)
+        return Response(projection)
 
     @action(detail=True, methods=["get"])
     def races(self, request, pk=None):
@@ -117,9 +264,10 @@ class RaceViewSet(viewsets.ReadOnlyModelViewSet):
         return RaceSerializer
 
     def get_queryset(self):
-        queryset = Race.objects.select_related(
-            "competition", "competition__created_by", "competition__created_by__profile"
-        ).prefetch_related("results__driver", "bets__driver", "bets__bet_type")
+        queryset = Race.objects.select_related("competition", "competition__created_by", "competition__created_by__profile")
+        # Extra actions only need the race itself, not every bet on it
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("results__driver", "bets__driver", "bets__bet_type")
 
         # Filter by competition
         competition_id = self.request.query_params.get("competition", None)
@@ -146,6 +294,21 @@ class RaceViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = RaceResultSerializer(results, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def crowd(self, request, pk=None):
+        """
+        What everyone picked: driver distribution per position, consensus order and contrarian picks
+        For ?bet_type=<code> (default top10). Shown once betting has closed.
+        """
+        race = self.get_object()
+        if race.is_betting_open():
+            return Response({"error": "Crowd picks are shown once betting closes"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            bet_type = BetType.objects.get(code=request.query_params.get("bet_type", "top10"))
+        except BetType.DoesNotExist:
+            return Response({"error": "Unknown bet type"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(crowd(race, bet_type))
+
     @action(detail=True, methods=["get"])
     def my_bet(self, request, pk=None):
         """Get current user's bet for this race"""
@@ -234,8 +397,12 @@ class BetViewSet(viewsets.ModelViewSet):
         if competition_id:
             bets = bets.filter(race__competition_id=competition_id)
 
-        serializer = self.get_serializer(bets, many=True)
-        return Response(serializer.data)
+        # Filter to races that have not started yet
+        upcoming = request.query_params.get("upcoming", "false").lower() not in ("0", "false")
+        if upcoming:
+            bets = bets.filter(race__race_datetime__gte=timezone.now())
+
+        return Response(BetValuesSerializer(bets, request).data)
 
 
 class UserProfileViewSet(viewsets.ReadOnlyModelViewSet):
@@ -272,6 +439,107 @@ class CompetitionStandingViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset.order_by("rank")
 
+    def leaderboard_params(self, request, **defaults):
+        """?competition= (required), ?user= (default: the current user) and the given (default, min, max) whole numbers"""
+        params = {"competition": int(request.query_params["competition"])}
+        for name, (default, minimum, maximum) in defaults.items():
+            params[name] = max(minimum, min(int(request.query_params.get(name, default)), maximum))
+        if "user" in request.query_params:
+            params["user"] = int(request.query_params["user"])
+        elif request.user.is_authenticated:
+            params["user"] = request.user.id
+        return params
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        """The top ?n=N (default 10, 1 to 100) of ?competition="""
+        try:
+            params = self.leaderboard_params(request, n=(10, 1, 100))
+        except (KeyError, ValueError):
+            return Response({"error": "competition and n must be whole numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        standings = leaderboard.top(params["competition"], params["n"])
+        return Response(CompetitionStandingValuesSerializer(standings, request).data)
+
+    @action(detail=False, methods=["get"], url_path="around-me")
+    def around_me(self, request):
+        """The ?k= (default 5, 0 to 50) places either side of the current user, or ?user=, in ?competition="""
+        try:
+            params = self.leaderboard_params(request, k=(5, 0, 50))
+        except (KeyError, ValueError):
+            return Response({"error": "competition, user and k must be whole numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        if "user" not in params:
+            return Response({"error": "Authentication or ?user= required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        rank = leaderboard.user_rank(params["competition"], params["user"])
+        if rank is None:
+            return Response({"error": "User has no rank in this competition yet"}, status=status.HTTP_404_NOT_FOUND)
+        standings = leaderboard.around(params["competition"], rank, params["k"])
+        return Response({"rank": rank, "standings": CompetitionStandingValuesSerializer(standings, request).data})
+
+    @action(detail=False, methods=["get"])
+    def percentile(self, request):
+        """The current user's, or ?user='s, rank in ?competition= out of all ranked users, as percentages"""
+        try:
+            params = self.leaderboard_params(request)
+        except (KeyError, ValueError):
+            return Response({"error": "competition and user must be whole numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        if "user" not in params:
+            return Response({"error": "Authentication or ?user= required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        rank = leaderboard.user_rank(params["competition"], params["user"])
+        if rank is None:
+            return Response({"error": "User has no rank in this competition yet"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"user": params["user"], **leaderboard.percentile(params["competition"], rank)})
+
+
+class LeagueViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """API endpoint for private leagues; users only see leagues they belong to"""
+
+    serializer_class = LeagueSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        mine = LeagueMembership.objects.filter(user=self.request.user).values("league_id")
+        return (
+            League.objects.filter(id__in=mine)
+            .select_related("competition")
+            .annotate(member_total=Count("memberships"))
+            .order_by("competition", "name")
+        )
+
+    def create(self, request, *args, **kwargs):
+        """Create a league, with a new invite code and the current user as its first member"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        league = create_league(user=request.user, **serializer.validated_data)
+        return Response(self.get_serializer(league).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"])
+    def join(self, request):
+        """Join a league by invite code, and its competition if not already in it"""
+        code = str(request.data.get("invite_code", "")).strip().upper()
+        league = League.objects.select_related("competition").filter(invite_code=code).first() if code else None
+        if league is None:
+            return Response({"error": "Invalid invite code"}, status=status.HTTP_404_NOT_FOUND)
+        if league.competition.status not in ["published", "active"]:
+            return Response({"error": "Competition is not open for joining"}, status=status.HTTP_400_BAD_REQUEST)
+
+        joined = join_league(league, request.user)
+        league = self.get_queryset().get(id=league.id)
+        return Response(self.get_serializer(league).data, status=status.HTTP_201_CREATED if joined else status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def leave(self, request, pk=None):
+        """Leave a league; the competition standings are unaffected"""
+        league = self.get_object()
+        LeagueMembership.objects.filter(league=league, user=request.user).delete()
+        return Response({"message": f"Left {league.name}"}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def standings(self, request, pk=None):
+        """Members ranked on their race scores from the league's start round on"""
+        return Response(league_standings(self.get_object()))
+
 
 class RaceResultViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for race results"""
@@ -69,6 +69,8 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
+    # ETags for GET responses, so clients revalidating unchanged data get an empty 304
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -203,6 +205,16 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # orjson-backed JSON (same output as DRF's JSONRenderer; falls back to it if orjson is missing)
+    "DEFAULT_RENDERER_CLASSES": [
+        "betting.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "betting.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 # CORS settings (for development)
@@ -224,6 +236,41 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 # F1 API Configuration
 F1_API_BASE_URL = config("F1_API_BASE_URL", default="https://api.openf1.org/v1")
 
+# On-disk cache for OpenF1 responses (empty disables caching)
+# Completed sessions are cached forever; live data is revalidated after F1_API_CACHE_LIVE_TTL seconds
+F1_API_CACHE_DIR = config("F1_API_CACHE_DIR", default="")
+F1_API_CACHE_LIVE_TTL = config("F1_API_CACHE_LIVE_TTL", default=60, cast=int)
+# Retries when OpenF1 rate-limits a request (HTTP 429)
+F1_API_MAX_RETRIES = config("F1_API_MAX_RETRIES", default=3, cast=int)
+
+# Race lifecycle scheduler (python manage.py run_scheduler)
+# Scheduled races open for betting BETTING_WINDOW_DAYS before their deadline; results are
+# ingested RACE_RESULTS_AFTER_MINUTES after the start and retried every RACE_RESULTS_RETRY_MINUTES
+BETTING_WINDOW_DAYS = config("BETTING_WINDOW_DAYS", default=7, cast=int)
+RACE_RESULTS_AFTER_MINUTES = config("RACE_RESULTS_AFTER_MINUTES", default=150, cast=int)
+RACE_RESULTS_RETRY_MINUTES = config("RACE_RESULTS_RETRY_MINUTES", default=15, cast=int)
+
+# Admin dashboard statistics are cached for this many seconds (keyed on the standings version, so
+# they are refreshed once races are scored)
+ADMIN_STATS_CACHE_TTL = config("ADMIN_STATS_CACHE_TTL", default=60, cast=int)
+
+# The user-independent part of /api/bootstrap/ (competitions, upcoming races, drivers, bet types)
+# is cached for this many seconds
+BOOTSTRAP_CACHE_TTL = config("BOOTSTRAP_CACHE_TTL", default=30, cast=int)
+
+# Live leaderboard stream (Server-Sent Events, served by the ASGI app)
+# Each competition's standings are checked for changes every LEADERBOARD_STREAM_INTERVAL seconds,
+# once per process however many clients are connected
+LEADERBOARD_STREAM_INTERVAL = config("LEADERBOARD_STREAM_INTERVAL", default=2.0, cast=float)
+LEADERBOARD_STREAM_KEEPALIVE = config("LEADERBOARD_STREAM_KEEPALIVE", default=15.0, cast=float)
+LEADERBOARD_STREAM_RETRY_MS = config("LEADERBOARD_STREAM_RETRY_MS", default=5000, cast=int)
+
+# CSV/NDJSON exports read this many rows per server-side cursor fetch, and encode them as one chunk
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Championship projections: seasons simulated per projection (by the job worker, after scoring)
+PROJECTION_SIMULATIONS = config("PROJECTION_SIMULATIONS", default=10000, cast=int)
+
 # ==============================================================================
 # PRODUCTION SECURITY SETTINGS
 # ==============================================================================
@@ -5,6 +5,8 @@ This configuration is optimized for running on your local laptop without HTTPS.
 Use with: python manage.py run dev
 """
 
+from decouple import config
+
 from .base import *  # noqa
 
 # Force development mode
@@ -16,6 +18,9 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", "testserver"]
 # Use console email backend (prints emails to terminal)
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Cache OpenF1 responses locally so re-running ingestion doesn't hit the API
+F1_API_CACHE_DIR = config("F1_API_CACHE_DIR", default=str(BASE_DIR / ".f1_cache"))  # noqa: F405
+
 # HTTPS/SSL settings are automatically disabled when DEBUG=True
 # See base.py for the conditional security settings
 
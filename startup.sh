@@ -9,8 +9,27 @@ python manage.py migrate --noinput
 # Collect static files
 python manage.py collectstatic --noinput --clear
 
+# Start the background job worker and the race scheduler next to the web process,
+# restarting them if they exit. Set RUN_WORKER=false or RUN_SCHEDULER=false where they
+# run elsewhere; when the app is scaled out, keep the scheduler on one instance only
+if [ "${RUN_WORKER:-true}" = "true" ]; then
+    (while true; do python manage.py run_worker; sleep 5; done) &
+fi
+if [ "${RUN_SCHEDULER:-true}" = "true" ]; then
+    (while true; do python manage.py run_scheduler --enqueue; sleep 5; done) &
+fi
+
 # Start Gunicorn
-exec gunicorn f1betting.wsgi:application \
+# The ASGI app with uvicorn workers keeps live leaderboard streams open and runs the
+# async endpoints natively. SERVER_INTERFACE=wsgi falls back to sync workers, where
+# the SPA loads the leaderboard on demand instead of streaming it
+if [ "${SERVER_INTERFACE:-asgi}" = "wsgi" ]; then
+    APP="f1betting.wsgi:application"
+else
+    APP="f1betting.asgi:application --worker-class=uvicorn_worker.UvicornWorker"
+fi
+
+exec gunicorn $APP \
     --bind=0.0.0.0:${PORT:-8000} \
     --workers=4 \
     --timeout=120 \
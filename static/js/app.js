@@ -1,37 +1,134 @@
 // F1 Betting Pool - Single Page Application
 // ============================================
 
+// Client data layer
+// Keeps API responses in memory (and public ones in localStorage), shares one request between
+// concurrent callers of the same URL, and revalidates stale data with If-None-Match so an
+// unchanged resource costs a 304 without a body.
+const api = {
+  entries: new Map(),
+  inflight: new Map(),
+  storagePrefix: 'f1cache:',
+
+  // GET a JSON endpoint; cached data younger than maxAge seconds is returned without a request.
+  // persist keeps the response in localStorage across page loads (public data only).
+  get(url, { maxAge = 0, persist = false } = {}) {
+    const entry = this.lookup(url, persist);
+    if (entry && Date.now() - entry.time < maxAge * 1000) {
+      return Promise.resolve(entry.data);
+    }
+
+    if (!this.inflight.has(url)) {
+      const request = this.revalidate(url, entry, persist).finally(() => this.inflight.delete(url));
+      this.inflight.set(url, request);
+    }
+    return this.inflight.get(url);
+  },
+
+  // Fetch a URL, sending the cached ETag so the server can answer 304 Not Modified
+  async revalidate(url, entry, persist) {
+    const headers = entry && entry.etag ? { 'If-None-Match': entry.etag } : {};
+    const response = await fetch(url, { credentials: 'include', headers });
+
+    if (response.status === 304 && entry) {
+      this.store(url, { ...entry, time: Date.now() }, persist);
+      return entry.data;
+    }
+    if (!response.ok) {
+      throw new Error(`${url} returned ${response.status}`);
+    }
+
+    const data = await response.json();
+    this.store(url, { data, etag: response.headers.get('ETag'), time: Date.now() }, persist);
+    return data;
+  },
+
+  // Find a cached entry in memory, falling back to localStorage for persisted URLs
+  lookup(url, persist) {
+    if (this.entries.has(url) || !persist) {
+      return this.entries.get(url);
+    }
+    try {
+      const saved = JSON.parse(localStorage.getItem(this.storagePrefix + url));
+      if (saved) {
+        // Stored data is only a baseline for revalidation, never served unchecked
+        saved.time = 0;
+        this.entries.set(url, saved);
+      }
+      return saved;
+    } catch (error) {
+      return undefined;
+    }
+  },
+
+  store(url, entry, persist) {
+    this.entries.set(url, entry);
+    if (persist) {
+      try {
+        localStorage.setItem(this.storagePrefix + url, JSON.stringify(entry));
+      } catch (error) {
+        // Storage full or disabled: the in-memory copy still works
+      }
+    }
+  },
+
+  // Seed the cache with data that arrived in another response (the bootstrap)
+  prime(url, data) {
+    this.entries.set(url, { data, etag: null, time: Date.now() });
+  },
+
+  // Forget cached URLs starting with prefix, after a write that changes them
+  invalidate(prefix) {
+    [...this.entries.keys()].filter(url => url.startsWith(prefix)).forEach(url => this.entries.delete(url));
+    try {
+      Object.keys(localStorage)
+        .filter(key => key.startsWith(this.storagePrefix + prefix))
+        .forEach(key => localStorage.removeItem(key));
+    } catch (error) {
+      // Storage disabled
+    }
+  }
+};
+
+// List endpoints are either plain arrays or paginated DRF responses ({results: [...], count: N})
+const listOf = (data) => Array.isArray(data) ? data : (data.results || []);
+
 const app = {
   currentUser: null,
   currentPage: 'competitions',
   selectedDrivers: [],
   drivers: [],
   competitions: [],
+  leaderboardStream: null,
+  leaderboardRows: new Map(),
 
   // Initialize app
-  init() {
-    this.checkAuth();
+  async init() {
     this.setupNavigation();
+    await this.loadBootstrap();
     this.loadPage('competitions');
   },
 
-  // Check authentication status
-  async checkAuth() {
+  // Load everything needed for first paint (user, competitions, races, drivers, bet types) in one request
+  async loadBootstrap() {
     try {
-      const response = await fetch('/api/profiles/me/', {
-        credentials: 'include'
-      });
-
-      if (response.ok) {
-        this.currentUser = await response.json();
-        this.renderAuthSection();
-      } else {
-        this.renderAuthSection();
+      const data = await api.get('/api/bootstrap/');
+      this.currentUser = data.profile;
+      this.competitions = data.competitions;
+      this.drivers = data.drivers;
+
+      // Pages read these URLs through the cache, so their first render needs no further requests
+      api.prime('/api/competitions/', data.competitions);
+      api.prime('/api/async/races/upcoming/', data.upcoming_races);
+      api.prime('/api/async/drivers/', data.drivers);
+      api.prime('/api/bet-types/', data.bet_types);
+      if (data.profile) {
+        api.prime('/api/bets/my_bets/?upcoming=true', data.bets);
       }
     } catch (error) {
-      console.error('Auth check failed:', error);
-      this.renderAuthSection();
+      console.error('Bootstrap failed:', error);
     }
+    this.renderAuthSection();
   },
 
   // Render authentication section
@@ -105,6 +202,7 @@ const app = {
   // Load page content
   loadPage(page) {
     this.currentPage = page;
+    this.closeLeaderboardStream();
     const content = document.getElementById('appContent');
 
     switch(page) {
@@ -136,26 +234,18 @@ const app = {
     loading.classList.remove('hidden');
 
     try {
-      const response = await fetch('/api/competitions/', {
-        credentials: 'include'
-      });
+      const competitions = await this.fetchCompetitions();
+      this.competitions = competitions;
+      loading.classList.add('hidden');
 
-      if (response.ok) {
-        const data = await response.json();
-        // Handle paginated response (DRF returns {results: [...], count: N})
-        const competitions = Array.isArray(data) ? data : (data.results || []);
-        this.competitions = competitions;
-        loading.classList.add('hidden');
-
-        if (competitions.length === 0) {
-          empty.classList.remove('hidden');
-        } else {
-          list.innerHTML = '';
-          competitions.forEach(comp => {
-            const card = this.createCompetitionCard(comp);
-            list.appendChild(card);
-          });
-        }
+      if (competitions.length === 0) {
+        empty.classList.remove('hidden');
+      } else {
+        list.innerHTML = '';
+        competitions.forEach(comp => {
+          const card = this.createCompetitionCard(comp);
+          list.appendChild(card);
+        });
       }
     } catch (error) {
       console.error('Failed to load competitions:', error);
@@ -164,6 +254,11 @@ const app = {
     }
   },
 
+  // Competitions, cached for a minute
+  async fetchCompetitions() {
+    return listOf(await api.get('/api/competitions/', { maxAge: 60, persist: true }));
+  },
+
   // Create competition card
   createCompetitionCard(competition) {
     const template = document.getElementById('template-competition-card');
@@ -215,6 +310,7 @@ const app = {
 
       if (response.ok) {
         alert(data.message || 'Successfully joined competition!');
+        api.invalidate('/api/competitions/');
         this.loadCompetitionsPage();
       } else {
         alert(data.error || 'Failed to join competition');
@@ -251,44 +347,32 @@ const app = {
     loading.classList.remove('hidden');
 
     try {
-      // Fetch races and user's bets in parallel
-      const [racesResponse, betsResponse] = await Promise.all([
-        fetch('/api/races/?upcoming=true', { credentials: 'include' }),
-        this.currentUser ? fetch('/api/bets/my_bets/', { credentials: 'include' }) : Promise.resolve(null)
+      // Fetch races and the user's bets on them in parallel
+      const [races, userBets] = await Promise.all([
+        api.get('/api/async/races/upcoming/', { maxAge: 30 }).then(listOf),
+        this.currentUser ? api.get('/api/bets/my_bets/?upcoming=true', { maxAge: 30 }).then(listOf) : []
       ]);
 
-      if (racesResponse.ok) {
-        const racesData = await racesResponse.json();
-        const races = Array.isArray(racesData) ? racesData : (racesData.results || []);
-
-        // Get user's bets
-        let userBets = [];
-        if (betsResponse && betsResponse.ok) {
-          const betsData = await betsResponse.json();
-          userBets = Array.isArray(betsData) ? betsData : (betsData.results || []);
+      // Create a map of race_id -> bet for quick lookup
+      const betsByRace = {};
+      userBets.forEach(bet => {
+        if (!betsByRace[bet.race]) {
+          betsByRace[bet.race] = [];
         }
+        betsByRace[bet.race].push(bet);
+      });
 
-        // Create a map of race_id -> bet for quick lookup
-        const betsByRace = {};
-        userBets.forEach(bet => {
-          if (!betsByRace[bet.race]) {
-            betsByRace[bet.race] = [];
-          }
-          betsByRace[bet.race].push(bet);
-        });
-
-        loading.classList.add('hidden');
+      loading.classList.add('hidden');
 
-        if (races.length === 0) {
-          empty.classList.remove('hidden');
-        } else {
-          list.innerHTML = '';
-          races.forEach(race => {
-            race.user_has_bet = !!betsByRace[race.id];
-            const card = this.createRaceCard(race);
-            list.appendChild(card);
-          });
-        }
+      if (races.length === 0) {
+        empty.classList.remove('hidden');
+      } else {
+        list.innerHTML = '';
+        races.forEach(race => {
+          race.user_has_bet = !!betsByRace[race.id];
+          const card = this.createRaceCard(race);
+          list.appendChild(card);
+        });
       }
     } catch (error) {
       console.error('Failed to load races:', error);
@@ -378,35 +462,63 @@ const app = {
     }
   },
 
-  // Load leaderboard data
+  // Load leaderboard data, then keep it live over Server-Sent Events
   async loadLeaderboard(competitionId) {
     const loading = document.getElementById('leaderboardLoading');
     const list = document.getElementById('leaderboardList');
-    const empty = document.getElementById('leaderboardEmpty');
 
+    this.closeLeaderboardStream();
     loading.classList.remove('hidden');
     list.innerHTML = '';
 
-    try {
-      const response = await fetch(`/api/standings/?competition=${competitionId}`, {
-        credentials: 'include'
-      });
+    if (!window.EventSource) {
+      return this.fetchLeaderboard(competitionId);
+    }
 
-      if (response.ok) {
-        const data = await response.json();
-        const standings = Array.isArray(data) ? data : (data.results || []);
-        loading.classList.add('hidden');
+    const stream = new EventSource(`/api/competitions/${competitionId}/standings/stream/`, {
+      withCredentials: true
+    });
+    this.leaderboardStream = stream;
 
-        if (standings.length === 0) {
-          empty.classList.remove('hidden');
-        } else {
-          empty.classList.add('hidden');
-          standings.forEach(standing => {
-            const item = this.createLeaderboardItem(standing);
-            list.appendChild(item);
-          });
-        }
+    stream.addEventListener('snapshot', (e) => {
+      this.leaderboardRows = new Map(JSON.parse(e.data).map(row => [row.user, row]));
+      this.renderLeaderboard();
+    });
+
+    stream.addEventListener('diff', (e) => {
+      const diff = JSON.parse(e.data);
+      diff.removed.forEach(userId => this.leaderboardRows.delete(userId));
+      diff.changed.forEach(row => this.leaderboardRows.set(row.user, row));
+      this.renderLeaderboard();
+    });
+
+    // Sent after the snapshot by servers that cannot hold the stream open (WSGI workers):
+    // keep the rows shown and reload them on demand instead of reconnecting every few seconds
+    stream.addEventListener('end', () => {
+      stream.close();
+      if (this.leaderboardStream === stream) {
+        this.leaderboardStream = null;
       }
+    });
+
+    stream.onerror = () => {
+      // EventSource reconnects by itself; only fall back when the stream is gone for good
+      if (stream.readyState === EventSource.CLOSED && this.leaderboardStream === stream) {
+        this.leaderboardStream = null;
+        this.fetchLeaderboard(competitionId);
+      }
+    };
+  },
+
+  // Load leaderboard data once, for browsers without EventSource
+  async fetchLeaderboard(competitionId) {
+    const loading = document.getElementById('leaderboardLoading');
+    const empty = document.getElementById('leaderboardEmpty');
+
+    try {
+      const standings = listOf(await api.get(`/api/async/competitions/${competitionId}/standings/`));
+      this.leaderboardRows = new Map(standings.map(standing => [standing.user, standing]));
+      this.renderLeaderboard();
     } catch (error) {
       console.error('Failed to load leaderboard:', error);
       loading.classList.add('hidden');
@@ -414,6 +526,39 @@ const app = {
     }
   },
 
+  // Render the current leaderboard rows in rank order
+  renderLeaderboard() {
+    const loading = document.getElementById('leaderboardLoading');
+    const list = document.getElementById('leaderboardList');
+    const empty = document.getElementById('leaderboardEmpty');
+    if (!list) {
+      return;
+    }
+
+    const standings = [...this.leaderboardRows.values()].sort((a, b) => a.rank - b.rank);
+    loading.classList.add('hidden');
+    list.innerHTML = '';
+
+    if (standings.length === 0) {
+      empty.classList.remove('hidden');
+    } else {
+      empty.classList.add('hidden');
+      standings.forEach(standing => {
+        const item = this.createLeaderboardItem(standing);
+        list.appendChild(item);
+      });
+    }
+  },
+
+  // Stop listening for leaderboard updates
+  closeLeaderboardStream() {
+    if (this.leaderboardStream) {
+      this.leaderboardStream.close();
+      this.leaderboardStream = null;
+    }
+    this.leaderboardRows = new Map();
+  },
+
   // Create leaderboard item
   createLeaderboardItem(standing) {
     const template = document.getElementById('template-leaderboard-item');
@@ -449,33 +594,27 @@ const app = {
     loading.classList.remove('hidden');
 
     try {
-      const response = await fetch('/api/bets/my_bets/', {
-        credentials: 'include'
-      });
+      const bets = listOf(await api.get('/api/bets/my_bets/', { maxAge: 30 }));
 
-      if (response.ok) {
-        const data = await response.json();
-        const bets = Array.isArray(data) ? data : (data.results || []);
-        loading.classList.add('hidden');
+      loading.classList.add('hidden');
 
-        if (bets.length === 0) {
-          empty.classList.remove('hidden');
-        } else {
-          list.innerHTML = '<div class="table"><table style="width:100%"><thead><tr><th>Race</th><th>Driver</th><th>Predicted Position</th><th>Points</th><th>Status</th></tr></thead><tbody id="myBetsTableBody"></tbody></table></div>';
-
-          const tbody = document.getElementById('myBetsTableBody');
-          bets.forEach(bet => {
-            const row = document.createElement('tr');
-            row.innerHTML = `
-              <td>${bet.race_name}</td>
-              <td>${bet.driver_name}</td>
-              <td>P${bet.predicted_position}</td>
-              <td>${bet.points_earned}</td>
-              <td><span class="badge ${bet.is_scored ? 'badge-success' : 'badge-warning'}">${bet.is_scored ? 'Scored' : 'Pending'}</span></td>
-            `;
-            tbody.appendChild(row);
-          });
-        }
+      if (bets.length === 0) {
+        empty.classList.remove('hidden');
+      } else {
+        list.innerHTML = '<div class="table"><table style="width:100%"><thead><tr><th>Race</th><th>Driver</th><th>Predicted Position</th><th>Points</th><th>Status</th></tr></thead><tbody id="myBetsTableBody"></tbody></table></div>';
+
+        const tbody = document.getElementById('myBetsTableBody');
+        bets.forEach(bet => {
+          const row = document.createElement('tr');
+          row.innerHTML = `
+            <td>${bet.race_name}</td>
+            <td>${bet.driver_name}</td>
+            <td>P${bet.predicted_position}</td>
+            <td>${bet.points_earned}</td>
+            <td><span class="badge ${bet.is_scored ? 'badge-success' : 'badge-warning'}">${bet.is_scored ? 'Scored' : 'Pending'}</span></td>
+          `;
+          tbody.appendChild(row);
+        });
       }
     } catch (error) {
       console.error('Failed to load bets:', error);
@@ -490,20 +629,13 @@ const app = {
     if (!select) return;
 
     try {
-      const response = await fetch('/api/competitions/', {
-        credentials: 'include'
+      const competitions = await this.fetchCompetitions();
+      competitions.forEach(comp => {
+        const option = document.createElement('option');
+        option.value = comp.id;
+        option.textContent = `${comp.year} - ${comp.name}`;
+        select.appendChild(option);
       });
-
-      if (response.ok) {
-        const data = await response.json();
-        const competitions = Array.isArray(data) ? data : (data.results || []);
-        competitions.forEach(comp => {
-          const option = document.createElement('option');
-          option.value = comp.id;
-          option.textContent = `${comp.year} - ${comp.name}`;
-          select.appendChild(option);
-        });
-      }
     } catch (error) {
       console.error('Failed to load competitions:', error);
     }
@@ -521,10 +653,8 @@ const app = {
     this.selectedDrivers = [];
     this.predictions = Array(10).fill(null);
 
-    // Load drivers if not already loaded
-    if (this.drivers.length === 0) {
-      await this.loadDrivers();
-    }
+    // Load drivers (served from the cache after the first time)
+    await this.loadDrivers();
 
     // Load the template
     const template = document.getElementById('template-place-bet');
@@ -555,36 +685,29 @@ const app = {
   // Load existing bet for editing
   async loadExistingBet(raceId) {
     try {
-      const response = await fetch(`/api/bets/my_bets/?race=${raceId}`, {
-        credentials: 'include'
-      });
+      const bets = listOf(await api.get(`/api/bets/my_bets/?race=${raceId}`, { maxAge: 30 }));
 
-      if (response.ok) {
-        const data = await response.json();
-        const bets = Array.isArray(data) ? data : (data.results || []);
+      // Sort bets by position and populate predictions
+      bets.sort((a, b) => a.predicted_position - b.predicted_position);
 
-        // Sort bets by position and populate predictions
-        bets.sort((a, b) => a.predicted_position - b.predicted_position);
+      bets.forEach(bet => {
+        if (bet.predicted_position >= 1 && bet.predicted_position <= 10) {
+          const driver = this.drivers.find(d => d.id === bet.driver);
+          if (driver) {
+            this.predictions[bet.predicted_position - 1] = driver;
+            this.updatePredictionSlot(bet.predicted_position);
 
-        bets.forEach(bet => {
-          if (bet.predicted_position >= 1 && bet.predicted_position <= 10) {
-            const driver = this.drivers.find(d => d.id === bet.driver);
-            if (driver) {
-              this.predictions[bet.predicted_position - 1] = driver;
-              this.updatePredictionSlot(bet.predicted_position);
-
-              // Hide the driver from available list
-              const driverCard = document.querySelector(`[data-driver-id="${driver.id}"]`);
-              if (driverCard) driverCard.classList.add('hidden');
-            }
+            // Hide the driver from available list
+            const driverCard = document.querySelector(`[data-driver-id="${driver.id}"]`);
+            if (driverCard) driverCard.classList.add('hidden');
           }
-        });
-
-        // Update submit button text
-        const submitBtn = document.getElementById('submitBetBtn');
-        if (submitBtn) {
-          submitBtn.textContent = 'Update Bet';
         }
+      });
+
+      // Update submit button text
+      const submitBtn = document.getElementById('submitBetBtn');
+      if (submitBtn) {
+        submitBtn.textContent = 'Update Bet';
       }
     } catch (error) {
       console.error('Failed to load existing bet:', error);
@@ -780,14 +903,7 @@ const app = {
   // Load drivers
   async loadDrivers() {
     try {
-      const response = await fetch('/api/drivers/', {
-        credentials: 'include'
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        this.drivers = Array.isArray(data) ? data : (data.results || []);
-      }
+      this.drivers = listOf(await api.get('/api/async/drivers/', { maxAge: 300, persist: true }));
     } catch (error) {
       console.error('Failed to load drivers:', error);
     }
@@ -853,13 +969,7 @@ const app = {
 
     try {
       // Get the default "Top 10" bet type
-      const betTypesResponse = await fetch('/api/bet-types/', {
-        credentials: 'include'
-      });
-
-      const betTypesData = await betTypesResponse.json();
-      console.log('Bet types response:', betTypesData);
-      const betTypes = Array.isArray(betTypesData) ? betTypesData : (betTypesData.results || []);
+      const betTypes = listOf(await api.get('/api/bet-types/', { maxAge: 300, persist: true }));
       const top10BetType = betTypes.find(bt => bt.code === 'top10');
 
       if (!top10BetType) {
@@ -886,6 +996,7 @@ const app = {
       });
 
       if (response.ok) {
+        api.invalidate('/api/bets/');
         alert('Bet placed successfully!');
         this.loadPage('my-bets');
       } else {
@@ -915,36 +1026,29 @@ const app = {
   // View race results
   async viewRaceResults(raceId) {
     try {
-      const response = await fetch(`/api/races/${raceId}/results/`, {
-        credentials: 'include'
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        const results = Array.isArray(data) ? data : (data.results || []);
+      const results = listOf(await api.get(`/api/async/races/${raceId}/results/`, { maxAge: 60 }));
 
-        if (results.length === 0) {
-          alert('Results not available yet');
-          return;
-        }
-
-        let resultsHTML = '<h3>Race Results</h3><div class="table"><table style="width:100%"><thead><tr><th>Pos</th><th>Driver</th><th>Team</th></tr></thead><tbody>';
+      if (results.length === 0) {
+        alert('Results not available yet');
+        return;
+      }
 
-        results.forEach(result => {
-          const driver = result.driver_name.split(' ');
-          resultsHTML += `
-            <tr>
-              <td><span class="badge-position badge-position-${result.position <= 3 ? result.position : ''}">${result.position}</span></td>
-              <td>${result.driver_name}</td>
-              <td>${result.driver_team || 'N/A'}</td>
-            </tr>
-          `;
-        });
+      let resultsHTML = '<h3>Race Results</h3><div class="table"><table style="width:100%"><thead><tr><th>Pos</th><th>Driver</th><th>Team</th></tr></thead><tbody>';
+
+      results.forEach(result => {
+        const driver = result.driver_name.split(' ');
+        resultsHTML += `
+          <tr>
+            <td><span class="badge-position badge-position-${result.position <= 3 ? result.position : ''}">${result.position}</span></td>
+            <td>${result.driver_name}</td>
+            <td>${result.driver_team || 'N/A'}</td>
+          </tr>
+        `;
+      });
 
-        resultsHTML += '</tbody></table></div>';
+      resultsHTML += '</tbody></table></div>';
 
-        alert(resultsHTML); // In a real app, use a proper modal
-      }
+      alert(resultsHTML); // In a real app, use a proper modal
     } catch (error) {
       console.error('Failed to load results:', error);
       alert('Failed to load race results');